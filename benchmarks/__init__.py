@@ -0,0 +1,5 @@
+"""Performance benchmarks for the Open Agent Spec CLI.
+
+Benchmarks are plain scripts run with ``python -m benchmarks.<name>``; they are
+not collected by pytest.
+"""
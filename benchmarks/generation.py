@@ -0,0 +1,203 @@
+"""Benchmark spec-to-code generation at scale.
+
+Run with::
+
+    python -m benchmarks.generation [--sizes 1 10 100 1000 5000]
+        [--output results.json] [--baseline benchmarks/baseline.json]
+        [--update-baseline]
+
+For each synthetic spec size (see ``benchmarks.synthetic``) the script
+measures ``validate_spec``, ``validate_with_json_schema``,
+``prepare_all_data``, ``generate_agent_code`` and ``generate_prompt_template``
+and records, per stage:
+
+* ``time_ms`` - best wall-clock time over ``--repeat`` runs;
+* ``peak_kib`` - peak traced allocation during a separate run (tracemalloc
+  slows execution, so it is never enabled while timing);
+* ``output_bytes`` - size of the generated code, where the stage produces any.
+
+With ``--baseline`` the results are compared against a committed baseline and
+the script exits with status 1 if any stage is slower or uses more memory than
+``--tolerance`` times the baseline. Differences below a small absolute noise
+floor are ignored so that tiny stages do not flap.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import make_spec
+from oas_cli.data_preparation import AgentDataPreparator
+from oas_cli.generators import generate_agent_code, generate_prompt_template
+from oas_cli.validators import (
+    get_schema_validator,
+    validate_spec,
+    validate_with_json_schema,
+)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_SIZES = [1, 10, 100, 1000, 5000]
+
+# Differences smaller than these are treated as noise when comparing
+TIME_NOISE_MS = 5.0
+MEMORY_NOISE_KIB = 256.0
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _stages(
+    spec: Dict[str, Any], agent_name: str, class_name: str
+) -> Dict[str, Callable[[], Optional[int]]]:
+    """Return one callable per stage; each returns its output size, if any."""
+
+    def prepare() -> int:
+        data = AgentDataPreparator().prepare_all_data(spec, agent_name, class_name)
+        return sum(len(code) for code in data["task_functions"] + data["models"])
+
+    def agent_code() -> int:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_agent_code(Path(tmp), spec, agent_name, class_name)
+            return (Path(tmp) / "agent.py").stat().st_size
+
+    def prompt_templates() -> int:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_prompt_template(Path(tmp), spec)
+            return _dir_size(Path(tmp))
+
+    return {
+        "validate_spec": lambda: validate_spec(spec) and None,
+        "validate_with_json_schema": lambda: validate_with_json_schema(spec),
+        "prepare_all_data": prepare,
+        "generate_agent_code": agent_code,
+        "generate_prompt_template": prompt_templates,
+    }
+
+
+def _measure(func: Callable[[], Optional[int]], repeat: int) -> Dict[str, Any]:
+    best = float("inf")
+    output_bytes = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output_bytes = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "time_ms": round(best * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "output_bytes": output_bytes,
+    }
+
+
+def run(
+    sizes: List[int], depth: int = 2, fan_out: int = 3, repeat: int = 5
+) -> Dict[str, Any]:
+    """Run every stage for every spec size and return the results."""
+    # Compile the schema up front; its one-off cost is not what is measured
+    get_schema_validator()
+
+    results: Dict[str, Any] = {}
+    for size in sizes:
+        spec = make_spec(size, depth=depth, fan_out=fan_out)
+        agent_name, class_name = validate_spec(spec)
+        # Large specs are slow enough that a single timed run is stable
+        runs = repeat if size < 1000 else 1
+        results[str(size)] = {
+            stage: _measure(func, runs)
+            for stage, func in _stages(spec, agent_name, class_name).items()
+        }
+    return {
+        "python": platform.python_version(),
+        "params": {"depth": depth, "fan_out": fan_out},
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Return a description of every stage that regressed against the baseline."""
+    regressions = []
+    for size, stages in current["results"].items():
+        for stage, metrics in stages.items():
+            previous = baseline.get("results", {}).get(size, {}).get(stage)
+            if previous is None:
+                continue
+            for metric, noise in (
+                ("time_ms", TIME_NOISE_MS),
+                ("peak_kib", MEMORY_NOISE_KIB),
+            ):
+                now, before = metrics[metric], previous[metric]
+                if now > before * tolerance and now - before > noise:
+                    regressions.append(
+                        f"{stage} @ {size} tasks: {metric} {before} -> {now} "
+                        f"({now / before if before else float('inf'):.2f}x)"
+                    )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Write results as JSON here")
+    parser.add_argument("--baseline", type=Path, help="Compare against this file")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help=f"Overwrite {BASELINE_PATH.name} with these results",
+    )
+    args = parser.parse_args()
+
+    # Generators log every file they write; keep the report readable
+    logging.getLogger("oas").setLevel(logging.ERROR)
+
+    data = run(args.sizes, depth=args.depth, fan_out=args.fan_out, repeat=args.repeat)
+
+    print(f"{'tasks':>6} {'stage':<26} {'ms':>10} {'peak KiB':>10} {'bytes':>10}")
+    for size, stages in data["results"].items():
+        for stage, metrics in stages.items():
+            output_bytes = metrics["output_bytes"]
+            print(
+                f"{size:>6} {stage:<26} {metrics['time_ms']:>10.2f} "
+                f"{metrics['peak_kib']:>10.1f} "
+                f"{'' if output_bytes is None else output_bytes:>10}"
+            )
+
+    payload = json.dumps(data, indent=2)
+    if args.output:
+        args.output.write_text(payload)
+    if args.update_baseline:
+        BASELINE_PATH.write_text(payload + "\n")
+
+    if args.baseline:
+        regressions = compare(
+            data, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
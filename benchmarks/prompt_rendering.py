@@ -0,0 +1,117 @@
+"""Benchmark the per-call cost of rendering a task prompt in a generated agent.
+
+Run with::
+
+    python -m benchmarks.prompt_rendering [--calls 1000]
+
+The script generates the ``minimal-agent`` template into a temporary
+directory and reports the average cost of loading and rendering the prompt of
+its ``greet`` task with the context its task function passes:
+
+* ``per_call`` - what generated task functions used to do on every call:
+  create an ``Environment`` and load (parse and compile) the template;
+* ``cached`` - the generated ``load_prompt_template``, which compiles the
+  template once and then only renders it;
+* ``reload`` - the same with ``OAS_PROMPT_RELOAD=1``, which adds a stat of
+  the template file per call.
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict
+
+import yaml
+from jinja2 import Environment, FileSystemLoader
+
+from oas_cli.generators import generate_agent_code, generate_prompt_template
+from oas_cli.spec_ir import SpecIR
+
+SPEC_PATH = (
+    Path(__file__).parent.parent / "oas_cli" / "templates" / "minimal-agent.yaml"
+)
+
+
+def _import_agent(path: Path, reload: bool) -> ModuleType:
+    os.environ["OAS_PROMPT_RELOAD"] = "1" if reload else ""
+    try:
+        spec = importlib.util.spec_from_file_location(f"agent_reload_{reload}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        del os.environ["OAS_PROMPT_RELOAD"]
+    return module
+
+
+def _time_per_call(func: Callable[[], Any], calls: int) -> float:
+    func()  # Warm up: the first call compiles the cached template
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def run(calls: int) -> Dict[str, Any]:
+    """Return the per-call prompt rendering cost of each approach."""
+    spec_data = yaml.safe_load(SPEC_PATH.read_text())
+    task = SpecIR(spec_data).tasks["greet"]
+    input_dict = {name: f"example_{name}" for name in task.param_names}
+    context = {
+        "input": input_dict,
+        "memory_summary": "",
+        "output_format": "response: string",
+        "memory_config": {"enabled": False},
+        **input_dict,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp)
+        generate_agent_code(output, spec_data, "agent", "Agent")
+        generate_prompt_template(output, spec_data)
+        prompts_dir = str(output / "prompts")
+
+        def per_call() -> str:
+            env = Environment(loader=FileSystemLoader([".", prompts_dir]))
+            return env.get_template(f"{task.func_name}.jinja2").render(**context)
+
+        def cached_call(agent: ModuleType) -> Callable[[], str]:
+            return lambda: agent.load_prompt_template(task.func_name).render(**context)
+
+        cached = cached_call(_import_agent(output / "agent.py", reload=False))
+        reload = cached_call(_import_agent(output / "agent.py", reload=True))
+        timings = {
+            "per_call": _time_per_call(per_call, calls),
+            "cached": _time_per_call(cached, calls),
+            "reload": _time_per_call(reload, calls),
+        }
+
+    return {
+        "task": task.name,
+        "calls": calls,
+        **{f"{name}_us_per_call": value * 1e6 for name, value in timings.items()},
+        "speedup": timings["per_call"] / timings["cached"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    row = run(args.calls)
+    print(f"task {row['task']}, {row['calls']} calls")
+    print(f"{'per_call µs':>12} {'cached µs':>10} {'reload µs':>10} {'speedup':>9}")
+    print(
+        f"{row['per_call_us_per_call']:>12.1f} {row['cached_us_per_call']:>10.1f} "
+        f"{row['reload_us_per_call']:>10.1f} {row['speedup']:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark JSON Schema validation with and without the validator registry.
+
+Run with::
+
+    python -m benchmarks.schema_validation [--counts 1 10 100 1000] [--tasks N]
+
+For each spec count the script reports the average per-spec cost of the
+legacy path (re-read the schema and call ``jsonschema.validate`` for every
+spec), of ``validate_with_json_schema`` backed by ``schema_registry`` and of
+the same call using the validator generated by ``oas_cli.schema_compiler``.
+The minimal-agent template is validated unless ``--tasks`` asks for a
+synthetic spec with that many tasks (see ``benchmarks.synthetic``).
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import yaml
+from jsonschema import validate
+
+from benchmarks.synthetic import make_spec
+from oas_cli.validators import SCHEMA_PATH, schema_registry, validate_with_json_schema
+
+TEMPLATE_PATH = SCHEMA_PATH.parent.parent / "templates" / "minimal-agent.yaml"
+
+
+def _legacy_validate(spec_data: Dict[str, Any]) -> None:
+    with open(SCHEMA_PATH) as f:
+        schema = json.load(f)
+    validate(instance=spec_data, schema=schema)
+
+
+def _time_per_spec(func, specs: List[Dict[str, Any]]) -> float:
+    start = time.perf_counter()
+    for spec in specs:
+        func(spec)
+    return (time.perf_counter() - start) / len(specs)
+
+
+def _compiled_validate(spec_data: Dict[str, Any]) -> None:
+    validate_with_json_schema(spec_data, compiled=True)
+
+
+def run(counts: List[int], tasks: int = 0) -> List[Dict[str, Any]]:
+    """Return per-spec validation cost for each spec count."""
+    if tasks:
+        spec_data = make_spec(tasks)
+    else:
+        spec_data = yaml.safe_load(TEMPLATE_PATH.read_text())
+    results = []
+    for count in counts:
+        specs = [spec_data] * count
+        schema_registry.clear()
+        legacy = _time_per_spec(_legacy_validate, specs)
+        cached = _time_per_spec(validate_with_json_schema, specs)
+        compiled = _time_per_spec(_compiled_validate, specs)
+        results.append(
+            {
+                "specs": count,
+                "legacy_us_per_spec": legacy * 1e6,
+                "cached_us_per_spec": cached * 1e6,
+                "compiled_us_per_spec": compiled * 1e6,
+                "speedup": legacy / cached if cached else float("inf"),
+                "compiled_speedup": cached / compiled if compiled else float("inf"),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--tasks", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'specs':>8} {'legacy µs/spec':>16} {'cached µs/spec':>16} {'speedup':>9} "
+        f"{'compiled µs/spec':>18} {'vs cached':>10}"
+    )
+    for row in run(args.counts, args.tasks):
+        print(
+            f"{row['specs']:>8} {row['legacy_us_per_spec']:>16.1f} "
+            f"{row['cached_us_per_spec']:>16.1f} {row['speedup']:>8.1f}x "
+            f"{row['compiled_us_per_spec']:>18.1f} {row['compiled_speedup']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
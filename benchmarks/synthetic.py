@@ -0,0 +1,129 @@
+"""Synthetic Open Agent Spec generator for benchmarks.
+
+``make_spec`` builds a valid spec of arbitrary size so that generation can be
+measured well beyond the bundled templates. The shape is controlled by:
+
+* ``tasks`` - total number of tasks;
+* ``depth`` - nesting depth of each task's output schema;
+* ``fan_out`` - steps per multi-step task (and properties per schema level);
+* ``tool_ratio`` / ``multi_step_ratio`` - share of tool and multi-step tasks.
+
+Specs are deterministic for a given set of arguments.
+"""
+
+from typing import Any, Dict, List
+
+
+def _nested_schema(depth: int, width: int, leaf_prefix: str) -> Dict[str, Any]:
+    """Return an object schema ``depth`` levels deep with ``width`` properties."""
+    properties: Dict[str, Any] = {}
+    for i in range(width):
+        name = f"{leaf_prefix}_{i}"
+        if depth > 1 and i == 0:
+            properties[name] = _nested_schema(depth - 1, width, name)
+        else:
+            properties[name] = {"type": "string", "description": f"Field {name}"}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+    }
+
+
+def _input_schema() -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "description": "Name of the subject"},
+            "count": {"type": "integer", "description": "How many to produce"},
+        },
+        "required": ["name"],
+    }
+
+
+def make_spec(
+    tasks: int,
+    depth: int = 2,
+    fan_out: int = 3,
+    tool_ratio: float = 0.1,
+    multi_step_ratio: float = 0.1,
+) -> Dict[str, Any]:
+    """Return a valid spec with ``tasks`` tasks of the requested shape.
+
+    Tool and multi-step tasks are interleaved evenly with regular LLM tasks.
+    Multi-step tasks chain the preceding regular tasks, feeding each step
+    from the task input and the previous step's output.
+    """
+    tools: List[Dict[str, Any]] = []
+    task_defs: Dict[str, Any] = {}
+    regular: List[str] = []
+    tool_every = round(1 / tool_ratio) if tool_ratio else 0
+    multi_every = round(1 / multi_step_ratio) if multi_step_ratio else 0
+
+    for index in range(tasks):
+        name = f"task_{index}"
+        output = _nested_schema(depth, max(1, fan_out), "field")
+
+        if multi_every and index % multi_every == multi_every - 1 and regular:
+            members = regular[-fan_out:]
+            steps = []
+            for step_index, member in enumerate(members):
+                input_map = {"name": "{{input.name}}"}
+                if step_index:
+                    input_map["count"] = f"{{{{steps.{step_index - 1}.field_1}}}}"
+                steps.append({"task": member, "input_map": input_map})
+            task_defs[name] = {
+                "description": f"Chain {len(members)} tasks",
+                "multi_step": True,
+                "steps": steps,
+                "output": output,
+            }
+            continue
+
+        task_def: Dict[str, Any] = {
+            "description": f"Synthetic task number {index}",
+            "input": _input_schema(),
+            "output": output,
+        }
+        if tool_every and index % tool_every == tool_every // 2:
+            tool_id = f"tool_{len(tools)}"
+            tools.append(
+                {
+                    "id": tool_id,
+                    "description": f"Synthetic tool {tool_id}",
+                    "type": "function",
+                    "allowed_paths": ["./output/"],
+                }
+            )
+            task_def["tool"] = tool_id
+        task_defs[name] = task_def
+        regular.append(name)
+
+    spec: Dict[str, Any] = {
+        "open_agent_spec": "1.0.8",
+        "agent": {
+            "name": "synthetic-benchmark-agent",
+            "description": "Synthetic agent used for benchmarks",
+            "role": "executor",
+        },
+        "intelligence": {
+            "type": "llm",
+            "engine": "openai",
+            "model": "gpt-4",
+            "endpoint": "https://api.openai.com/v1",
+            "config": {"temperature": 0.7, "max_tokens": 150},
+        },
+        "tasks": task_defs,
+        "prompts": {
+            "system": "You are a synthetic benchmark agent.",
+            "user": "{{ input }}",
+        },
+        "behavioural_contract": {
+            "version": "0.1.2",
+            "description": "Synthetic contract",
+            "role": "executor",
+        },
+    }
+    if tools:
+        spec["tools"] = tools
+    return spec
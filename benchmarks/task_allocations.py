@@ -0,0 +1,168 @@
+"""Benchmark one task invocation of a generated agent against a stub LLM.
+
+Run with::
+
+    python -m benchmarks.task_allocations [--calls 2000]
+
+The script generates the ``minimal-agent`` template into a temporary
+directory twice and calls its ``greet`` task with ``invoke_intelligence``
+replaced by a stub that returns a canned response:
+
+* ``per_call`` - task functions as they used to be generated, building the
+  memory configuration, the intelligence configuration and the parser
+  defaults anew on every call (rendered with a ``task_function.py.j2``
+  override);
+* ``constants`` - the generated code, which builds them once at import.
+
+For each it reports the time per call and the number of memory blocks, as
+traced by ``tracemalloc``, that the task function allocated and still holds
+when it calls the LLM and when it calls the output parser.
+"""
+
+import argparse
+import importlib.util
+import logging
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from oas_cli.code_generation import CodeGenerator
+from oas_cli.manifest import sync_agent_files
+
+SPEC_PATH = (
+    Path(__file__).parent.parent / "oas_cli" / "templates" / "minimal-agent.yaml"
+)
+
+STUB_RESPONSE = '{"response": "Hello!"}'
+
+# The single-step task function before its constants moved to module level
+PER_CALL_TEMPLATE = """{% set prefix = func_name.upper() %}
+{{ llm_parser | replace("**" ~ prefix ~ "_OUTPUT_DEFAULTS", "**dict(" ~ prefix ~ "_OUTPUT_DEFAULTS)") }}
+
+@behavioural_contract(
+{% for key, value in contract_data.items() %}
+    {{ key }}={{ value }}{% if not loop.last %},{% endif %}
+{% endfor %}
+)
+def {{ func_name }}({{ input_params | join(', ') }}) -> {{ output_type }}:
+    memory_config = dict({{ memory_config }})
+    output_format = {{ output_description }}
+    template = load_prompt_template("{{ func_name }}")
+    input_dict = {
+{% for param in input_params_dict %}
+        "{{ param }}": {{ param }},
+{% endfor %}
+    }
+    prompt = template.render(
+        input=input_dict,
+        memory_summary=memory_summary if memory_config["enabled"] else "",
+        output_format=output_format,
+        memory_config=memory_config,
+        **input_dict
+    )
+    intelligence_config = dict({{ prefix }}_INTELLIGENCE_CONFIG)
+    result = invoke_intelligence(prompt, intelligence_config)
+    return {{ parser_function_name }}(result)
+"""
+
+
+def _generate_agent(
+    output: Path, spec_data: Dict[str, Any], templates_dir: Optional[Path]
+) -> ModuleType:
+    override_dirs = [templates_dir] if templates_dir else []
+    generator = CodeGenerator(override_dirs=override_dirs)
+    sync_agent_files(output, spec_data, "agent", "Agent", generator=generator)
+
+    spec = importlib.util.spec_from_file_location(
+        f"agent_{output.name}", output / "agent.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _live_blocks(path: str) -> int:
+    """Count the traced memory blocks allocated by code in ``path``."""
+    snapshot = tracemalloc.take_snapshot()
+    traces = snapshot.filter_traces([tracemalloc.Filter(True, path)])
+    return sum(stat.count for stat in traces.statistics("filename"))
+
+
+def _measure(agent: ModuleType, calls: int) -> Dict[str, float]:
+    # While tracing, the stubs count the blocks the task function allocated
+    # that are still alive when it calls the LLM and the output parser
+    blocks: List[int] = []
+    tracing = False
+    parse_with_fallback = agent.parse_with_fallback
+
+    def invoke_intelligence(prompt: str, config: Dict[str, Any]) -> str:
+        if tracing:
+            blocks.append(_live_blocks(agent.__file__))
+        return STUB_RESPONSE
+
+    def parse(*args: Any, **kwargs: Any) -> Any:
+        if tracing:
+            blocks.append(_live_blocks(agent.__file__))
+        return parse_with_fallback(*args, **kwargs)
+
+    agent.invoke_intelligence = invoke_intelligence
+    agent.parse_with_fallback = parse
+    agent.greet(name="Ada")  # Warm up: loads the prompt template
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        agent.greet(name="Ada")
+    seconds = (time.perf_counter() - start) / calls
+
+    tracemalloc.start()
+    tracing = True
+    try:
+        agent.greet(name="Ada")
+    finally:
+        tracing = False
+        tracemalloc.stop()
+    return {"us_per_call": seconds * 1e6, "blocks_per_call": sum(blocks)}
+
+
+def run(calls: int) -> Dict[str, Any]:
+    """Return the per-call cost of the task with per-call and module constants."""
+    spec_data = yaml.safe_load(SPEC_PATH.read_text())
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        templates_dir = root / "templates"
+        templates_dir.mkdir()
+        (templates_dir / "task_function.py.j2").write_text(PER_CALL_TEMPLATE)
+
+        per_call = _generate_agent(root / "per_call", spec_data, templates_dir)
+        constants = _generate_agent(root / "constants", spec_data, None)
+        return {
+            "calls": calls,
+            "per_call": _measure(per_call, calls),
+            "constants": _measure(constants, calls),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    row = run(args.calls)
+    print(f"greet, {row['calls']} calls against a stub LLM")
+    print(f"{'variant':<10} {'µs/call':>9} {'blocks/call':>12}")
+    for name in ("per_call", "constants"):
+        entry = row[name]
+        print(
+            f"{name:<10} {entry['us_per_call']:>9.1f} "
+            f"{entry['blocks_per_call']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
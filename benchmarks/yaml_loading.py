@@ -0,0 +1,92 @@
+"""Benchmark the overhead of the bounded YAML loader.
+
+Run with::
+
+    python -m benchmarks.yaml_loading [--sizes 10 100 1000] [--repeat 5]
+
+Each bundled template and each synthetic spec size (see
+``benchmarks.synthetic``) is parsed with plain ``yaml.load`` using the same
+loader class and with ``parse_spec``, which adds the load limit checks. Specs
+whose nesting bound exceeds ``C_COMPOSER_MAX_NESTING`` are composed in Python
+and show the cost of that path. The best of ``--repeat`` runs is reported.
+"""
+
+import argparse
+import time
+from importlib.resources import files
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+from benchmarks.synthetic import make_spec
+from oas_cli.spec_loader import (
+    C_COMPOSER_MAX_NESTING,
+    SafeLoader,
+    _nesting_bound,
+    parse_spec,
+)
+
+
+def _best_ms(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _inputs(sizes: List[int]) -> Dict[str, bytes]:
+    inputs = {
+        entry.name: entry.read_bytes()
+        for entry in sorted(files("oas_cli.templates").iterdir(), key=lambda e: e.name)
+        if entry.name.endswith(".yaml")
+    }
+    for size in sizes:
+        inputs[f"synthetic-{size}"] = yaml.safe_dump(make_spec(size)).encode()
+    return inputs
+
+
+def run(sizes: List[int], repeat: int = 5) -> List[Dict[str, Any]]:
+    """Return plain and bounded parse times for every input."""
+    results = []
+    for name, content in _inputs(sizes).items():
+        plain = _best_ms(lambda: yaml.load(content, Loader=SafeLoader), repeat)
+        bounded = _best_ms(lambda: parse_spec(content), repeat)
+        results.append(
+            {
+                "input": name,
+                "bytes": len(content),
+                "composer": (
+                    "c"
+                    if _nesting_bound(content) <= C_COMPOSER_MAX_NESTING
+                    else "python"
+                ),
+                "plain_ms": plain,
+                "bounded_ms": bounded,
+                "overhead": bounded / plain - 1 if plain else 0.0,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'input':<36} {'bytes':>9} {'composer':>8} "
+        f"{'plain ms':>10} {'bounded ms':>11} {'overhead':>9}"
+    )
+    for row in run(args.sizes, args.repeat):
+        print(
+            f"{row['input']:<36} {row['bytes']:>9} {row['composer']:>8} "
+            f"{row['plain_ms']:>10.2f} {row['bounded_ms']:>11.2f} "
+            f"{row['overhead']:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
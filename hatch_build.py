@@ -0,0 +1,45 @@
+"""Hatch build hook that precompiles the built-in Jinja templates.
+
+Wheels ship ``oas_cli/templates/_compiled`` so that installed CLIs load the
+code generation templates as Python modules instead of parsing them. Editable
+installs keep using the template sources; run
+``python -m oas_cli.template_compiler`` to compile them there too.
+"""
+
+import importlib.util
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class CompileTemplatesHook(BuildHookInterface):
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: Dict[str, Any]) -> None:
+        if self.target_name != "wheel" or version == "editable":
+            return
+
+        # Load the compiler by path: importing the oas_cli package would need
+        # the CLI's runtime dependencies in the build environment
+        root = Path(self.root)
+        spec = importlib.util.spec_from_file_location(
+            "_oas_template_compiler", root / "oas_cli" / "template_compiler.py"
+        )
+        compiler = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(compiler)
+
+        self._output = tempfile.TemporaryDirectory()
+        target = compiler.compile_builtin_templates(
+            root / "oas_cli" / "templates",
+            Path(self._output.name) / compiler.COMPILED_DIR_NAME,
+        )
+        build_data["force_include"][
+            str(target)
+        ] = f"oas_cli/templates/{compiler.COMPILED_DIR_NAME}"
+
+    def finalize(self, version: str, build_data: Dict[str, Any], artifact: str) -> None:
+        output = getattr(self, "_output", None)
+        if output is not None:
+            output.cleanup()
@@ -0,0 +1,326 @@
+"""Batch processing of many Open Agent Spec files."""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import yaml
+
+from .spec_cache import iter_validated_specs
+from .task_graph import TaskGraph
+
+if TYPE_CHECKING:
+    from .code_generation import CodeGenerator
+    from .data_preparation import AgentDataPreparator
+
+# File suffixes picked up when a directory is given
+SPEC_SUFFIXES = (".yaml", ".yml", ".json")
+
+# Errors raised while reading or parsing a spec file
+READ_ERRORS = (OSError, yaml.YAMLError, json.JSONDecodeError)
+
+# Warm generation objects, created once per worker process for each template
+# override directory and reused for every agent that worker generates
+_generation_tools: Dict[
+    Optional[str], Tuple["AgentDataPreparator", "CodeGenerator"]
+] = {}
+
+
+def default_jobs() -> int:
+    """Return the default number of worker processes."""
+    return os.cpu_count() or 1
+
+
+def expand_spec_paths(paths: Iterable[str]) -> List[Path]:
+    """Expand files, directories and glob patterns into a list of spec files.
+
+    Directories are searched recursively for ``*.yaml``, ``*.yml`` and
+    ``*.json`` files.
+    Paths that match nothing are kept as-is so that callers can report them.
+    Duplicates are removed while preserving order.
+    """
+    expanded: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            expanded.extend(
+                sorted(
+                    p
+                    for p in path.rglob("*")
+                    if p.suffix in SPEC_SUFFIXES and p.is_file()
+                )
+            )
+        elif glob.has_magic(raw):
+            expanded.extend(
+                Path(match)
+                for match in sorted(glob.glob(raw, recursive=True))
+                if Path(match).is_file()
+            )
+        else:
+            expanded.append(path)
+
+    seen = set()
+    unique = []
+    for path in expanded:
+        if path not in seen:
+            seen.add(path)
+            unique.append(path)
+    return unique
+
+
+def agent_output_dir(spec_path: Path, spec_dir: Path, output_root: Path) -> Path:
+    """Return the output directory for a spec found under ``spec_dir``.
+
+    The spec's path relative to ``spec_dir`` is mirrored under
+    ``output_root`` without its suffix, so ``specs/team/a.yaml`` becomes
+    ``build/team/a``.
+    """
+    try:
+        relative = spec_path.relative_to(spec_dir)
+    except ValueError:
+        relative = Path(spec_path.name)
+    return output_root / relative.with_suffix("")
+
+
+def _map_specs(
+    func: Callable[..., List[Dict[str, Any]]], jobs: int, *iterables: Sequence[Any]
+) -> Iterator[List[Dict[str, Any]]]:
+    """Apply ``func`` across spec arguments, in a process pool when ``jobs > 1``.
+
+    Results are yielded in input order as they complete.
+    """
+    count = len(iterables[0])
+    if jobs <= 1 or count <= 1:
+        yield from map(func, *iterables)
+        return
+
+    jobs = min(jobs, count)
+    chunksize = max(1, count // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(func, *iterables, chunksize=chunksize)
+
+
+def _document_fields(spec_path: str, document: Optional[int]) -> Dict[str, Any]:
+    """Identify a spec within a file; bundle documents get a ``#index`` suffix."""
+    if document is None:
+        return {"path": spec_path}
+    return {"path": f"{spec_path}#{document}", "file": spec_path, "document": document}
+
+
+def validate_spec_file(
+    spec_path: str, use_cache: bool = True, all_errors: bool = False
+) -> List[Dict[str, Any]]:
+    """Load and validate a spec file, returning one JSON-serialisable result per spec.
+
+    A YAML bundle yields a result per document. Errors are reported in the
+    results rather than raised so that one bad spec never stops a batch.
+    Unchanged specs are served from the spec cache unless ``use_cache`` is
+    False. With ``all_errors`` an invalid spec's result lists every problem
+    under ``errors``. Valid specs with multi-step tasks report each one's
+    worst-case LLM calls under ``multi_step_tasks`` (see
+    ``TaskGraph.llm_costs``).
+    """
+    start = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    try:
+        for entry in iter_validated_specs(spec_path, use_cache, all_errors):
+            result: Dict[str, Any] = {
+                **_document_fields(str(spec_path), entry["document"]),
+                "valid": "error" not in entry,
+            }
+            if "error" in entry:
+                result["error"] = entry["error"]
+                if "errors" in entry:
+                    result["errors"] = entry["errors"]
+            else:
+                result.update(
+                    agent_name=entry["agent_name"], class_name=entry["class_name"]
+                )
+                costs = TaskGraph(entry["spec"].get("tasks", {})).llm_costs()
+                if costs:
+                    result["multi_step_tasks"] = costs
+            results.append(result)
+    except READ_ERRORS as err:
+        results.append(
+            {
+                "path": str(spec_path),
+                "valid": False,
+                "error": f"Error reading spec file: {err}",
+            }
+        )
+    except (KeyError, ValueError) as err:
+        results.append({"path": str(spec_path), "valid": False, "error": str(err)})
+
+    # Each result is charged its share of the file's processing time
+    duration_ms = round((time.perf_counter() - start) * 1000 / len(results), 3)
+    for result in results:
+        result["duration_ms"] = duration_ms
+    return results
+
+
+def iter_validation_results(
+    spec_paths: List[Path],
+    jobs: int = 1,
+    use_cache: bool = True,
+    all_errors: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Validate spec files, yielding results in input order as they complete.
+
+    With ``jobs > 1`` the work is spread across a process pool; each worker
+    compiles the JSON schema once and reuses it for every spec it handles.
+    """
+    for results in _map_specs(
+        validate_spec_file,
+        jobs,
+        [str(p) for p in spec_paths],
+        [use_cache] * len(spec_paths),
+        [all_errors] * len(spec_paths),
+    ):
+        yield from results
+
+
+def _get_generation_tools(
+    templates_dir: Optional[str] = None,
+) -> Tuple["AgentDataPreparator", "CodeGenerator"]:
+    """Return this process's warm data preparator and code generator."""
+    tools = _generation_tools.get(templates_dir)
+    if tools is None:
+        from .code_generation import CodeGenerator, template_override_dirs
+        from .data_preparation import AgentDataPreparator
+
+        tools = (
+            AgentDataPreparator(),
+            CodeGenerator(override_dirs=template_override_dirs(templates_dir)),
+        )
+        _generation_tools[templates_dir] = tools
+    return tools
+
+
+def generate_spec_file(
+    spec_path: str,
+    output_dir: str,
+    use_cache: bool = True,
+    templates_dir: Optional[str] = None,
+    compile_prompts: bool = False,
+    async_target: bool = False,
+) -> List[Dict[str, Any]]:
+    """Validate a spec file and generate its agent projects under ``output_dir``.
+
+    A single spec is generated into ``output_dir``; each spec of a YAML bundle
+    goes into ``output_dir/<agent_name>``. Errors are reported in the results
+    rather than raised so that one bad spec never stops a batch. Templates in
+    ``templates_dir`` override the user's and the built-in ones. With
+    ``compile_prompts`` each agent's prompts are precompiled, and any prompt
+    variables its tasks do not provide are listed under ``prompt_problems``.
+    ``async_target`` generates async agents.
+    """
+    from .manifest import sync_agent_files
+
+    results: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+
+    def finish(result: Dict[str, Any]) -> None:
+        nonlocal start
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        results.append(result)
+        start = time.perf_counter()
+
+    try:
+        for entry in iter_validated_specs(spec_path, use_cache):
+            bundled = entry["document"] is not None
+            result: Dict[str, Any] = {
+                **_document_fields(str(spec_path), entry["document"]),
+                "output": str(output_dir),
+                "success": False,
+            }
+            if "error" in entry:
+                result["error"] = entry["error"]
+                finish(result)
+                continue
+
+            agent_name = entry["agent_name"]
+            output = Path(output_dir) / agent_name if bundled else Path(output_dir)
+            result["output"] = str(output)
+            try:
+                preparator, generator = _get_generation_tools(templates_dir)
+                preparator.fragment_cache.clear()
+                sync_result = sync_agent_files(
+                    output,
+                    entry["spec"],
+                    agent_name,
+                    entry["class_name"],
+                    preparator=preparator,
+                    generator=generator,
+                    compile_prompts=compile_prompts,
+                    async_target=async_target,
+                )
+                result.update(
+                    success=True,
+                    agent_name=agent_name,
+                    class_name=entry["class_name"],
+                    prompt_problems=sync_result.prompt_problems,
+                )
+            except Exception as err:
+                result["error"] = str(err)
+            finish(result)
+    except READ_ERRORS as err:
+        finish(
+            {
+                "path": str(spec_path),
+                "output": str(output_dir),
+                "success": False,
+                "error": f"Error reading spec file: {err}",
+            }
+        )
+    except Exception as err:
+        finish(
+            {
+                "path": str(spec_path),
+                "output": str(output_dir),
+                "success": False,
+                "error": str(err),
+            }
+        )
+    return results
+
+
+def iter_generation_results(
+    targets: List[Tuple[Path, Path]],
+    jobs: int = 1,
+    use_cache: bool = True,
+    templates_dir: Optional[Path] = None,
+    compile_prompts: bool = False,
+    async_target: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Generate agents for ``(spec_path, output_dir)`` pairs.
+
+    Results are yielded in input order, one per generated agent. Each worker
+    process keeps one warm ``AgentDataPreparator`` and ``CodeGenerator`` for
+    all of its agents.
+    """
+    for results in _map_specs(
+        generate_spec_file,
+        jobs,
+        [str(spec) for spec, _ in targets],
+        [str(output) for _, output in targets],
+        [use_cache] * len(targets),
+        [str(templates_dir) if templates_dir else None] * len(targets),
+        [compile_prompts] * len(targets),
+        [async_target] * len(targets),
+    ):
+        yield from results
@@ -1,9 +1,165 @@
 """Code generation utilities and framework for Open Agent Spec."""
 
+import logging
+import os
 import textwrap
+import threading
+from importlib.resources import files
 from pathlib import Path
-from typing import Any, Dict, List, Set, Union, Optional
-from jinja2 import Environment, FileSystemLoader, meta
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    ChoiceLoader,
+    DictLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    meta,
+    nodes,
+)
+from jinja2.bccache import Bucket
+
+from .template_compiler import ENVIRONMENT_OPTIONS, compiled_template_loader
+from .utils import stable_hash
+
+log = logging.getLogger(__name__)
+
+# Process-wide Jinja environments, one per template directory
+_environments: Dict[Tuple[str, ...], Environment] = {}
+# Built-in template sources used when a directory lacks a template, per directory
+_default_templates: Dict[str, Dict[str, str]] = {}
+_bytecode_cache: Optional[BytecodeCache] = None
+_environments_lock = threading.Lock()
+
+# Environment used only to parse template strings, never to load files
+_parse_env = Environment()
+
+
+def default_template_cache_dir() -> Path:
+    """Return the directory holding compiled template bytecode."""
+    override = os.environ.get("OAS_TEMPLATE_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg) / "oas" / "templates"
+
+
+def user_template_dir() -> Path:
+    """Return the directory holding a user's template overrides."""
+    override = os.environ.get("OAS_USER_TEMPLATE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(xdg) / "oas" / "templates"
+
+
+def template_override_dirs(
+    templates_dir: Optional[Union[str, Path]] = None,
+) -> List[Path]:
+    """Return the directories whose templates override the built-in ones.
+
+    A project's ``templates_dir`` (``--templates-dir``) comes first, then
+    the user's directory (see ``user_template_dir``); directories that do not
+    exist are left out.
+    """
+    candidates = [Path(templates_dir)] if templates_dir else []
+    candidates.append(user_template_dir())
+    return [path for path in candidates if path.is_dir()]
+
+
+class MemoryBytecodeCache(BytecodeCache):
+    """Keeps compiled template bytecode for the lifetime of the process."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, bytes] = {}
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        code = self._buckets.get(bucket.key)
+        if code is not None:
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        self._buckets[bucket.key] = bucket.bytecode_to_string()
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+def _create_bytecode_cache() -> BytecodeCache:
+    """Cache bytecode on disk so templates compile once per machine.
+
+    Falls back to an in-memory cache if the cache directory is not writable.
+    """
+    directory = default_template_cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        if os.access(directory, os.W_OK):
+            return FileSystemBytecodeCache(str(directory))
+        log.debug(f"Template cache directory {directory} is not writable")
+    except OSError as err:
+        log.debug(f"Could not create template cache directory {directory}: {err}")
+    return MemoryBytecodeCache()
+
+
+def get_template_environment(
+    template_dir: Union[str, Path], override_dirs: Sequence[Union[str, Path]] = ()
+) -> Environment:
+    """Return the shared Jinja environment for a stack of template directories.
+
+    Templates are looked up in ``override_dirs`` first, in order, then in
+    ``template_dir``. Templates precompiled by ``oas_cli.template_compiler``
+    into ``template_dir/_compiled`` are loaded as Python modules and never
+    parsed; the ``template_dir`` sources come next, then the in-memory
+    defaults registered with ``CodeGenerator.ensure_template_exists``.
+
+    Environments are created once per process for each stack and shared by
+    every ``CodeGenerator``, so each template is parsed and compiled at most
+    once per process. Compiled bytecode is also kept in a cache shared by all
+    environments (on disk under ``default_template_cache_dir()`` when
+    possible), so later CLI runs skip compilation too. Creation is guarded by
+    a lock and the loaders are never changed afterwards, so environments can
+    be used from several threads. Edits to loaded templates are picked up, but
+    a template added to an override directory after the same name was loaded
+    from a lower layer is only seen after ``clear_template_environments``.
+    """
+    global _bytecode_cache
+    base = os.path.abspath(template_dir)
+    key = tuple(os.path.abspath(d) for d in override_dirs) + (base,)
+    env = _environments.get(key)
+    if env is not None:
+        return env
+    with _environments_lock:
+        env = _environments.get(key)
+        if env is None:
+            if _bytecode_cache is None:
+                _bytecode_cache = _create_bytecode_cache()
+            loaders: List[BaseLoader] = [FileSystemLoader(d) for d in key[:-1]]
+            compiled = compiled_template_loader(base)
+            if compiled is not None:
+                log.debug(f"Using precompiled templates for {base}")
+                loaders.append(compiled)
+            defaults = _default_templates.setdefault(base, {})
+            loaders += [FileSystemLoader(base), DictLoader(defaults)]
+            env = Environment(
+                loader=ChoiceLoader(loaders),
+                bytecode_cache=_bytecode_cache,
+                **ENVIRONMENT_OPTIONS,
+            )
+            _environments[key] = env
+    return env
+
+
+def clear_template_environments() -> None:
+    """Forget the shared environments and the bytecode cache they use.
+
+    Defaults registered with ``CodeGenerator.ensure_template_exists`` are kept.
+    """
+    global _bytecode_cache
+    with _environments_lock:
+        _environments.clear()
+        _bytecode_cache = None
 
 
 class PythonCodeSerializer:
@@ -70,13 +226,38 @@ class TemplateVariableParser:
     def extract_jinja_variables(template_str: str) -> Set[str]:
         """Extract variables from Jinja2 template string using proper parsing."""
         try:
-            env = Environment()
-            ast = env.parse(template_str)
+            ast = _parse_env.parse(template_str)
             return meta.find_undeclared_variables(ast)
         except Exception:
             # Fallback to manual parsing if Jinja2 parsing fails
             return TemplateVariableParser._manual_extract_variables(template_str)
 
+    @staticmethod
+    def extract_attribute_references(template_str: str, variable: str) -> Set[str]:
+        """Extract the attributes and constant keys read from a variable.
+
+        ``{{ input.name }}`` and ``{{ input["name"] }}`` both give ``name``;
+        method calls such as ``input.items()`` are not included.
+
+        Raises:
+            jinja2.TemplateSyntaxError: If the template cannot be parsed
+        """
+        ast = _parse_env.parse(template_str)
+        called = {id(call.node) for call in ast.find_all(nodes.Call)}
+        references = set()
+        for node in ast.find_all((nodes.Getattr, nodes.Getitem)):
+            if id(node) in called:
+                continue
+            if not isinstance(node, (nodes.Getattr, nodes.Getitem)):
+                continue
+            if not (isinstance(node.node, nodes.Name) and node.node.name == variable):
+                continue
+            if isinstance(node, nodes.Getattr):
+                references.add(node.attr)
+            elif isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str):
+                references.add(node.arg.value)
+        return references
+
     @staticmethod
     def _manual_extract_variables(template_str: str) -> Set[str]:
         """Manual extraction of {{variable}} patterns as fallback."""
@@ -100,20 +281,20 @@ class TemplateVariableParser:
 class CodeGenerator:
     """Main code generation framework using templates."""
 
-    def __init__(self, template_dir: Optional[Union[str, Path]] = None):
+    def __init__(
+        self,
+        template_dir: Optional[Union[str, Path]] = None,
+        override_dirs: Optional[Sequence[Union[str, Path]]] = None,
+    ):
         if template_dir is None:
-            # Default to templates directory relative to this file
-            current_dir = Path(__file__).parent
-            template_dir = current_dir / "templates"
+            # Default to the templates shipped in the package
+            template_dir = str(files("oas_cli").joinpath("templates"))
+        if override_dirs is None:
+            override_dirs = template_override_dirs()
 
         self.template_dir = Path(template_dir)
-        self.template_dir.mkdir(exist_ok=True)
-
-        self.env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        self.override_dirs = [Path(d) for d in override_dirs]
+        self.env = get_template_environment(self.template_dir, self.override_dirs)
         self.serializer = PythonCodeSerializer()
         self.variable_parser = TemplateVariableParser()
 
@@ -122,6 +303,26 @@ class CodeGenerator:
         template = self.env.get_template(template_name)
         return template.render(**data)
 
+    def get_override(self, template_name: str) -> Optional[Template]:
+        """Return a template if an override directory provides it, else None."""
+        if any((d / template_name).is_file() for d in self.override_dirs):
+            return self.env.get_template(template_name)
+        return None
+
+    def override_fingerprint(self) -> Optional[str]:
+        """Hash the templates of the override directories, or None if there are none.
+
+        Generated code depends on these templates as well as on the spec, so
+        callers that skip unchanged work include this in their cache keys.
+        """
+        sources: Dict[str, str] = {}
+        for directory in self.override_dirs:
+            loader = FileSystemLoader(str(directory))
+            for name in loader.list_templates():
+                if name not in sources:
+                    sources[name] = loader.get_source(self.env, name)[0]
+        return stable_hash(sources) if sources else None
+
     def generate_python_dict(self, data: Dict[str, Any], indent: int = 0) -> str:
         """Generate Python dictionary code."""
         return self.serializer.dict_to_python_code(data, indent)
@@ -135,11 +336,15 @@ class CodeGenerator:
         return self.serializer.format_value(value)
 
     def ensure_template_exists(self, template_name: str, default_content: str) -> None:
-        """Ensure a template file exists, creating it with default content if not."""
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            template_path.parent.mkdir(parents=True, exist_ok=True)
-            template_path.write_text(default_content)
+        """Ensure a template can be loaded, falling back to default content if not.
+
+        The default is only kept in memory and used when the template
+        directory has no such template; nothing is written to disk.
+        """
+        key = os.path.abspath(self.template_dir)
+        _default_templates.setdefault(key, {}).setdefault(
+            template_name, default_content
+        )
 
     def indent_text(self, text: str, indent: int = 1) -> str:
         """Indent text by the specified number of levels (4 spaces each)."""
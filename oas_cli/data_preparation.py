@@ -1,8 +1,15 @@
 """Data preparation utilities for code generation."""
 
 import logging
-from typing import Any, Dict, List
-from .code_generation import PythonCodeSerializer, TemplateVariableParser
+from typing import Any, Dict, List, MutableMapping, Optional
+from .code_generation import (
+    CodeGenerator,
+    PythonCodeSerializer,
+    TemplateVariableParser,
+)
+from .spec_ir import SpecIR, TaskIR
+from .timing import NULL_TIMER, PhaseTimer
+from .utils import stable_hash
 
 
 log = logging.getLogger(__name__)
@@ -11,66 +18,90 @@ log = logging.getLogger(__name__)
 class AgentDataPreparator:
     """Prepares structured data for agent code generation."""
 
-    def __init__(self) -> None:
+    # Spec sections that every task function depends on besides its own definition
+    TASK_CONTEXT_SECTIONS = ("agent", "intelligence", "behavioural_contract", "memory")
+
+    def __init__(
+        self,
+        fragment_cache: Optional[MutableMapping[str, Dict[str, str]]] = None,
+        timer: PhaseTimer = NULL_TIMER,
+    ) -> None:
         self.serializer = PythonCodeSerializer()
         self.variable_parser = TemplateVariableParser()
+        # Generated task functions and models keyed by a hash of their inputs,
+        # so that unchanged tasks are not regenerated on incremental updates
+        self.fragment_cache: MutableMapping[str, Dict[str, str]] = (
+            {} if fragment_cache is None else fragment_cache
+        )
+        # Tasks whose fragments were regenerated by the last prepare_all_data call
+        self.recomputed_tasks: List[str] = []
+        # Records the prepare phase and each task when timings are requested
+        self.timer = timer
 
     def prepare_all_data(
-        self, spec_data: Dict[str, Any], agent_name: str, class_name: str
+        self,
+        spec_data: Dict[str, Any],
+        agent_name: str,
+        class_name: str,
+        generator: Optional[CodeGenerator] = None,
+        ir: Optional[SpecIR] = None,
+    ) -> Dict[str, Any]:
+        """Prepare all data needed for agent generation.
+
+        If ``generator`` has an override of ``task_function.py.j2``, single
+        LLM task functions are rendered with it. ``ir`` is the spec's IR if
+        the caller already built it.
+        """
+        with self.timer.phase("prepare"):
+            if ir is None:
+                ir = SpecIR(spec_data)
+            return self._prepare_all_data(ir, agent_name, class_name, generator)
+
+    def _prepare_all_data(
+        self,
+        ir: SpecIR,
+        agent_name: str,
+        class_name: str,
+        generator: Optional[CodeGenerator] = None,
     ) -> Dict[str, Any]:
-        """Prepare all data needed for agent generation."""
-        config = self._prepare_config(spec_data)
-        memory_config = self._prepare_memory_config(spec_data)
+        fragments = self._prepare_task_fragments(ir, agent_name, generator)
 
         return {
             "agent_name": agent_name,
             "class_name": class_name,
-            "imports": self._prepare_imports(spec_data),
-            "models": self._prepare_models(spec_data),
-            "task_functions": self._prepare_task_functions(
-                spec_data, agent_name, memory_config, config
-            ),
-            "class_methods": self._prepare_class_methods(spec_data),
-            "memory_methods": self._prepare_memory_methods(spec_data),
-            "config": config,
-            "embedded_config": self._prepare_embedded_config(spec_data),
+            "imports": self._prepare_imports(ir),
+            "prompt_loader": self._prepare_prompt_loader(ir),
+            "async_runtime": self._prepare_async_runtime(ir),
+            "models": [
+                fragment["model"] for fragment in fragments if fragment["model"]
+            ],
+            "task_functions": [fragment["function"] for fragment in fragments],
+            "class_methods": self._prepare_class_methods(ir),
+            "memory_methods": self._prepare_memory_methods(ir),
+            "config": ir.config,
+            "embedded_config": self._prepare_embedded_config(ir.data),
             "setup_logging_method": self._prepare_setup_logging_method(),
-            "handle_message_method": self._prepare_handle_message_method(),
-            "custom_router_loader": self._prepare_custom_router_loader(
-                spec_data, config
+            "handle_message_method": self._prepare_handle_message_method(
+                ir.intelligence.is_async
             ),
-            "custom_router_init": self._prepare_custom_router_init(spec_data, config),
-            "example_task_code": self._prepare_example_task_code(spec_data),
-        }
-
-    def _prepare_config(self, spec_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare basic configuration."""
-        intelligence = spec_data.get("intelligence", {})
-        return {
-            "endpoint": intelligence.get("endpoint", "https://api.openai.com/v1"),
-            "model": intelligence.get("model", "gpt-3.5-turbo"),
-            "temperature": intelligence.get("config", {}).get("temperature", 0.7),
-            "max_tokens": intelligence.get("config", {}).get("max_tokens", 1000),
+            "custom_router_loader": self._prepare_custom_router_loader(ir),
+            "custom_router_init": self._prepare_custom_router_init(ir),
+            "example_task_code": self._prepare_example_task_code(ir),
         }
 
-    def _prepare_memory_config(self, spec_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare memory configuration."""
-        from .generators import (
-            get_memory_config,
-        )  # Import here to avoid circular imports
-
-        return get_memory_config(spec_data)
-
-    def _prepare_imports(self, spec_data: Dict[str, Any]) -> List[str]:
+    def _prepare_imports(self, ir: SpecIR) -> List[str]:
         """Prepare import statements."""
         # Base imports
         imports = [
             "import os",
             "import logging",
             "import json",
+            "import hashlib",
             "from pathlib import Path",
+            "from types import MappingProxyType",
             "from typing import Optional, Any, Dict",
-            "from jinja2 import Environment, FileSystemLoader",
+            "import jinja2",
+            "from jinja2 import ChoiceLoader, Environment, FileSystemLoader, ModuleLoader, TemplateNotFound",
             "from pydantic import BaseModel",
             "from behavioural_contracts import behavioural_contract",
             "from dotenv import load_dotenv",
@@ -80,11 +111,7 @@ class AgentDataPreparator:
             "from dacp.orchestrator import Orchestrator",
         ]
 
-        # Check if any task uses tools
-        tasks = spec_data.get("tasks", {})
-        uses_tools = any(task_def.get("tool") for task_def in tasks.values())
-
-        if uses_tools:
+        if ir.uses_tools:
             imports.extend(
                 [
                     "from dacp import execute_tool",
@@ -93,98 +120,299 @@ class AgentDataPreparator:
             )
 
         # Check if custom router is needed
-        engine = spec_data.get("intelligence", {}).get("engine", "openai")
-        custom_module = spec_data.get("intelligence", {}).get("module", None)
-
-        if engine == "custom" and custom_module:
+        if ir.intelligence.custom_router:
             imports.append("import importlib")
 
+        # Independent steps of sync multi-step tasks run in a thread pool
+        if ir.has_concurrent_steps and not ir.intelligence.is_async:
+            imports.append("from concurrent.futures import ThreadPoolExecutor")
+
+        if ir.intelligence.is_async:
+            imports.extend(
+                [
+                    "import asyncio",
+                    "import contextvars",
+                    "import functools",
+                    "import threading",
+                    "import weakref",
+                ]
+            )
+
         return imports
 
-    def _prepare_models(self, spec_data: Dict[str, Any]) -> List[str]:
-        """Prepare Pydantic model definitions."""
-        from .generators import (
-            _generate_pydantic_model,
-        )  # Import here to avoid circular imports
+    def _prepare_prompt_loader(self, ir: SpecIR) -> str:
+        """Prepare the prompt template cache if any task renders a prompt."""
+        if not any(task.renders_prompt for task in ir.tasks.values()):
+            return ""
+
+        return '''PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+COMPILED_PROMPTS_DIR = os.path.join(PROMPTS_DIR, "_compiled")
+
+# Prompt templates are compiled once, on first use. Set OAS_PROMPT_RELOAD=1 to
+# reload a template whenever its file changes, e.g. while editing prompts.
+PROMPT_RELOAD = os.getenv("OAS_PROMPT_RELOAD", "").lower() in ("1", "true", "yes")
+
+
+def _compiled_prompts_loader():
+    """Return a loader for the prompts precompiled by `oas init --compile-prompts`
+    or `oas update --compile-prompts`, unless they are missing or out of date."""
+    try:
+        with open(os.path.join(COMPILED_PROMPTS_DIR, "manifest.json")) as f:
+            manifest = json.load(f)
+        sources = {}
+        for name in sorted(os.listdir(PROMPTS_DIR)):
+            if name.endswith(".jinja2"):
+                with open(os.path.join(PROMPTS_DIR, name), "rb") as f:
+                    sources[name] = hashlib.sha256(f.read()).hexdigest()
+    except (OSError, ValueError):
+        return None
+    if manifest != {"jinja2": jinja2.__version__, "options": {}, "templates": sources}:
+        log.debug("Ignoring stale compiled prompt templates")
+        return None
+    return ModuleLoader(COMPILED_PROMPTS_DIR)
+
+
+_prompt_loaders = [FileSystemLoader(".")]
+_compiled_loader = None if PROMPT_RELOAD else _compiled_prompts_loader()
+if _compiled_loader is not None:
+    _prompt_loaders.append(_compiled_loader)
+_prompt_loaders.append(FileSystemLoader(PROMPTS_DIR))
+_prompt_env = Environment(loader=ChoiceLoader(_prompt_loaders), auto_reload=PROMPT_RELOAD)
+_prompt_templates = {}
+
+
+def load_prompt_template(name: str):
+    """Return the compiled prompt template of a task, loading it on first use."""
+    template = _prompt_templates.get(name)
+    if template is None or (PROMPT_RELOAD and not template.is_up_to_date):
+        try:
+            template = _prompt_env.get_template(f"{name}.jinja2")
+        except TemplateNotFound:
+            log.warning(f"Prompt template {name}.jinja2 not found, using default template")
+            template = _prompt_env.get_template("agent_prompt.jinja2")
+        _prompt_templates[name] = template
+    return template'''
+
+    def _prepare_async_runtime(self, ir: SpecIR) -> str:
+        """Prepare the async LLM calls and sync wrappers of async agents."""
+        if not ir.intelligence.is_async:
+            return ""
 
-        models = []
-        tasks = spec_data.get("tasks", {})
+        return '''# Async LLM clients are created once per event loop and engine, so that
+# concurrent calls share their connection pools
+_async_clients = weakref.WeakKeyDictionary()
 
-        for task_name, task_def in tasks.items():
-            model_name = f"{task_name.replace('-', '_').title()}Output"
-            model_def = _generate_pydantic_model(model_name, task_def.get("output", {}))
-            if model_def:
-                models.append(model_def)
 
-        return models
+def _async_client(engine: str, config):
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    key = (engine, config.get("api_key"), config.get("base_url"))
+    client = clients.get(key)
+    if client is None:
+        if engine == "anthropic":
+            import anthropic
 
-    def _prepare_task_functions(
-        self,
-        spec_data: Dict[str, Any],
-        agent_name: str,
-        memory_config: Dict[str, Any],
-        config: Dict[str, Any],
-    ) -> List[str]:
-        """Prepare task function code."""
-        from .generators import (
-            _generate_task_function,
-        )  # Import here to avoid circular imports
+            api_key = config.get("api_key") or os.getenv("ANTHROPIC_API_KEY")
+            client = anthropic.AsyncAnthropic(api_key=api_key, base_url=config.get("base_url"))
+        else:
+            import openai
+
+            api_key = config.get("api_key") or os.getenv("OPENAI_API_KEY")
+            client = openai.AsyncOpenAI(api_key=api_key, base_url=config.get("base_url"))
+        clients[key] = client
+    return client
+
+
+async def ainvoke_intelligence(prompt: str, config):
+    """Async counterpart of DACP's invoke_intelligence.
+
+    OpenAI and Anthropic requests use the pooled async clients; other engines
+    run the blocking DACP call in a worker thread.
+    """
+    engine = config.get("engine", "").lower()
+    temperature = config.get("temperature", 0.7)
+    max_tokens = config.get("max_tokens", 1000)
+    messages = [{"role": "user", "content": prompt}]
+    if engine in ("openai", "gpt"):
+        response = await _async_client("openai", config).chat.completions.create(
+            model=config.get("model", "gpt-3.5-turbo"),
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        content = response.choices[0].message.content
+        if content is None:
+            raise ValueError("OpenAI returned empty response")
+        return str(content)
+    if engine in ("anthropic", "claude"):
+        response = await _async_client("anthropic", config).messages.create(
+            model=config.get("model", "claude-3-haiku-20240307"),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=messages,
+        )
+        return str(response.content[0].text)
+    return await asyncio.to_thread(invoke_intelligence, prompt, config)
 
-        task_functions = []
-        tasks = spec_data.get("tasks", {})
 
-        for task_name, task_def in tasks.items():
-            task_function = _generate_task_function(
-                task_name, task_def, spec_data, agent_name, memory_config, config
-            )
-            task_functions.append(task_function)
+# Result of the coroutine a contract is checking, see async_behavioural_contract
+_awaited_outcome = contextvars.ContextVar("_awaited_outcome")
 
-        return task_functions
 
-    def _prepare_class_methods(self, spec_data: Dict[str, Any]) -> List[str]:
-        """Prepare agent class methods."""
+def async_behavioural_contract(**contract):
+    """behavioural_contract for coroutine functions: the contract checks
+    the awaited result, or escalates the error the coroutine raised."""
+
+    def decorator(func):
+        @behavioural_contract(**contract)
+        @functools.wraps(func)
+        def check(*args, **kwargs):
+            outcome = _awaited_outcome.get()
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                outcome = await func(*args, **kwargs)
+            except Exception as e:
+                outcome = e
+            token = _awaited_outcome.set(outcome)
+            try:
+                return check(*args, **kwargs)
+            finally:
+                _awaited_outcome.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+_sync_loop = None
+_sync_loop_lock = threading.Lock()
+
+
+def run_sync(coro):
+    """Run a coroutine from synchronous code and return its result.
+
+    Synchronous callers share one event loop in a background thread, and so
+    the pooled LLM clients.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="agent-async", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()'''
+
+    def _prepare_task_fragments(
+        self,
+        ir: SpecIR,
+        agent_name: str,
+        generator: Optional[CodeGenerator] = None,
+    ) -> List[Dict[str, str]]:
+        """Prepare the Pydantic model and task function code for every task.
+
+        Fragments are looked up in ``fragment_cache`` by a hash of the task
+        definition and the spec sections it depends on, plus the override
+        templates when a ``task_function.py.j2`` override is used; only tasks
+        whose inputs changed are regenerated. Entries for tasks that no longer
+        exist are dropped from the cache.
+        """
         from .generators import (
-            _generate_input_params,
+            _generate_pydantic_model,
+            _generate_task_function,
         )  # Import here to avoid circular imports
 
+        spec_data, memory_config, config = ir.data, ir.memory, ir.config
+        context = {
+            section: spec_data.get(section) for section in self.TASK_CONTEXT_SECTIONS
+        }
+        task_template = None
+        if generator is not None:
+            task_template = generator.get_override("task_function.py.j2")
+            if task_template is not None:
+                context["templates"] = generator.override_fingerprint()
+        fragments = []
+        used_keys = set()
+        self.recomputed_tasks = []
+
+        for task_name, task in ir.tasks.items():
+            task_def = task.definition
+            key = stable_hash(
+                [task_name, task_def, agent_name, memory_config, config, context]
+            )
+            used_keys.add(key)
+            with self.timer.task(task_name):
+                fragment = self.fragment_cache.get(key)
+                if fragment is None:
+                    fragment = {
+                        "model": _generate_pydantic_model(task.model_name, task.output),
+                        "function": _generate_task_function(
+                            task_name,
+                            task_def,
+                            spec_data,
+                            agent_name,
+                            memory_config,
+                            config,
+                            task_template,
+                            task,
+                        ),
+                    }
+                    self.fragment_cache[key] = fragment
+                    self.recomputed_tasks.append(task_name)
+            fragments.append(fragment)
+
+        for stale_key in [k for k in self.fragment_cache if k not in used_keys]:
+            del self.fragment_cache[stale_key]
+
+        return fragments
+
+    def _prepare_class_methods(self, ir: SpecIR) -> List[str]:
+        """Prepare agent class methods.
+
+        Async agents get an async method per task, awaiting the async task
+        function, and a synchronous method of the task's name wrapping it.
+        """
         class_methods = []
-        tasks = spec_data.get("tasks", {})
 
-        for task_name, task_def in tasks.items():
-            model_name = f"{task_name.replace('-', '_').title()}Output"
+        for task_name, task in ir.tasks.items():
+            func_name, model_name = task.func_name, task.model_name
 
             # Get input parameters without memory
-            input_params_without_memory = [
-                param.split(":")[0]
-                for param in _generate_input_params(task_def)
-                if param != "memory_summary: str = ''"
-            ]
-
-            # Generate method signature and call
-            if input_params_without_memory:
-                method_signature = f"def {task_name.replace('-', '_')}(self, {', '.join(input_params_without_memory)}) -> {model_name}:"
-                method_call = f"return {task_name.replace('-', '_')}({', '.join(input_params_without_memory)}, memory_summary=memory_summary)"
-            else:
-                method_signature = (
-                    f"def {task_name.replace('-', '_')}(self) -> {model_name}:"
-                )
-                method_call = f"return {task_name.replace('-', '_')}(memory_summary=memory_summary)"
+            params = ", ".join(task.param_names)
+            method_params = f"self, {params}" if params else "self"
+            call_args = (
+                f"{params}, memory_summary=memory_summary"
+                if params
+                else "memory_summary=memory_summary"
+            )
+
+            if ir.intelligence.is_async:
+                class_method = f'''
+    async def {func_name}_async({method_params}) -> {model_name}:
+        """Process {task_name} task."""
+        memory_summary = self.get_memory() if hasattr(self, 'get_memory') else ""
+        return await {func_name}_async({call_args})
 
-            class_method = f'''
-    {method_signature}
+    def {func_name}({method_params}) -> {model_name}:
+        """Process {task_name} task; synchronous wrapper of {func_name}_async."""
+        return run_sync(self.{func_name}_async({params}))
+'''
+            else:
+                class_method = f'''
+    def {func_name}({method_params}) -> {model_name}:
         """Process {task_name} task."""
         memory_summary = self.get_memory() if hasattr(self, 'get_memory') else ""
-        {method_call}
+        return {func_name}({call_args})
 '''
             class_methods.append(class_method)
 
         return class_methods
 
-    def _prepare_memory_methods(self, spec_data: Dict[str, Any]) -> List[str]:
+    def _prepare_memory_methods(self, ir: SpecIR) -> List[str]:
         """Prepare memory-related methods if memory is enabled."""
-        memory_config = self._prepare_memory_config(spec_data)
-
-        if not memory_config["enabled"]:
+        if not ir.memory["enabled"]:
             return []
 
         return [
@@ -281,32 +509,39 @@ class AgentDataPreparator:
         )
 '''
 
-    def _prepare_handle_message_method(self) -> str:
-        """Prepare handle_message method."""
-        return '''
-    def handle_message(self, message: dict) -> dict:
+    def _prepare_handle_message_method(self, is_async: bool = False) -> str:
+        """Prepare handle_message method.
+
+        Async agents get ``handle_message_async``, which awaits the task's
+        async method, and a synchronous ``handle_message`` wrapping it.
+        """
+        name, method_suffix, await_ = "handle_message", "", ""
+        if is_async:
+            name, method_suffix, await_ = "handle_message_async", "_async", "await "
+        method = f'''
+    {"async " if is_async else ""}def {name}(self, message: dict) -> dict:
         """
         Handles incoming messages from the orchestrator.
         Processes messages based on the task specified and routes to appropriate agent methods.
         """
         task = message.get("task")
         if not task:
-            return {"error": "Missing required field: task"}
+            return {{"error": "Missing required field: task"}}
 
         # Map task names to method names (replace hyphens with underscores)
-        method_name = task.replace("-", "_")
+        method_name = task.replace("-", "_"){f' + "{method_suffix}"' if is_async else ""}
 
         # Check if the method exists on this agent
         if not hasattr(self, method_name):
-            return {"error": f"Unknown task: {task}"}
+            return {{"error": f"Unknown task: {{task}}"}}
 
         try:
             # Get the method and extract its parameters (excluding 'self')
             method = getattr(self, method_name)
 
             # Call the method with the message parameters (excluding 'task')
-            method_params = {k: v for k, v in message.items() if k != "task"}
-            result = method(**method_params)
+            method_params = {{k: v for k, v in message.items() if k != "task"}}
+            result = {await_}method(**method_params)
 
             # Handle both Pydantic models and dictionaries
             if hasattr(result, 'model_dump'):
@@ -315,19 +550,22 @@ class AgentDataPreparator:
                 return result
 
         except TypeError as e:
-            return {"error": f"Invalid parameters for task {task}: {str(e)}"}
+            return {{"error": f"Invalid parameters for task {{task}}: {{str(e)}}"}}
         except Exception as e:
-            return {"error": f"Error executing task {task}: {str(e)}"}
+            return {{"error": f"Error executing task {{task}}: {{str(e)}}"}}
+'''
+        if is_async:
+            method += '''
+    def handle_message(self, message: dict) -> dict:
+        """Synchronous wrapper of handle_message_async, for the orchestrator."""
+        return run_sync(self.handle_message_async(message))
 '''
+        return method
 
-    def _prepare_custom_router_loader(
-        self, spec_data: Dict[str, Any], config: Dict[str, Any]
-    ) -> str:
+    def _prepare_custom_router_loader(self, ir: SpecIR) -> str:
         """Prepare custom router loader if needed."""
-        engine = spec_data.get("intelligence", {}).get("engine", "openai")
-        custom_module = spec_data.get("intelligence", {}).get("module", None)
-
-        if engine != "custom" or not custom_module:
+        custom_module = ir.intelligence.custom_router
+        if not custom_module:
             return ""
 
         return f'''
@@ -342,56 +580,29 @@ def load_custom_llm_router(endpoint, model, config):
     return router
 '''
 
-    def _prepare_custom_router_init(
-        self, spec_data: Dict[str, Any], config: Dict[str, Any]
-    ) -> str:
+    def _prepare_custom_router_init(self, ir: SpecIR) -> str:
         """Prepare custom router initialization if needed."""
-        engine = spec_data.get("intelligence", {}).get("engine", "openai")
-        custom_module = spec_data.get("intelligence", {}).get("module", None)
-
-        if engine != "custom" or not custom_module:
+        custom_module = ir.intelligence.custom_router
+        if not custom_module:
             return ""
 
+        config = ir.config
         return f'self.router = load_custom_llm_router("{config["endpoint"]}", "{config["model"]}", {{}})  # {custom_module}'
 
-    def _prepare_example_task_code(self, spec_data: Dict[str, Any]) -> str:
+    def _prepare_example_task_code(self, ir: SpecIR) -> str:
         """Prepare example task execution code."""
-        tasks = spec_data.get("tasks", {})
-        if not tasks:
+        # Prioritize multi-step tasks, falling back to the first regular task
+        task = ir.example_task()
+        if task is None:
             return ""
+        return self._generate_example_for_task(task)
 
-        # Prioritize multi-step tasks for examples
-        multi_step_tasks = [
-            name
-            for name, task_def in tasks.items()
-            if task_def.get("multi_step", False)
-        ]
-
-        if multi_step_tasks:
-            return self._generate_example_for_task(
-                multi_step_tasks[0], tasks[multi_step_tasks[0]]
-            )
-        else:
-            # Fall back to the first regular task
-            first_task_name = next(iter(tasks))
-            return self._generate_example_for_task(
-                first_task_name, tasks[first_task_name]
-            )
-
-    def _generate_example_for_task(
-        self, task_name: str, task_def: Dict[str, Any]
-    ) -> str:
+    def _generate_example_for_task(self, task: TaskIR) -> str:
         """Generate example code for a specific task."""
-        from .generators import (
-            _generate_input_params,
-        )  # Import here to avoid circular imports
+        task_name, task_def = task.name, task.definition
 
         # Get input parameters
-        input_params = [
-            param.split(":")[0]
-            for param in _generate_input_params(task_def)
-            if param != "memory_summary: str = ''"
-        ]
+        input_params = task.param_names
 
         if "tool" in task_def:
             # For tool tasks, provide safe example values
@@ -409,12 +620,12 @@ def load_custom_llm_router(endpoint, model, config):
         else:
             example_params = ""
 
-        task_type = "multi-step" if task_def.get("multi_step", False) else task_name
+        task_type = "multi-step" if task.multi_step else task_name
 
         if example_params:
             return f"""
     # Example usage with {task_type} task: {task_name}
-    result = agent.{task_name.replace("-", "_")}({example_params})
+    result = agent.{task.func_name}({example_params})
     # Handle both Pydantic models and dictionaries
     if hasattr(result, 'model_dump'):
         print(json.dumps(result.model_dump(), indent=2))
@@ -423,7 +634,7 @@ def load_custom_llm_router(endpoint, model, config):
         else:
             return f"""
     # Example usage with {task_type} task: {task_name}
-    result = agent.{task_name.replace("-", "_")}()
+    result = agent.{task.func_name}()
     # Handle both Pydantic models and dictionaries
     if hasattr(result, 'model_dump'):
         print(json.dumps(result.model_dump(), indent=2))
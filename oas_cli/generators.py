@@ -2,25 +2,25 @@
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .spec_normalizer import PROMPT_TEMPLATE_KEY, normalize_spec
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+    from .code_generation import CodeGenerator
+    from .data_preparation import AgentDataPreparator
+    from .spec_ir import SpecIR, TaskIR
 
 
 log = logging.getLogger("oas")
 
 
 def get_agent_info(spec_data: Dict[str, Any]) -> Dict[str, str]:
-    """Get agent info from either old or new spec format."""
-    # Try new format first
-    agent = spec_data.get("agent", {})
-    if agent:
-        return {
-            "name": agent.get("name", ""),
-            "description": agent.get("description", ""),
-        }
-
-    # Fall back to old format
-    info = spec_data.get("info", {})
-    return {"name": info.get("name", ""), "description": info.get("description", "")}
+    """Get agent info from a spec in any supported format."""
+    agent = normalize_spec(spec_data)["agent"]
+    return {"name": agent.get("name", ""), "description": agent.get("description", "")}
 
 
 def get_memory_config(spec_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -55,50 +55,36 @@ def to_pascal_case(name: str) -> str:
     return "".join(word.capitalize() for word in name.split("_"))
 
 
+def _task_constant_name(task_name: str, suffix: str) -> str:
+    """Name of a module-level constant holding data a task function reuses."""
+    return f"{task_name.replace('-', '_').upper()}_{suffix}"
+
+
+def _is_async(spec_data: Dict[str, Any]) -> bool:
+    """Whether the spec asks for async task functions (``intelligence.async``)."""
+    return bool(spec_data.get("intelligence", {}).get("async", False))
+
+
+def _generate_sync_wrapper(task: "TaskIR") -> str:
+    """Generate the synchronous function wrapping an async task function."""
+    args = ", ".join([*task.param_names, "memory_summary=memory_summary"])
+    return f'''
+
+def {task.func_name}({", ".join(task.input_params)}) -> {task.model_name}:
+    """Synchronous wrapper of {task.func_name}_async."""
+    return run_sync({task.func_name}_async({args}))
+'''
+
+
 def _generate_input_params(task_def: Dict[str, Any]) -> List[str]:
-    """Generate input parameters for a task function."""
-    input_params = []
+    """Generate input parameters for a task function.
 
-    # Check if this is a multi-step task
-    is_multi_step = task_def.get("multi_step", False)
-
-    if is_multi_step:
-        # For multi-step tasks, infer input parameters from step input mappings
-        steps = task_def.get("steps", [])
-        inferred_params = set()
-
-        for step in steps:
-            input_map = step.get("input_map", {})
-            for param, value in input_map.items():
-                # Handle Jinja2-style templating {{variable}}
-                if isinstance(value, str) and "{{" in value and "}}" in value:
-                    # Extract variable name from {{variable}}
-                    var_name = value.replace("{{", "").replace("}}", "").strip()
-                    # Handle nested references like input.name -> extract just 'name'
-                    if "." in var_name:
-                        parts = var_name.split(".")
-                        if parts[0] == "input":
-                            # This is an input parameter
-                            var_name = parts[-1]
-                            inferred_params.add(var_name)
-                        # Skip steps.* references as they are previous step results, not input parameters
-                    else:
-                        # Simple variable name without dots
-                        inferred_params.add(var_name)
-
-        # Add inferred parameters
-        for param_name in sorted(inferred_params):
-            input_params.append(f"{param_name}: str")
-    else:
-        # For regular tasks, use the input schema
-        for param_name, param_def in (
-            task_def.get("input", {}).get("properties", {}).items()
-        ):
-            param_type = map_type_to_python(param_def.get("type", "string"))
-            input_params.append(f"{param_name}: {param_type}")
+    Multi-step tasks take the inputs their steps reference; other tasks take
+    the properties of their input schema. See ``TaskIR``.
+    """
+    from .spec_ir import TaskIR
 
-    input_params.append("memory_summary: str = ''")
-    return input_params
+    return TaskIR("", task_def).input_params
 
 
 def _generate_function_docstring(
@@ -303,21 +289,26 @@ def _generate_llm_output_parser(task_name: str, output_schema: Dict[str, Any]) -
         elif field_type in ["integer", "number"]:
             default_value = "0"
         elif field_type == "array":
-            default_value = "[]"
+            # Immutable, as the defaults are shared by every call
+            default_value = "()"
         elif field_type == "object":
-            default_value = "{}"
+            default_value = "MappingProxyType({})"
         else:
             default_value = '""'
 
-        default_values.append(f'            "{field_name}": {default_value}')
+        default_values.append(f'    "{field_name}": {default_value}')
 
-    # Build defaults as a properly formatted dictionary
+    # Build defaults as a read-only module-level mapping
     if default_values:
-        defaults_dict = "{\n" + ",\n".join(default_values) + "\n        }"
+        defaults_dict = "{\n" + ",\n".join(default_values) + "\n}"
     else:
         defaults_dict = "{}"
+    defaults_name = _task_constant_name(task_name, "OUTPUT_DEFAULTS")
+
+    return f"""{defaults_name} = MappingProxyType({defaults_dict})
+
 
-    return f"""def {parser_name}(response) -> {model_name}:
+def {parser_name}(response) -> {model_name}:
     \"\"\"Parse LLM response into {model_name} using DACP's enhanced parser.
 
     Args:
@@ -334,11 +325,10 @@ def _generate_llm_output_parser(task_name: str, output_schema: Dict[str, Any]) -
 
     # Use DACP's enhanced JSON parser with fallback support
     try:
-        defaults = {defaults_dict}
         result = parse_with_fallback(
             response=response,
             model_class={model_name},
-            **defaults
+            **{defaults_name}
         )
         return result
     except Exception as e:
@@ -427,72 +417,102 @@ def _generate_multi_step_task_function(
     spec_data: Dict[str, Any],
     agent_name: str,
     memory_config: Dict[str, Any],
+    task: Optional["TaskIR"] = None,
 ) -> str:
     """Generate a multi-step task function that orchestrates other tasks."""
-    func_name = task_name.replace("-", "_")
-    input_params = _generate_input_params(task_def)
-    output_type = f"{task_name.replace('-', '_').title()}Output"
+    from .spec_ir import INPUT_ARG, LITERAL_ARG, STEP_ARG, TaskIR
+
+    if task is None:
+        task = TaskIR(task_name, task_def)
+    func_name = task.func_name
+    input_params = task.input_params
+    output_type = task.model_name
     docstring = _generate_function_docstring(task_name, task_def, output_type)
     contract_data = _generate_contract_data(
         spec_data, task_def, agent_name, memory_config
     )
 
-    # Get the steps from the task definition
-    steps = task_def.get("steps", [])
+    # Async tasks await the async functions of their steps
+    is_async = _is_async(spec_data)
 
-    # Generate step execution code
-    step_code = []
+    # Generate the call of each step
+    step_calls: List[str] = []
     step_results: List[str] = []
 
-    for i, step in enumerate(steps):
-        step_task = step["task"]
-        input_map = step.get("input_map", {})
-
-        # Convert input mapping to Python code
+    for step in task.steps:
+        # Convert the step's arguments to Python code
         step_inputs = []
-        for param, value in input_map.items():
-            # Handle Jinja2-style templating {{variable}}
-            if isinstance(value, str) and "{{" in value and "}}" in value:
-                # Extract variable name from {{variable}}
-                var_name = value.replace("{{", "").replace("}}", "").strip()
-                # Handle nested references like input.name -> extract just 'name'
-                if "." in var_name:
-                    parts = var_name.split(".")
-                    if parts[0] == "input":
-                        # This is an input parameter
-                        var_name = parts[-1]
-                        step_inputs.append(f"{param}={var_name}")
-                    elif parts[0] == "steps" and len(parts) >= 3:
-                        # This is a reference to a previous step result
-                        step_index = int(parts[1])
-                        field_name = parts[2]
-                        if step_index < i:  # Only reference previous steps
-                            step_var = step_results[step_index]
-                            step_inputs.append(
-                                f"{param}={step_var}.{field_name} if hasattr({step_var}, '{field_name}') else {step_var}.get('{field_name}', '')"
-                            )
-                        else:
-                            # Invalid reference to future step
-                            step_inputs.append(f'{param}=""')
-                else:
-                    # Simple variable name without dots
-                    step_inputs.append(f"{param}={var_name}")
-            else:
-                # Literal value
+        for param, kind, value in step.arguments:
+            if kind == INPUT_ARG:
+                step_inputs.append(f"{param}={value}")
+            elif kind == STEP_ARG:
+                # A previous step's result
+                step_var = step_results[value[0]]
+                field_name = value[1]
+                step_inputs.append(
+                    f"{param}={step_var}.{field_name} if hasattr({step_var}, '{field_name}') else {step_var}.get('{field_name}', '')"
+                )
+            elif kind == LITERAL_ARG:
                 step_inputs.append(f'{param}="{value}"')
+            else:
+                # Invalid reference to the current or a future step
+                step_inputs.append(f'{param}=""')
 
-        step_input_str = ", ".join(step_inputs)
-        step_var = f"step_{i}_result"
-        step_results.append(step_var)
+        step_calls.append(", ".join(step_inputs))
+        step_results.append(f"step_{step.index}_result")
 
-        step_code.append(
-            f"""    # Execute step {i + 1}: {step_task}
-    {step_var} = {step_task.replace("-", "_")}({step_input_str})"""
-        )
+    # Run the steps wave by wave; the steps of a wave do not read each
+    # other's results, so they run concurrently
+    step_code = []
+    for wave in task.waves:
+        if len(wave) == 1:
+            step = wave[0]
+            step_call = f"{step.func_name}({step_calls[step.index]})"
+            if is_async:
+                step_call = f"await {step.func_name}_async({step_calls[step.index]})"
+            step_code.append(
+                f"""    # Execute step {step.index + 1}: {step.task}
+    {step_results[step.index]} = {step_call}"""
+            )
+            continue
+
+        numbers = ", ".join(str(step.index + 1) for step in wave)
+        names = ", ".join(step.task for step in wave)
+        if is_async:
+            calls = "".join(
+                f"\n        {step.func_name}_async({step_calls[step.index]}),"
+                for step in wave
+            )
+            results = ", ".join(step_results[step.index] for step in wave)
+            step_code.append(
+                f"""    # Execute steps {numbers} concurrently: {names}
+    wave_results = await asyncio.gather({calls}
+        return_exceptions=True,
+    )
+    # Raise the first failure in step order, as a sequential run would
+    for wave_result in wave_results:
+        if isinstance(wave_result, BaseException):
+            raise wave_result
+    {results} = wave_results"""
+            )
+        else:
+            submits = ""
+            results = ""
+            for step in wave:
+                future = f"step_{step.index}_future"
+                submit_args = ", ".join(
+                    filter(None, [step.func_name, step_calls[step.index]])
+                )
+                submits += f"\n        {future} = executor.submit({submit_args})"
+                results += f"\n    {step_results[step.index]} = {future}.result()"
+            step_code.append(
+                f"""    # Execute steps {numbers} concurrently: {names}
+    with ThreadPoolExecutor(max_workers={len(wave)}) as executor:{submits}
+    # Raise the first failure in step order, as a sequential run would{results}"""
+            )
 
     # Generate output construction with better mapping
-    output_schema = task_def.get("output", {})
-    output_properties = output_schema.get("properties", {})
+    output_properties = task.output.get("properties", {})
 
     output_construction = []
 
@@ -533,11 +553,11 @@ def _generate_multi_step_task_function(
         f"{k}={format_value(v)}" for k, v in contract_data.items()
     )
 
-    return f"""
-@behavioural_contract(
+    code = f"""
+@{"async_" if is_async else ""}behavioural_contract(
     {contract_str}
 )
-def {func_name}({", ".join(input_params)}) -> {output_type}:
+{"async " if is_async else ""}def {func_name}{"_async" if is_async else ""}({", ".join(input_params)}) -> {output_type}:
     {docstring}
     # Execute multi-step task: {task_name}
 {chr(10).join(step_code)}
@@ -547,6 +567,9 @@ def {func_name}({", ".join(input_params)}) -> {output_type}:
 {output_construction_str}
     )
 """
+    if is_async:
+        code += _generate_sync_wrapper(task)
+    return code
 
 
 # Legacy functions (deprecated - use template-based generation instead)
@@ -600,6 +623,30 @@ def _generate_setup_logging_method() -> str:
     return preparator._prepare_setup_logging_method()
 
 
+def _generate_prompt_loader(spec_data: Dict[str, Any]) -> str:
+    """Generate the module-level prompt template cache.
+
+    Deprecated: Use AgentDataPreparator._prepare_prompt_loader() instead.
+    """
+    from .data_preparation import AgentDataPreparator
+    from .spec_ir import SpecIR
+
+    preparator = AgentDataPreparator()
+    return preparator._prepare_prompt_loader(SpecIR(spec_data))
+
+
+def _generate_async_runtime(spec_data: Dict[str, Any]) -> str:
+    """Generate the async LLM calls and sync wrappers of async agents.
+
+    Deprecated: Use AgentDataPreparator._prepare_async_runtime() instead.
+    """
+    from .data_preparation import AgentDataPreparator
+    from .spec_ir import SpecIR
+
+    preparator = AgentDataPreparator()
+    return preparator._prepare_async_runtime(SpecIR(spec_data))
+
+
 def _generate_tool_task_function(
     task_name: str,
     task_def: Dict[str, Any],
@@ -607,11 +654,16 @@ def _generate_tool_task_function(
     agent_name: str,
     memory_config: Dict[str, Any],
     config: Dict[str, Any],
+    task: Optional["TaskIR"] = None,
 ) -> str:
     """Generate a task function that uses a DACP tool."""
-    func_name = task_name.replace("-", "_")
-    input_params = _generate_input_params(task_def)
-    output_type = f"{task_name.replace('-', '_').title()}Output"
+    from .spec_ir import TaskIR
+
+    if task is None:
+        task = TaskIR(task_name, task_def)
+    func_name = task.func_name
+    input_params = task.input_params
+    output_type = task.model_name
     docstring = _generate_function_docstring(task_name, task_def, output_type)
     contract_data = _generate_contract_data(
         spec_data, task_def, agent_name, memory_config
@@ -689,14 +741,25 @@ def _generate_tool_task_function(
         f"{k}={format_value(v)}" for k, v in contract_data.items()
     )
 
-    return f"""
+    intelligence_config_name = _task_constant_name(task_name, "INTELLIGENCE_CONFIG")
+
+    # Async tasks await the LLM and run the blocking tool in a worker thread
+    is_async = _is_async(spec_data)
+    invoke = "await ainvoke_intelligence" if is_async else "invoke_intelligence"
+    execute = "await asyncio.to_thread(execute_tool, " if is_async else "execute_tool("
+
+    code = f"""
 from dacp import invoke_intelligence, execute_tool
 from dacp.protocol import parse_agent_response, is_tool_request, get_tool_request, wrap_tool_result, get_final_response, is_final_response
 
-@behavioural_contract(
+# DACP intelligence configuration, shared by every call
+{intelligence_config_name} = {_generate_intelligence_config(spec_data, config)}
+
+
+@{"async_" if is_async else ""}behavioural_contract(
     {contract_str}
 )
-def {func_name}({", ".join(input_params)}) -> {output_type}:
+{"async " if is_async else ""}def {func_name}{"_async" if is_async else ""}({", ".join(input_params)}) -> {output_type}:
     {docstring}
     # Prepare tool arguments
     tool_args = {{
@@ -726,11 +789,8 @@ Respond with JSON in one of these formats:
 
 Remember: Only use the tool if it's necessary for your task.'''
 
-    # Configure intelligence for DACP
-    intelligence_config = {_generate_intelligence_config(spec_data, config)}
-
     # Call the LLM with tool context
-    response = invoke_intelligence(tool_prompt, intelligence_config)
+    response = {invoke}(tool_prompt, {intelligence_config_name})
 
     # Parse the response
     parsed_response = parse_agent_response(response)
@@ -740,7 +800,7 @@ Remember: Only use the tool if it's necessary for your task.'''
         tool_name, tool_params = get_tool_request(parsed_response)
 
         # Execute the tool
-        tool_result = execute_tool(tool_name, tool_params)
+        tool_result = {execute}tool_name, tool_params)
 
         # Wrap the tool result for the LLM
         wrapped_result = wrap_tool_result(tool_name, tool_result)
@@ -754,7 +814,7 @@ Based on this result, provide your final response in JSON format:
 
 Remember to respond with valid JSON.'''
 
-        final_response = invoke_intelligence(follow_up_prompt, intelligence_config)
+        final_response = {invoke}(follow_up_prompt, {intelligence_config_name})
         final_parsed = parse_agent_response(final_response)
 
         if is_final_response(final_parsed):
@@ -805,6 +865,9 @@ Remember to respond with valid JSON.'''
     # Return the result in the expected output format
     return {output_type}(**mapped_result)
 """
+    if is_async:
+        code += _generate_sync_wrapper(task)
+    return code
 
 
 def _generate_task_function(
@@ -814,80 +877,91 @@ def _generate_task_function(
     agent_name: str,
     memory_config: Dict[str, Any],
     config: Dict[str, Any],
+    task_template: Optional["Template"] = None,
+    task: Optional["TaskIR"] = None,
 ) -> str:
-    """Generate a single task function."""
+    """Generate a single task function.
+
+    Single-step LLM tasks are rendered with ``task_template`` (an override of
+    ``task_function.py.j2``) when one is given; tool and multi-step tasks
+    always use the built-in generators. ``task`` is the task's entry in the
+    spec IR; it is built from ``task_def`` when not given.
+    """
+    from .code_generation import PythonCodeSerializer
+    from .spec_ir import TaskIR
+
+    if task is None:
+        task = TaskIR(task_name, task_def)
+
     # Check if this task uses a tool
     if "tool" in task_def:
         return _generate_tool_task_function(
-            task_name, task_def, spec_data, agent_name, memory_config, config
+            task_name, task_def, spec_data, agent_name, memory_config, config, task
         )
 
     # Check if this is a multi-step task
-    if task_def.get("multi_step", False):
+    if task.multi_step:
         return _generate_multi_step_task_function(
-            task_name, task_def, spec_data, agent_name, memory_config
+            task_name, task_def, spec_data, agent_name, memory_config, task
         )
 
     # Regular single-step task generation (existing logic)
-    func_name = task_name.replace("-", "_")
-    input_params = _generate_input_params(task_def)
-    output_type = f"{task_name.replace('-', '_').title()}Output"
+    func_name = task.func_name
+    input_params = task.input_params
+    output_type = task.model_name
     docstring = _generate_function_docstring(task_name, task_def, output_type)
     contract_data = _generate_contract_data(
         spec_data, task_def, agent_name, memory_config
     )
 
     # Create input dict with actual parameter values
-    input_dict = {}
-    for param in input_params:
-        if param != "memory_summary: str = ''":
-            param_name = param.split(":")[0]
-            input_dict[param_name] = param_name
+    input_dict = {param_name: param_name for param_name in task.param_names}
 
     # Add LLM output parser if this is an LLM-based agent
     llm_parser = ""
     parser_function_name = ""
     if config.get("model"):  # If model is specified, this is an LLM agent
-        llm_parser = _generate_llm_output_parser(task_name, task_def.get("output", {}))
-        parser_function_name = f"parse_{task_name.replace('-', '_')}_output"
+        llm_parser = _generate_llm_output_parser(task_name, task.output)
+        parser_function_name = task.parser_name
+
+    # Data the function reuses on every call is built once, at import, as
+    # module-level constants
+    memory_config_name = _task_constant_name(task_name, "MEMORY_CONFIG")
+    output_format_name = _task_constant_name(task_name, "OUTPUT_FORMAT")
+    constants = [
+        f"{memory_config_name} = MappingProxyType("
+        f"{PythonCodeSerializer.dict_to_python_code(memory_config)})",
+        f'{output_format_name} = """\n'
+        f'{_generate_human_readable_output(task.output)}\n"""',
+    ]
 
     # Determine client usage based on engine
     engine = spec_data.get("intelligence", {}).get("engine", "openai")
     custom_module = spec_data.get("intelligence", {}).get("module", None)
+    is_async = _is_async(spec_data)
 
     # Use DACP for LLM communication or custom router
     if engine == "custom" and custom_module:
+        # Routers are synchronous; async tasks run them in a worker thread
+        run = "await asyncio.to_thread(router.run, " if is_async else "router.run("
         client_code = f"""# Create and use custom LLM router
     router = load_custom_llm_router("{config["endpoint"]}", "{config["model"]}", {{}})
-    result = router.run(prompt, **input_dict)"""
+    result = {run}prompt, **input_dict)"""
     else:
-        intelligence_config_str = _generate_intelligence_config(spec_data, config)
-        client_code = f"""# Configure intelligence for DACP
-    intelligence_config = {intelligence_config_str}
-
-    # Call the LLM using DACP
-    result = invoke_intelligence(prompt, intelligence_config)"""
-
-    # Generate prompt rendering with actual parameter values
-    prompt_render_params = []
-    for param in input_params:
-        if param != "memory_summary: str = ''":
-            param_name = param.split(":")[0]
-            prompt_render_params.append(f"{param_name}={param_name}")
-
-    # Define memory configuration with proper Python boolean values
-    memory_config_str = f"""{{
-        "enabled": {repr(memory_config["enabled"])},
-        "format": "{memory_config["format"]}",
-        "usage": "{memory_config["usage"]}",
-        "required": {repr(memory_config["required"])},
-        "description": "{memory_config["description"]}"
-    }}"""
-    memory_summary_str = "memory_summary if memory_config['enabled'] else ''"
-
-    # Generate human-readable output description
-    output_description = _generate_human_readable_output(task_def.get("output", {}))
-    output_description_str = f'"""\n{output_description}\n"""'
+        # A plain dict, since DACP rejects other mappings
+        intelligence_config_name = _task_constant_name(task_name, "INTELLIGENCE_CONFIG")
+        constants.append(
+            f"{intelligence_config_name} = "
+            f"{_generate_intelligence_config(spec_data, config)}"
+        )
+        invoke = "await ainvoke_intelligence" if is_async else "invoke_intelligence"
+        client_code = f"""# Call the LLM using DACP
+    result = {invoke}(prompt, {intelligence_config_name})"""
+
+    # Memory is enabled or not at generation time
+    memory_summary_str = "memory_summary" if memory_config["enabled"] else "''"
+    constants_str = f"\n# Built once and reused by every {func_name} call\n"
+    constants_str += "\n".join(constants) + "\n"
 
     # Format the contract data for the decorator with proper Python values
     def format_value(v):
@@ -902,78 +976,67 @@ def _generate_task_function(
             return f'"{v}"'
         return str(v)
 
+    # Async tasks define ``<func_name>_async`` and a synchronous wrapper
+    sync_wrapper = _generate_sync_wrapper(task) if is_async else ""
+
+    if task_template is not None:
+        # The constants precede the template's output, so overrides written
+        # for per-call literals keep working
+        code = constants_str + task_template.render(
+            task_name=task_name,
+            task_def=task_def,
+            llm_parser=llm_parser,
+            contract_data={k: format_value(v) for k, v in contract_data.items()},
+            func_name=func_name,
+            input_params=input_params,
+            input_params_dict=list(input_dict),
+            output_type=output_type,
+            docstring=docstring,
+            memory_config=memory_config_name,
+            output_description=output_format_name,
+            memory_summary=memory_summary_str,
+            client_code=client_code,
+            parser_function_name=parser_function_name,
+            is_async=is_async,
+        )
+        return code + sync_wrapper
+
     contract_str = ",\n    ".join(
         f"{k}={format_value(v)}" for k, v in contract_data.items()
     )
 
-    return f"""
+    return f"""{constants_str}
 {llm_parser}
 
-@behavioural_contract(
+@{"async_" if is_async else ""}behavioural_contract(
     {contract_str}
 )
-def {func_name}({", ".join(input_params)}) -> {output_type}:
+{"async " if is_async else ""}def {func_name}{"_async" if is_async else ""}({", ".join(input_params)}) -> {output_type}:
     {docstring}
-    # Define memory configuration
-    memory_config = {memory_config_str}
-
-    # Define output format description
-    output_format = {output_description_str}
-
-    # Load and render the prompt template
-    prompts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
-    env = Environment(loader=FileSystemLoader([".", prompts_dir]))
-    try:
-        template = env.get_template(f"{func_name}.jinja2")
-    except FileNotFoundError:
-        log.warning(f"Task-specific prompt template not found, using default template")
-        template = env.get_template("agent_prompt.jinja2")
+    # Get the prompt template, compiled on first use
+    template = load_prompt_template("{task_name}")
 
     # Create input dictionary for template
     input_dict = {{
-        {", ".join(f'"{param.split(":")[0]}": {param.split(":")[0]}' for param in input_params if param != "memory_summary: str = ''")}
+        {", ".join(f'"{param_name}": {param_name}' for param_name in task.param_names)}
     }}
 
     # Render the prompt with all necessary context - pass variables directly for template access
     prompt = template.render(
         input=input_dict,
         memory_summary={memory_summary_str},
-        output_format=output_format,
-        memory_config=memory_config,
+        output_format={output_format_name},
+        memory_config={memory_config_name},
         **input_dict  # Also pass variables directly for template access
     )
 
     {client_code}
     return {parser_function_name}(result)
-"""
+{sync_wrapper}"""
 
 
-def generate_agent_code(
-    output: Path, spec_data: Dict[str, Any], agent_name: str, class_name: str
-) -> None:
-    """Generate the agent.py file using template-based approach."""
-    if (output / "agent.py").exists():
-        log.warning("agent.py already exists and will be overwritten")
-
-    tasks = spec_data.get("tasks", {})
-    if not tasks:
-        log.warning("No tasks defined in spec file")
-        return
-
-    # Use the new data preparation and template-based generation
-    from .data_preparation import AgentDataPreparator
-    from .code_generation import CodeGenerator
-
-    try:
-        # Prepare all data using the structured approach
-        preparator = AgentDataPreparator()
-        template_data = preparator.prepare_all_data(spec_data, agent_name, class_name)
-
-        # Generate code using templates
-        generator = CodeGenerator()
-
-        # Ensure the agent template exists with a default
-        default_agent_template = """{{ imports | join('\\n') }}
+# Built-in agent.py.j2, used when the template file is missing
+DEFAULT_AGENT_TEMPLATE = """{{ imports | join('\\n') }}
 
 load_dotenv()
 
@@ -987,6 +1050,14 @@ ROLE = "{{ agent_name.title() }}"
 
 {% endfor %}
 
+{% if prompt_loader %}
+{{ prompt_loader }}
+
+{% endif %}
+{% if async_runtime %}
+{{ async_runtime }}
+
+{% endif %}
 # Task functions
 {% for task_function in task_functions %}
 {{ task_function }}
@@ -1035,21 +1106,77 @@ def main():
 if __name__ == "__main__":
     main()"""
 
+
+def render_agent_code(
+    spec_data: Dict[str, Any],
+    agent_name: str,
+    class_name: str,
+    preparator: Optional["AgentDataPreparator"] = None,
+    generator: Optional["CodeGenerator"] = None,
+    ir: Optional["SpecIR"] = None,
+) -> str:
+    """Render the agent.py source using the template-based approach.
+
+    ``preparator`` and ``generator`` may be passed in to reuse warm instances
+    (and their Jinja environment) across many agents; fresh ones are created
+    otherwise. ``ir`` is the spec's IR if the caller already built it. Falls
+    back to the legacy generator if template rendering fails.
+    """
+    # Use the new data preparation and template-based generation
+    from .data_preparation import AgentDataPreparator
+    from .code_generation import CodeGenerator
+
+    try:
+        # Prepare all data using the structured approach
+        if preparator is None:
+            preparator = AgentDataPreparator()
+        if generator is None:
+            generator = CodeGenerator()
+        template_data = preparator.prepare_all_data(
+            spec_data, agent_name, class_name, generator, ir
+        )
+
+        # Ensure the agent template exists with a default
+        default_agent_template = DEFAULT_AGENT_TEMPLATE
+
         generator.ensure_template_exists("agent.py.j2", default_agent_template)
 
         # Generate the agent code
         agent_code = generator.generate_from_template("agent.py.j2", **template_data)
-
-        # Write the generated code
-        (output / "agent.py").write_text(agent_code)
-        log.info("agent.py created using template-based generation")
         log.debug(f"Agent class name generated: {class_name}")
+        return agent_code
 
     except Exception as e:
         log.error(f"Error during template-based generation: {e}")
         log.warning("Falling back to legacy generation method")
         # Fallback to legacy method if template generation fails
-        _generate_agent_code_legacy(output, spec_data, agent_name, class_name)
+        return _render_agent_code_legacy(spec_data, agent_name, class_name)
+
+
+def generate_agent_code(
+    output: Path,
+    spec_data: Dict[str, Any],
+    agent_name: str,
+    class_name: str,
+    preparator: Optional["AgentDataPreparator"] = None,
+    generator: Optional["CodeGenerator"] = None,
+) -> None:
+    """Generate the agent.py file using template-based approach."""
+    if (output / "agent.py").exists():
+        log.warning("agent.py already exists and will be overwritten")
+
+    tasks = spec_data.get("tasks", {})
+    if not tasks:
+        log.warning("No tasks defined in spec file")
+        return
+
+    agent_code = render_agent_code(
+        spec_data, agent_name, class_name, preparator=preparator, generator=generator
+    )
+
+    # Write the generated code
+    (output / "agent.py").write_text(agent_code)
+    log.info("agent.py created")
 
 
 def map_type_to_python(t):
@@ -1128,16 +1255,16 @@ def _generate_behavioural_docs(behavioural_contract: Dict[str, Any]) -> List[str
     return behavioural_docs
 
 
-def _generate_example_usage(agent_info: Dict[str, str], tasks: Dict[str, Any]) -> str:
+def _generate_example_usage(agent_name: str, tasks: Dict[str, Any]) -> str:
     """Generate example usage code."""
     first_task_name = next(iter(tasks.keys()), "")
     if not first_task_name:
         return ""
 
     return f"""```python
-from agent import {to_pascal_case(agent_info["name"])}
+from agent import {to_pascal_case(agent_name)}
 
-agent = {to_pascal_case(agent_info["name"])}()
+agent = {to_pascal_case(agent_name)}()
 # Example usage
 task_name = "{first_task_name}"
 if task_name:
@@ -1148,13 +1275,14 @@ if task_name:
 ```"""
 
 
-def generate_readme(output: Path, spec_data: Dict[str, Any]) -> None:
-    """Generate the README.md file."""
-    if (output / "README.md").exists():
-        log.warning("README.md already exists and will be overwritten")
+def render_readme(spec_data: Dict[str, Any], ir: Optional["SpecIR"] = None) -> str:
+    """Render the README.md content, from ``ir`` if the caller built it."""
+    from .spec_ir import SpecIR
 
-    agent_info = get_agent_info(spec_data)
-    memory_config = get_memory_config(spec_data)
+    if ir is None:
+        ir = SpecIR(spec_data)
+    agent = ir.agent
+    memory_config = ir.memory
     tasks = spec_data.get("tasks", {})
 
     task_docs = _generate_task_docs(tasks)
@@ -1164,11 +1292,11 @@ def generate_readme(output: Path, spec_data: Dict[str, Any]) -> None:
         if "behavioural_contract" in spec_data
         else []
     )
-    example_usage = _generate_example_usage(agent_info, tasks)
+    example_usage = _generate_example_usage(agent.name, tasks)
 
-    readme_content = f"""# {agent_info["name"].title().replace("-", " ")}
+    readme_content = f"""# {agent.name.title().replace("-", " ")}
 
-{agent_info["description"]}
+{agent.description}
 
 ## Usage
 
@@ -1188,15 +1316,20 @@ python agent.py
 
 {example_usage}
 """
-    (output / "README.md").write_text(readme_content)
-    log.info("README.md created")
+    return readme_content
 
 
-def generate_requirements(output: Path, spec_data: Dict[str, Any]) -> None:
-    """Generate the requirements.txt file."""
-    if (output / "requirements.txt").exists():
-        log.warning("requirements.txt already exists and will be overwritten")
+def generate_readme(output: Path, spec_data: Dict[str, Any]) -> None:
+    """Generate the README.md file."""
+    if (output / "README.md").exists():
+        log.warning("README.md already exists and will be overwritten")
+
+    (output / "README.md").write_text(render_readme(spec_data))
+    log.info("README.md created")
+
 
+def render_requirements(spec_data: Dict[str, Any]) -> str:
+    """Render the requirements.txt content."""
     engine = spec_data.get("intelligence", {}).get("engine", "openai")
 
     requirements = []
@@ -1222,15 +1355,20 @@ def generate_requirements(output: Path, spec_data: Dict[str, Any]) -> None:
         ]
     )
 
-    (output / "requirements.txt").write_text("\n".join(requirements) + "\n")
-    log.info("requirements.txt created")
+    return "\n".join(requirements) + "\n"
 
 
-def generate_env_example(output: Path, spec_data: Dict[str, Any]) -> None:
-    """Generate the .env.example file."""
-    if (output / ".env.example").exists():
-        log.warning(".env.example already exists and will be overwritten")
+def generate_requirements(output: Path, spec_data: Dict[str, Any]) -> None:
+    """Generate the requirements.txt file."""
+    if (output / "requirements.txt").exists():
+        log.warning("requirements.txt already exists and will be overwritten")
+
+    (output / "requirements.txt").write_text(render_requirements(spec_data))
+    log.info("requirements.txt created")
+
 
+def render_env_example(spec_data: Dict[str, Any]) -> str:
+    """Render the .env.example content."""
     engine = spec_data.get("intelligence", {}).get("engine", "openai")
 
     if engine == "anthropic":
@@ -1244,102 +1382,25 @@ def generate_env_example(output: Path, spec_data: Dict[str, Any]) -> None:
     else:
         env_content = "OPENAI_API_KEY=your-api-key-here\n"
 
-    (output / ".env.example").write_text(env_content)
+    return env_content
+
+
+def generate_env_example(output: Path, spec_data: Dict[str, Any]) -> None:
+    """Generate the .env.example file."""
+    if (output / ".env.example").exists():
+        log.warning(".env.example already exists and will be overwritten")
+
+    (output / ".env.example").write_text(render_env_example(spec_data))
     log.info(".env.example created")
 
 
-def generate_prompt_template(output: Path, spec_data: Dict[str, Any]) -> None:
-    """Generate the prompt template file."""
-    prompts_dir = output / "prompts"
-    prompts_dir.mkdir(exist_ok=True)
+def prompt_file_name(task_name: str) -> str:
+    """Return the file name, within ``prompts/``, of a task's prompt template."""
+    return f"{task_name}.jinja2"
 
-    # Generate task-specific templates
-    for task_name, task_def in spec_data.get("tasks", {}).items():
-        template_name = f"{task_name}.jinja2"
-        if (prompts_dir / template_name).exists():
-            log.warning(f"{template_name} already exists and will be overwritten")
 
-        # Get the output schema
-        output_schema = task_def.get("output", {})
-
-        # Prepare example JSON for the output
-        # Use the output schema's properties to generate an example
-        example_json_lines = []
-        if output_schema.get("properties"):
-            example_json_lines.append("{")
-            for i, (k, v) in enumerate(output_schema["properties"].items()):
-                comma = "," if i < len(output_schema["properties"]) - 1 else ""
-                # For the example, use a meaningful value based on the field name
-                if k == "response":
-                    # If there's a 'name' input, use it in the response
-                    input_props = task_def.get("input", {}).get("properties", {})
-                    if "name" in input_props:
-                        example_json_lines.append(
-                            f'  "{k}": "Hello {{{{ input.name }}}}!"{comma}'
-                        )
-                    else:
-                        example_json_lines.append(
-                            f'  "{k}": "Your response here"{comma}'
-                        )
-                else:
-                    # Use a generic placeholder for any field
-                    example_json_lines.append(f'  "{k}": "Your {k} here"{comma}')
-            example_json_lines.append("}")
-        else:
-            example_json_lines.append("{}")
-        example_json = "\n".join(example_json_lines)
-
-        # Handle both old and new prompt formats
-        if "prompt" in spec_data and "template" in spec_data["prompt"]:
-            # Old format - use the template directly
-            prompt_content = spec_data["prompt"]["template"]
-        elif "prompts" in spec_data:
-            prompts = spec_data.get("prompts", {})
-
-            # Check for task-specific prompts first
-            task_system_prompt = prompts.get(task_name, {}).get("system")
-            task_user_prompt = prompts.get(task_name, {}).get("user")
-
-            if task_system_prompt or task_user_prompt:
-                # Use task-specific prompts
-                prompt_content = task_system_prompt or ""
-                if task_user_prompt:
-                    if prompt_content:
-                        prompt_content += "\n\n"
-                    prompt_content += task_user_prompt
-            elif prompts.get("system") or prompts.get("user"):
-                # Fall back to global prompts
-                system_prompt = prompts.get(
-                    "system",
-                    "You are a professional AI agent designed to process tasks according to the Open Agent Spec.\n\n",
-                )
-                user_prompt = prompts.get("user", "")
-
-                # Combine system and user prompts with proper spacing
-                prompt_content = system_prompt
-                if user_prompt:
-                    # Ensure proper spacing between system and user prompts
-                    if not prompt_content.endswith(
-                        "\n"
-                    ) and not prompt_content.endswith(" "):
-                        prompt_content += " "
-                    prompt_content += user_prompt
-            else:
-                # No prompts defined, use default
-                prompt_content = ""
-
-            # Add memory context if not already present
-            if "{% if memory_summary %}" not in prompt_content:
-                prompt_content = (
-                    "{% if memory_summary %}\n"
-                    "--- MEMORY CONTEXT ---\n"
-                    "{{ memory_summary }}\n"
-                    "------------------------\n"
-                    "{% endif %}\n\n"
-                ) + prompt_content
-        else:
-            # Default format - use the full default template content
-            default_content = """You are a professional AI agent designed to process tasks according to the Open Agent Spec.
+# Prompt used for tasks without their own prompts and for agent_prompt.jinja2
+DEFAULT_PROMPT_TEMPLATE = """You are a professional AI agent designed to process tasks according to the Open Agent Spec.
 
 {% if memory_summary %}
 --- MEMORY CONTEXT ---
@@ -1375,68 +1436,164 @@ CONSTRAINTS:
 - Must reference and incorporate memory context
 {% endif %}"""
 
-            prompt_content = default_content
 
-        # Always append the JSON schema instruction and example
-        prompt_content += (
-            f"\nRespond ONLY with a JSON object in this exact format:\n{example_json}\n"
-        )
+def render_task_prompt(
+    task_name: str, task_def: Dict[str, Any], spec_data: Dict[str, Any]
+) -> str:
+    """Render the prompt template content for a single task."""
+    spec_data = normalize_spec(spec_data)
 
-        (prompts_dir / template_name).write_text(prompt_content)
-        log.info(f"Created prompt template: {template_name}")
+    # Get the output schema
+    output_schema = task_def.get("output", {})
 
-    # Generate default template
-    default_template = prompts_dir / "agent_prompt.jinja2"
-    if default_template.exists():
-        log.warning("agent_prompt.jinja2 already exists and will be overwritten")
+    # Prepare example JSON for the output
+    # Use the output schema's properties to generate an example
+    example_json_lines = []
+    if output_schema.get("properties"):
+        example_json_lines.append("{")
+        for i, (k, v) in enumerate(output_schema["properties"].items()):
+            comma = "," if i < len(output_schema["properties"]) - 1 else ""
+            # For the example, use a meaningful value based on the field name
+            if k == "response":
+                # If there's a 'name' input, use it in the response
+                input_props = task_def.get("input", {}).get("properties", {})
+                if "name" in input_props:
+                    example_json_lines.append(
+                        f'  "{k}": "Hello {{{{ input.name }}}}!"{comma}'
+                    )
+                else:
+                    example_json_lines.append(f'  "{k}": "Your response here"{comma}')
+            else:
+                # Use a generic placeholder for any field
+                example_json_lines.append(f'  "{k}": "Your {k} here"{comma}')
+        example_json_lines.append("}")
+    else:
+        example_json_lines.append("{}")
+    example_json = "\n".join(example_json_lines)
 
-    default_content = """You are a professional AI agent designed to process tasks according to the Open Agent Spec.
+    prompts = spec_data["prompts"]
+    if isinstance(prompts.get(PROMPT_TEMPLATE_KEY), str):
+        # A full template (legacy or default) - use it directly
+        prompt_content = prompts[PROMPT_TEMPLATE_KEY]
+    else:
+        # Check for task-specific prompts first
+        task_system_prompt = prompts.get(task_name, {}).get("system")
+        task_user_prompt = prompts.get(task_name, {}).get("user")
+
+        if task_system_prompt or task_user_prompt:
+            # Use task-specific prompts
+            prompt_content = task_system_prompt or ""
+            if task_user_prompt:
+                if prompt_content:
+                    prompt_content += "\n\n"
+                prompt_content += task_user_prompt
+        elif prompts.get("system") or prompts.get("user"):
+            # Fall back to global prompts
+            system_prompt = prompts.get(
+                "system",
+                "You are a professional AI agent designed to process tasks according to the Open Agent Spec.\n\n",
+            )
+            user_prompt = prompts.get("user", "")
+
+            # Combine system and user prompts with proper spacing
+            prompt_content = system_prompt
+            if user_prompt:
+                # Ensure proper spacing between system and user prompts
+                if not prompt_content.endswith("\n") and not prompt_content.endswith(
+                    " "
+                ):
+                    prompt_content += " "
+                prompt_content += user_prompt
+        else:
+            # No prompts defined, use default
+            prompt_content = ""
+
+        # Add memory context if not already present
+        if "{% if memory_summary %}" not in prompt_content:
+            prompt_content = (
+                "{% if memory_summary %}\n"
+                "--- MEMORY CONTEXT ---\n"
+                "{{ memory_summary }}\n"
+                "------------------------\n"
+                "{% endif %}\n\n"
+            ) + prompt_content
+
+    # Always append the JSON schema instruction and example
+    prompt_content += (
+        f"\nRespond ONLY with a JSON object in this exact format:\n{example_json}\n"
+    )
+    return prompt_content
 
-{% if memory_summary %}
---- MEMORY CONTEXT ---
-{{ memory_summary }}
-------------------------
-{% endif %}
 
-TASK:
-Process the following task:
+def render_prompt_templates(spec_data: Dict[str, Any]) -> Dict[str, str]:
+    """Render every prompt template, keyed by file name within ``prompts/``."""
+    spec_data = normalize_spec(spec_data)
+    templates = {
+        prompt_file_name(task_name): render_task_prompt(task_name, task_def, spec_data)
+        for task_name, task_def in spec_data.get("tasks", {}).items()
+    }
+    templates["agent_prompt.jinja2"] = DEFAULT_PROMPT_TEMPLATE
+    return templates
 
-{% for key, value in input.items() %}
-{{ key }}: {{ value }}
-{% endfor %}
 
-INSTRUCTIONS:
-1. Review the input data carefully
-2. Consider all relevant factors
-{% if memory_summary %}
-3. Take into account the provided memory context
-{% endif %}
-4. Provide a clear, actionable response
-5. Explain your reasoning in detail
+def generate_prompt_template(output: Path, spec_data: Dict[str, Any]) -> None:
+    """Generate the prompt template file."""
+    spec_data = normalize_spec(spec_data)
+    prompts_dir = output / "prompts"
+    prompts_dir.mkdir(exist_ok=True)
 
-OUTPUT FORMAT:
-Your response should include the following fields:
-{{ output_format }}
+    # Generate task-specific templates
+    for task_name, task_def in spec_data.get("tasks", {}).items():
+        template_name = prompt_file_name(task_name)
+        if (prompts_dir / template_name).exists():
+            log.warning(f"{template_name} already exists and will be overwritten")
 
-CONSTRAINTS:
-- Be clear and specific
-- Focus on actionable insights
-- Maintain professional objectivity
-{% if memory_summary and memory_config.required %}
-- Must reference and incorporate memory context
-{% endif %}"""
+        prompt_content = render_task_prompt(task_name, task_def, spec_data)
+        (prompts_dir / template_name).write_text(prompt_content)
+        log.info(f"Created prompt template: {template_name}")
+
+    # Generate default template
+    default_template = prompts_dir / "agent_prompt.jinja2"
+    if default_template.exists():
+        log.warning("agent_prompt.jinja2 already exists and will be overwritten")
 
-    default_template.write_text(default_content)
+    default_template.write_text(DEFAULT_PROMPT_TEMPLATE)
     log.info("Created default prompt template: agent_prompt.jinja2")
 
 
-def _generate_agent_code_legacy(
-    output: Path, spec_data: Dict[str, Any], agent_name: str, class_name: str
+def generate_agent_files(
+    output: Path,
+    spec_data: Dict[str, Any],
+    agent_name: str,
+    class_name: str,
+    preparator: Optional["AgentDataPreparator"] = None,
+    generator: Optional["CodeGenerator"] = None,
 ) -> None:
+    """Generate every file of an agent project into ``output``."""
+    spec_data = normalize_spec(spec_data)
+    output.mkdir(parents=True, exist_ok=True)
+
+    generate_agent_code(
+        output,
+        spec_data,
+        agent_name,
+        class_name,
+        preparator=preparator,
+        generator=generator,
+    )
+    generate_readme(output, spec_data)
+    generate_requirements(output, spec_data)
+    generate_env_example(output, spec_data)
+    generate_prompt_template(output, spec_data)
+
+
+def _render_agent_code_legacy(
+    spec_data: Dict[str, Any], agent_name: str, class_name: str
+) -> str:
     """Legacy agent code generation method (fallback only).
 
     This is kept as a fallback in case template-based generation fails.
-    Should not be used directly - use generate_agent_code() instead.
+    Should not be used directly - use render_agent_code() instead.
     """
     log.warning("Using legacy agent code generation method")
 
@@ -1556,13 +1713,31 @@ def _generate_agent_code_legacy(
         "import json",
         "import logging",
         "import os",
+        "import hashlib",
+        "from types import MappingProxyType",
         "from dotenv import load_dotenv",
         "from behavioural_contracts import behavioural_contract",
-        "from jinja2 import Environment, FileSystemLoader",
+        "import jinja2",
+        "from jinja2 import ChoiceLoader, Environment, FileSystemLoader, ModuleLoader, TemplateNotFound",
         "from pydantic import BaseModel",
         "from dacp.orchestrator import Orchestrator",
         "import dacp",
     ]
+    # Independent steps of sync multi-step tasks run in a thread pool
+    from .spec_ir import SpecIR
+
+    if SpecIR(spec_data).has_concurrent_steps and not _is_async(spec_data):
+        imports.append("from concurrent.futures import ThreadPoolExecutor")
+    if _is_async(spec_data):
+        imports.extend(
+            [
+                "import asyncio",
+                "import contextvars",
+                "import functools",
+                "import threading",
+                "import weakref",
+            ]
+        )
 
     # Generate the complete agent code using legacy f-string approach
     agent_code = f"""{chr(10).join(imports)}
@@ -1576,6 +1751,10 @@ ROLE = "{agent_name.title()}"
 # Generate output models
 {chr(10).join(model_definitions)}
 
+{_generate_prompt_loader(spec_data)}
+
+{_generate_async_runtime(spec_data)}
+
 {chr(10).join(task_functions)}
 
 class {class_name}(dacp.Agent):
@@ -1608,5 +1787,13 @@ def main():
 if __name__ == "__main__":
     main()
 """
+    return agent_code
+
+
+def _generate_agent_code_legacy(
+    output: Path, spec_data: Dict[str, Any], agent_name: str, class_name: str
+) -> None:
+    """Write agent.py using the legacy generation method (fallback only)."""
+    agent_code = _render_agent_code_legacy(spec_data, agent_name, class_name)
     (output / "agent.py").write_text(agent_code)
     log.info("agent.py created using legacy generation method")
@@ -1,31 +1,39 @@
+import json
 import logging
-import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Tuple, Optional
 
 import typer
-import yaml
-import pkg_resources
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.panel import Panel
 
 from .banner import ASCII_TITLE
-from .generators import (
-    generate_agent_code,
-    generate_env_example,
-    generate_prompt_template,
-    generate_readme,
-    generate_requirements,
-)
-from .validators import validate_spec, validate_with_json_schema
+from .timing import NULL_TIMER, PhaseTimer
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Keep this module cheap to import: Rich, YAML, jsonschema, Jinja and the
+# generators are imported inside the commands that use them, so that
+# ``oas --version`` and ``oas --help`` start quickly.
 
 app = typer.Typer(help="Open Agent Spec (OAS) CLI")
-console = Console()
+templates_app = typer.Typer(help="Browse the spec templates bundled with the CLI")
+app.add_typer(templates_app, name="templates")
+
+
+@lru_cache(maxsize=None)
+def get_console() -> "Console":
+    """Return the shared Rich console, importing Rich on first use."""
+    from rich.console import Console
+
+    return Console()
 
 
 def setup_logging(verbose: bool = False) -> logging.Logger:
     """Configure logging with appropriate level and handler."""
+    from rich.logging import RichHandler
+
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
         level=level, format="%(message)s", datefmt="[%X]", handlers=[RichHandler()]
@@ -35,9 +43,11 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
 
 def get_version_from_pyproject():
     """Get the version from package metadata."""
+    from importlib.metadata import PackageNotFoundError, version
+
     try:
-        return pkg_resources.get_distribution("open-agent-spec").version
-    except Exception:
+        return version("open-agent-spec")
+    except PackageNotFoundError:
         return "unknown"
 
 
@@ -49,17 +59,25 @@ def main(
     """Main CLI entry point."""
     if version:
         cli_version = get_version_from_pyproject()
-        console.print(
-            f"[bold cyan]Open Agent Spec CLI[/] version [green]{cli_version}[/]"
+        # Plain click styling keeps the version path free of Rich
+        typer.echo(
+            typer.style("Open Agent Spec CLI", fg="cyan", bold=True)
+            + " version "
+            + typer.style(cli_version, fg="green")
         )
         raise typer.Exit()
 
     if ctx.invoked_subcommand is None or ctx.invoked_subcommand == "help":
+        from rich.panel import Panel
+
+        console = get_console()
         console.print(f"[bold cyan]{ASCII_TITLE}[/]\n")
         console.print(
             Panel.fit(
                 "Use [bold magenta]oas init[/] to scaffold an agent project\n"
                 "Use [bold magenta]oas update[/] to update existing agent code\n"
+                "Use [bold magenta]oas watch[/] to regenerate an agent on every save\n"
+                "Use [bold magenta]oas validate[/] to check many specs at once\n"
                 "Define it via Open Agent Spec YAML\n"
                 "Use [bold yellow]--dry-run[/] to preview actions without writing files.",
                 title="[bold green]OAS CLI[/]",
@@ -69,24 +87,53 @@ def main(
 
 
 def load_and_validate_spec(
-    spec_path: Path, log: logging.Logger
+    spec_path: Path,
+    log: logging.Logger,
+    timer: PhaseTimer = NULL_TIMER,
+    use_cache: bool = True,
 ) -> Tuple[Dict[str, Any], str, str]:
-    """Load and validate a spec file, returning the data and derived names."""
+    """Load and validate a spec file, returning the data and derived names.
+
+    With ``use_cache`` an unchanged spec is served from the on-disk spec cache,
+    skipping YAML parsing and both validation passes.
+    """
+    import yaml
+
+    from .spec_cache import load_validated_spec
+
     log.info(f"Reading spec from: {spec_path}")
     try:
-        with open(spec_path) as f:
-            spec_data = yaml.safe_load(f)
-        log.info("Spec file loaded successfully")
-    except (yaml.YAMLError, FileNotFoundError) as err:
+        result = load_validated_spec(
+            spec_path,
+            use_cache,
+            timer,
+            validate=lambda spec_data: validate_loaded_spec(spec_data, log, timer),
+        )
+    except (yaml.YAMLError, json.JSONDecodeError, FileNotFoundError) as err:
         log.error(f"Error reading spec file: {err}")
+        if "expected a single document" in str(err):
+            log.error(
+                "This file bundles several specs; use 'oas validate' or "
+                "'oas init --spec-dir' to process bundles"
+            )
         raise ValueError("Invalid YAML format or file not found") from err
+    log.info("Spec file loaded successfully")
+    return result
+
+
+def validate_loaded_spec(
+    spec_data: Dict[str, Any], log: logging.Logger, timer: PhaseTimer = NULL_TIMER
+) -> Tuple[Dict[str, Any], str, str]:
+    """Validate already-parsed spec data, returning it with the derived names."""
+    from .validators import SCHEMA_PATH, validate_spec, validate_with_json_schema
 
     try:
-        # Get the path to the schema file relative to the main.py file
-        schema_path = Path(__file__).parent / "schemas" / "oas-schema.json"
-        validate_with_json_schema(spec_data, str(schema_path))
+        # The compiled schema validator is cached for the lifetime of the process
+        with timer.phase("schema_validation"):
+            validate_with_json_schema(spec_data, SCHEMA_PATH)
 
-        agent_name, class_name = validate_spec(spec_data)
+        with timer.phase("semantic_validation"):
+            agent_name, class_name = validate_spec(spec_data)
         return spec_data, agent_name, class_name
     except ValueError as err:
         log.error(str(err))
@@ -94,27 +141,18 @@ def load_and_validate_spec(
         raise ValueError(f"Invalid spec: {err}") from err
 
 
-def resolve_spec_path(
-    spec: Optional[Path], template: Optional[str], log: logging.Logger
-) -> Path:
-    if spec is not None:
-        return spec
-    elif template == "minimal":
-        # Load the template from the package resources
-        try:
-            template_path = pkg_resources.resource_filename(
-                "oas_cli.templates", "minimal-agent.yaml"
-            )  # type: ignore
-            with open(template_path, "rb") as f:
-                temp = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")
-                temp.write(f.read())
-                temp.close()
-                return Path(temp.name)
-        except Exception as e:
-            log.error(f"Failed to load minimal template from package: {e}")
-            raise typer.Exit(1)
-    else:
-        log.error("You must provide either --spec or --template minimal.")
+def load_template_spec(
+    template: str, log: logging.Logger, timer: PhaseTimer = NULL_TIMER
+) -> Dict[str, Any]:
+    """Return the parsed spec of a bundled template, read from package resources."""
+    from .spec_templates import spec_templates
+
+    log.info(f"Using built-in template: {template}")
+    try:
+        with timer.phase("load"):
+            return spec_templates.get(template)
+    except KeyError as err:
+        log.error(err.args[0])
         raise typer.Exit(1)
 
 
@@ -124,18 +162,40 @@ def generate_files(
     agent_name: str,
     class_name: str,
     log: logging.Logger,
+    timer: PhaseTimer = NULL_TIMER,
+    templates_dir: Optional[Path] = None,
+    compile_prompts: bool = False,
+    async_target: bool = False,
 ) -> None:
-    """Generate all agent files."""
-    try:
-        # Create output directory
-        output.mkdir(parents=True, exist_ok=True)
+    """Generate all agent files.
+
+    Templates in ``templates_dir`` override the user's and the built-in ones.
+    With ``compile_prompts`` the prompt templates are precompiled as well, and
+    with ``async_target`` an async agent is generated.
+    """
+    from .code_generation import CodeGenerator, template_override_dirs
+    from .manifest import sync_agent_files
 
-        # Generate each file
-        generate_agent_code(output, spec_data, agent_name, class_name)
-        generate_readme(output, spec_data)
-        generate_requirements(output, spec_data)
-        generate_env_example(output, spec_data)
-        generate_prompt_template(output, spec_data)
+    console = get_console()
+    try:
+        result = sync_agent_files(
+            output,
+            spec_data,
+            agent_name,
+            class_name,
+            generator=CodeGenerator(
+                override_dirs=template_override_dirs(templates_dir)
+            ),
+            timer=timer,
+            compile_prompts=compile_prompts,
+            async_target=async_target,
+        )
+        for rel_path in result.changed:
+            log.info(f"{rel_path} created")
+        if result.compiled_prompts:
+            log.info("prompts/_compiled created")
+        for problem in result.prompt_problems:
+            log.warning(problem)
 
         console.print("\n[bold green]✅ Agent project initialized![/] ✨")
         log.info("Project initialized")
@@ -150,19 +210,201 @@ def generate_files(
         raise RuntimeError(f"Failed to generate agent code: {err}") from err
 
 
+@contextmanager
+def instrumented_run(
+    timings: bool,
+    timings_json: Optional[Path],
+    profile: Optional[Path],
+    log: logging.Logger,
+) -> Iterator[PhaseTimer]:
+    """Time and optionally profile a command, reporting when it finishes.
+
+    Yields the timer to thread through the run; it records nothing unless
+    ``--timings`` or ``--timings-json`` was given. The report is produced even
+    if the run fails, so slow failures can be diagnosed too.
+    """
+    import cProfile
+
+    timer = PhaseTimer() if timings or timings_json else NULL_TIMER
+    profiler = cProfile.Profile() if profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield timer
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(str(profile))
+            log.info(f"Profile written to {profile}")
+        if timer is not NULL_TIMER:
+            report_timings(timer, timings, timings_json)
+
+
+def report_timings(
+    timer: PhaseTimer, show_table: bool, timings_json: Optional[Path]
+) -> None:
+    """Print the recorded timings as a table and/or write them as JSON."""
+    from rich.table import Table
+
+    data = timer.as_dict()
+    if timings_json is not None:
+        payload = json.dumps(data, indent=2)
+        if str(timings_json) == "-":
+            typer.echo(payload)
+        else:
+            timings_json.write_text(payload)
+    if not show_table:
+        return
+
+    table = Table(title="Timings")
+    table.add_column("Phase / task")
+    table.add_column("Wall (ms)", justify="right")
+    table.add_column("CPU (ms)", justify="right")
+    table.add_column("Calls", justify="right")
+    for name, entry in data["phases"].items():
+        table.add_row(
+            name,
+            f"{entry['wall_ms']:.2f}",
+            f"{entry['cpu_ms']:.2f}",
+            str(entry["calls"]),
+        )
+    for name, entry in data["tasks"].items():
+        table.add_row(
+            f"  task: {name}",
+            f"{entry['wall_ms']:.2f}",
+            f"{entry['cpu_ms']:.2f}",
+            str(entry["calls"]),
+        )
+    total = data["total"]
+    table.add_row(
+        "[bold]total[/]", f"{total['wall_ms']:.2f}", f"{total['cpu_ms']:.2f}", ""
+    )
+    get_console().print(table)
+
+
+def generate_batch(
+    spec_dir: Path,
+    output_root: Path,
+    jobs: int,
+    dry_run: bool,
+    log: logging.Logger,
+    use_cache: bool = True,
+    templates_dir: Optional[Path] = None,
+    compile_prompts: bool = False,
+    async_target: bool = False,
+) -> None:
+    """Scaffold one agent per spec file found under ``spec_dir``."""
+    import time
+
+    from rich.panel import Panel
+
+    from .batch import (
+        agent_output_dir,
+        expand_spec_paths,
+        iter_generation_results,
+        iter_validation_results,
+    )
+
+    console = get_console()
+    spec_paths = expand_spec_paths([str(spec_dir)])
+    if not spec_paths:
+        log.error(f"No spec files found in {spec_dir}")
+        raise typer.Exit(1)
+
+    targets = [
+        (path, agent_output_dir(path, spec_dir, output_root)) for path in spec_paths
+    ]
+    log.info(f"Found {len(targets)} spec files in {spec_dir}")
+
+    if dry_run:
+        console.print(
+            Panel.fit(
+                "🧪 [bold]Dry run mode[/]: No files will be written.", style="yellow"
+            )
+        )
+        outputs = {str(spec_path): output for spec_path, output in targets}
+        for result in iter_validation_results(spec_paths, jobs, use_cache):
+            if not result["valid"]:
+                log.error(f"{result['path']}: {result['error']}")
+                continue
+            output = outputs[result.get("file", result["path"])]
+            if "document" in result:
+                # Each agent of a bundle gets its own directory
+                output = output / result["agent_name"]
+            log.info(f"{result['path']} -> {output.resolve()}")
+        return
+
+    # Per-file progress from the generators is noise across many agents; the
+    # per-agent summary lines below replace it unless --verbose is set
+    previous_level = log.level
+    if log.getEffectiveLevel() > logging.DEBUG:
+        log.setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    failures = 0
+    agents = 0
+    try:
+        for result in iter_generation_results(
+            targets, jobs, use_cache, templates_dir, compile_prompts, async_target
+        ):
+            agents += 1
+            if result["success"]:
+                console.print(
+                    f"[green]✅[/] {result['path']} → {result['output']} "
+                    f"[dim]({result['duration_ms']:.0f} ms)[/]"
+                )
+                for problem in result.get("prompt_problems", []):
+                    log.warning(f"{result['path']}: {problem}")
+            else:
+                failures += 1
+                console.print(
+                    f"[red]❌[/] {result['path']}: {result['error']} "
+                    f"[dim]({result['duration_ms']:.0f} ms)[/]"
+                )
+    finally:
+        log.setLevel(previous_level)
+
+    elapsed = time.perf_counter() - start
+    console.print(
+        f"\n[bold]{agents - failures}/{agents}[/] agents generated "
+        f"in {elapsed:.2f}s"
+    )
+    if failures:
+        raise typer.Exit(1)
+
+
 @app.command()
 def version():
     """Show the Open Agent Spec CLI version."""
     cli_version = get_version_from_pyproject()
-    console.print(f"[bold cyan]Open Agent Spec CLI[/] version [green]{cli_version}[/]")
+    get_console().print(
+        f"[bold cyan]Open Agent Spec CLI[/] version [green]{cli_version}[/]"
+    )
 
 
 @app.command()
 def init(
     spec: Optional[Path] = typer.Option(None, help="Path to Open Agent Spec YAML file"),
-    output: Path = typer.Option(..., help="Directory to scaffold the agent into"),
+    output: Optional[Path] = typer.Option(
+        None, help="Directory to scaffold the agent into"
+    ),
     template: Optional[str] = typer.Option(
-        None, help="Template name to use (e.g., 'minimal')"
+        None,
+        help="Built-in template to use (e.g. 'minimal'; see 'oas templates list')",
+    ),
+    spec_dir: Optional[Path] = typer.Option(
+        None, "--spec-dir", help="Directory of spec files to scaffold in one run"
+    ),
+    output_root: Optional[Path] = typer.Option(
+        None,
+        "--output-root",
+        help="Directory receiving one agent per spec (with --spec-dir)",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs",
+        "-j",
+        help="Worker processes for --spec-dir (default: CPU count)",
     ),
     verbose: bool = typer.Option(
         False, "--verbose", "-v", help="Enable verbose logging"
@@ -170,8 +412,49 @@ def init(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Preview what would be created without writing files"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always reparse and revalidate the spec"
+    ),
+    templates_dir: Optional[Path] = typer.Option(
+        None,
+        "--templates-dir",
+        exists=True,
+        file_okay=False,
+        help="Directory of templates (agent.py.j2, task_function.py.j2) "
+        "overriding the built-in ones",
+    ),
+    compile_prompts: bool = typer.Option(
+        False,
+        "--compile-prompts",
+        help="Precompile the prompt templates into prompts/_compiled and check "
+        "their variables against the task inputs",
+    ),
+    async_target: bool = typer.Option(
+        False,
+        "--async",
+        help="Generate async task functions and handle_message, keeping "
+        "synchronous wrappers (same as intelligence.async in the spec)",
+    ),
+    timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Report wall-clock and CPU time for each phase and task",
+    ),
+    timings_json: Optional[Path] = typer.Option(
+        None,
+        "--timings-json",
+        help="Write timings as JSON to this file ('-' for stdout)",
+    ),
+    profile: Optional[Path] = typer.Option(
+        None, "--profile", help="Profile the run with cProfile and save stats here"
+    ),
 ):
     """Initialize an agent project based on Open Agent Spec."""
+    from rich.panel import Panel
+
+    from .batch import default_jobs
+
+    console = get_console()
     log = setup_logging(verbose)
     if verbose:
         log.setLevel(logging.DEBUG)
@@ -184,28 +467,70 @@ def init(
         )
     )
 
-    # Determine which spec to use
-    spec_path = resolve_spec_path(spec, template, log)
-    spec_data, agent_name, class_name = load_and_validate_spec(spec_path, log)
+    with instrumented_run(timings, timings_json, profile, log) as timer:
+        if spec_dir is not None:
+            if output_root is None:
+                log.error("--spec-dir requires --output-root.")
+                raise typer.Exit(1)
+            generate_batch(
+                spec_dir,
+                output_root,
+                jobs or default_jobs(),
+                dry_run,
+                log,
+                use_cache=not no_cache,
+                templates_dir=templates_dir,
+                compile_prompts=compile_prompts,
+                async_target=async_target,
+            )
+            return
 
-    if dry_run:
-        console.print(
-            Panel.fit(
-                "🧪 [bold]Dry run mode[/]: No files will be written.", style="yellow"
+        if output is None:
+            log.error("You must provide --output (or --spec-dir with --output-root).")
+            raise typer.Exit(1)
+
+        # Determine which spec to use
+        if spec is not None:
+            spec_data, agent_name, class_name = load_and_validate_spec(
+                spec, log, timer, use_cache=not no_cache
             )
-        )
-        log.info("Agent Name: %s", agent_name)
-        log.info("Class Name: %s", class_name)
-        log.info("Output directory would be: %s", output.resolve())
-        log.info("Files that would be created:")
-        log.info("- agent.py")
-        log.info("- README.md")
-        log.info("- requirements.txt")
-        log.info("- .env.example")
-        log.info("- prompts/agent_prompt.jinja2")
-        return
+        elif template is not None:
+            spec_data, agent_name, class_name = validate_loaded_spec(
+                load_template_spec(template, log, timer), log, timer
+            )
+        else:
+            log.error("You must provide either --spec or --template NAME.")
+            raise typer.Exit(1)
 
-    generate_files(output, spec_data, agent_name, class_name, log)
+        if dry_run:
+            console.print(
+                Panel.fit(
+                    "🧪 [bold]Dry run mode[/]: No files will be written.",
+                    style="yellow",
+                )
+            )
+            log.info("Agent Name: %s", agent_name)
+            log.info("Class Name: %s", class_name)
+            log.info("Output directory would be: %s", output.resolve())
+            log.info("Files that would be created:")
+            log.info("- agent.py")
+            log.info("- README.md")
+            log.info("- requirements.txt")
+            log.info("- .env.example")
+            log.info("- prompts/agent_prompt.jinja2")
+            return
+
+        generate_files(
+            output,
+            spec_data,
+            agent_name,
+            class_name,
+            log,
+            timer,
+            templates_dir,
+            compile_prompts,
+            async_target,
+        )
 
 
 @app.command()
@@ -218,8 +543,50 @@ def update(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Preview what would be updated without writing files"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always reparse and revalidate the spec"
+    ),
+    templates_dir: Optional[Path] = typer.Option(
+        None,
+        "--templates-dir",
+        exists=True,
+        file_okay=False,
+        help="Directory of templates (agent.py.j2, task_function.py.j2) "
+        "overriding the built-in ones",
+    ),
+    compile_prompts: bool = typer.Option(
+        False,
+        "--compile-prompts",
+        help="Precompile the prompt templates into prompts/_compiled and check "
+        "their variables against the task inputs",
+    ),
+    async_target: bool = typer.Option(
+        False,
+        "--async",
+        help="Generate async task functions and handle_message, keeping "
+        "synchronous wrappers (same as intelligence.async in the spec)",
+    ),
+    timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Report wall-clock and CPU time for each phase and task",
+    ),
+    timings_json: Optional[Path] = typer.Option(
+        None,
+        "--timings-json",
+        help="Write timings as JSON to this file ('-' for stdout)",
+    ),
+    profile: Optional[Path] = typer.Option(
+        None, "--profile", help="Profile the run with cProfile and save stats here"
+    ),
 ):
     """Update an existing agent project based on changes to the Open Agent Spec."""
+    from rich.panel import Panel
+
+    from .code_generation import CodeGenerator, template_override_dirs
+    from .manifest import sync_agent_files
+
+    console = get_console()
     log = setup_logging(verbose)
     if verbose:
         log.setLevel(logging.DEBUG)
@@ -232,37 +599,193 @@ def update(
         )
     )
 
-    # Check if output directory exists
-    if not output.exists():
-        log.error(
-            f"Output directory {output} does not exist. Use 'oas init' to create a new agent."
+    with instrumented_run(timings, timings_json, profile, log) as timer:
+        # Check if output directory exists
+        if not output.exists():
+            log.error(
+                f"Output directory {output} does not exist. Use 'oas init' to create a new agent."
+            )
+            raise typer.Exit(1)
+
+        spec_data, agent_name, class_name = load_and_validate_spec(
+            spec, log, timer, use_cache=not no_cache
         )
-        raise typer.Exit(1)
 
-    spec_data, agent_name, class_name = load_and_validate_spec(spec, log)
+        if dry_run:
+            console.print(
+                Panel.fit(
+                    "🧪 [bold]Dry run mode[/]: No files will be updated.",
+                    style="yellow",
+                )
+            )
+            log.info("Agent Name: %s", agent_name)
+            log.info("Class Name: %s", class_name)
 
-    if dry_run:
-        console.print(
-            Panel.fit(
-                "🧪 [bold]Dry run mode[/]: No files will be updated.", style="yellow"
+        # Regenerate only what the spec changes affect
+        log.info("Generating updated files...")
+        try:
+            result = sync_agent_files(
+                output,
+                spec_data,
+                agent_name,
+                class_name,
+                dry_run=dry_run,
+                generator=CodeGenerator(
+                    override_dirs=template_override_dirs(templates_dir)
+                ),
+                timer=timer,
+                compile_prompts=compile_prompts,
+                async_target=async_target,
             )
+        except Exception as err:
+            log.error(f"Error during file generation: {err}")
+            raise RuntimeError(f"Failed to generate agent code: {err}") from err
+
+        if result.recomputed_tasks:
+            log.info("Regenerated tasks: %s", ", ".join(result.recomputed_tasks))
+        if dry_run:
+            if result.changed:
+                log.info("Files that would be updated:")
+                for rel_path in result.changed:
+                    log.info("- %s", rel_path)
+            else:
+                log.info("No files would be updated.")
+            return
+
+        for rel_path in result.changed:
+            log.info("%s updated", rel_path)
+        if result.compiled_prompts:
+            log.info("prompts/_compiled updated")
+        for problem in result.prompt_problems:
+            log.warning(problem)
+        log.info("%d files unchanged", len(result.unchanged))
+
+        console.print("\n[bold green]✅ Agent project updated![/] ✨")
+        log.info(
+            "Note: If you're using version control, make sure to commit your changes."
         )
-        log.info("Agent Name: %s", agent_name)
-        log.info("Class Name: %s", class_name)
-        log.info("Files that would be updated:")
-        log.info("- agent.py")
-        log.info("- README.md")
-        log.info("- requirements.txt")
-        log.info("- .env.example")
-        log.info("- prompts/agent_prompt.jinja2")
-        return
 
-    # Generate updated files
-    log.info("Generating updated files...")
-    generate_files(output, spec_data, agent_name, class_name, log)
 
-    console.print("\n[bold green]✅ Agent project updated![/] ✨")
-    log.info("Note: If you're using version control, make sure to commit your changes.")
+@app.command()
+def watch(
+    spec: Path = typer.Option(..., help="Path to the Open Agent Spec YAML file"),
+    output: Path = typer.Option(..., help="Directory to keep in sync with the spec"),
+    interval: float = typer.Option(
+        0.5, "--interval", help="Seconds between checks for changes"
+    ),
+    debounce: float = typer.Option(
+        0.2, "--debounce", help="Seconds the spec must be unchanged before regenerating"
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", "-v", help="Enable verbose logging"
+    ),
+):
+    """Regenerate an agent project every time its spec is saved."""
+    from .watch import SpecWatcher
+
+    console = get_console()
+    log = setup_logging(verbose)
+    if verbose:
+        log.setLevel(logging.DEBUG)
+
+    if not spec.exists():
+        log.error(f"Spec file {spec} does not exist")
+        raise typer.Exit(1)
+
+    def report(cycle) -> None:
+        if not cycle.success:
+            console.print(f"[red]❌ {cycle.error}[/] ({cycle.duration_ms:.1f} ms)")
+            return
+        if not cycle.changed:
+            console.print(f"✅ No files changed ({cycle.duration_ms:.1f} ms)")
+            return
+        tasks = ""
+        if cycle.recomputed_tasks:
+            tasks = f" [dim](tasks: {', '.join(cycle.recomputed_tasks)})[/]"
+        console.print(
+            f"🔄 Regenerated {', '.join(cycle.changed)} "
+            f"in {cycle.duration_ms:.1f} ms{tasks}"
+        )
+
+    console.print(f"👀 Watching [bold]{spec}[/] → {output} (Ctrl+C to stop)")
+    watcher = SpecWatcher(spec, output, interval=interval, debounce=debounce)
+    try:
+        watcher.watch(report)
+    except KeyboardInterrupt:
+        console.print("Stopped watching.")
+
+
+@app.command()
+def validate(
+    paths: List[str] = typer.Argument(
+        ..., help="Spec files, directories or glob patterns to validate"
+    ),
+    jobs: int = typer.Option(
+        0, "--jobs", "-j", help="Worker processes to use (default: CPU count)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always reparse and revalidate every spec"
+    ),
+    all_errors: bool = typer.Option(
+        False,
+        "--all-errors",
+        help="Report every problem in each spec instead of stopping at the first",
+    ),
+):
+    """Validate Open Agent Spec files in parallel.
+
+    Prints one JSON object per spec to stdout. Exits with 0 when every spec is
+    valid, 1 when any spec fails and 2 when no spec files were found. With
+    --all-errors, each invalid spec's object lists all of its problems under
+    "errors", each with the path of the offending value.
+    """
+    from .batch import default_jobs, expand_spec_paths, iter_validation_results
+
+    spec_paths = expand_spec_paths(paths)
+    if not spec_paths:
+        typer.echo("No spec files found", err=True)
+        raise typer.Exit(2)
+
+    # Bundles yield a result per document, so count specs from the results
+    total = 0
+    valid = 0
+    for result in iter_validation_results(
+        spec_paths,
+        jobs or default_jobs(),
+        use_cache=not no_cache,
+        all_errors=all_errors,
+    ):
+        total += 1
+        if result["valid"]:
+            valid += 1
+        typer.echo(json.dumps(result))
+
+    typer.echo(f"{valid}/{total} specs valid", err=True)
+    if valid < total:
+        raise typer.Exit(1)
+
+
+@templates_app.command("list")
+def list_templates():
+    """List the built-in templates usable with 'oas init --template NAME'."""
+    from rich.table import Table
+
+    from .spec_templates import spec_templates
+
+    table = Table(title="Built-in templates")
+    table.add_column("Name", style="bold magenta")
+    table.add_column("Aliases")
+    table.add_column("Tasks", justify="right")
+    table.add_column("Description")
+    for name in spec_templates.names():
+        spec_data = spec_templates.get(name)
+        table.add_row(
+            name,
+            ", ".join(spec_templates.aliases_for(name)),
+            str(len(spec_data.get("tasks", {}))),
+            spec_data.get("agent", {}).get("description", ""),
+        )
+    get_console().print(table)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,340 @@
+"""Content-hash manifest for incremental agent regeneration.
+
+Every generated project carries a ``.oas-manifest.json`` recording a hash of
+each spec section, a hash of each generated file and the generated code for
+each task. ``sync_agent_files`` compares a spec against the manifest so that
+only the files affected by a change are re-rendered, only the task functions
+and models whose inputs changed are regenerated, and only files whose bytes
+actually differ are rewritten.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .generators import (
+    DEFAULT_PROMPT_TEMPLATE,
+    prompt_file_name,
+    render_agent_code,
+    render_env_example,
+    render_readme,
+    render_requirements,
+    render_task_prompt,
+)
+from .spec_ir import SpecIR
+from .spec_normalizer import normalize_spec
+from .timing import NULL_TIMER, PhaseTimer
+from .utils import stable_hash
+
+if TYPE_CHECKING:
+    from .code_generation import CodeGenerator
+    from .data_preparation import AgentDataPreparator
+
+log = logging.getLogger("oas")
+
+MANIFEST_NAME = ".oas-manifest.json"
+# Bumped when the generated code changes, so cached task code is not reused
+MANIFEST_VERSION = 5
+
+# Section tracking the override templates; not a valid spec key
+TEMPLATES_SECTION = "#templates"
+
+
+class SyncResult:
+    """Outcome of bringing a generated project in line with its spec."""
+
+    def __init__(self) -> None:
+        # Files written, or that would be written in a dry run
+        self.changed: List[str] = []
+        self.unchanged: List[str] = []
+        # Files listed in the previous manifest that are no longer generated
+        self.stale: List[str] = []
+        # Tasks whose function and model code had to be regenerated
+        self.recomputed_tasks: List[str] = []
+        # Whether prompt templates were compiled, with ``compile_prompts``
+        self.compiled_prompts = False
+        # Prompt variables the task functions do not provide
+        self.prompt_problems: List[str] = []
+
+
+def _generator_id() -> str:
+    """Identify the generator so that upgrading the CLI invalidates manifests."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        cli_version = version("open-agent-spec")
+    except PackageNotFoundError:
+        cli_version = "unknown"
+    return f"{cli_version}/{MANIFEST_VERSION}"
+
+
+def _file_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_spec_sections(spec_data: Dict[str, Any]) -> Dict[str, str]:
+    """Hash each top-level spec section, with one entry per task.
+
+    Tasks are keyed as ``tasks.<name>``; the ``tasks`` entry itself tracks
+    only the task names and their order.
+    """
+    sections = {}
+    for key, value in spec_data.items():
+        if key == "tasks" and isinstance(value, dict):
+            sections["tasks"] = stable_hash(list(value))
+            for task_name, task_def in value.items():
+                sections[f"tasks.{task_name}"] = stable_hash(task_def)
+        else:
+            sections[key] = stable_hash(value)
+    return sections
+
+
+def load_manifest(output: Path) -> Dict[str, Any]:
+    """Load the manifest from a project directory, or ``{}`` if unusable."""
+    try:
+        manifest = json.loads((output / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def _changed_sections(
+    manifest: Dict[str, Any], sections: Dict[str, str]
+) -> Optional[Set[str]]:
+    """Return the keys of sections that differ, or None if everything is stale."""
+    if manifest.get("generator") != _generator_id():
+        return None
+    previous = manifest.get("sections", {})
+    return {
+        key
+        for key in set(previous) | set(sections)
+        if previous.get(key) != sections.get(key)
+    }
+
+
+def _is_affected(changed: Optional[Set[str]], depends_on: Optional[Tuple]) -> bool:
+    """Whether an artifact depending on ``depends_on`` sections must be re-rendered.
+
+    ``depends_on=None`` means the artifact depends on the whole spec.
+    """
+    if changed is None:
+        return True
+    if depends_on is None:
+        return bool(changed)
+    return any(
+        key == dep or key.startswith(dep + ".") for key in changed for dep in depends_on
+    )
+
+
+def _artifacts(
+    spec_data: Dict[str, Any],
+    agent_name: str,
+    class_name: str,
+    preparator: "AgentDataPreparator",
+    generator: Optional["CodeGenerator"],
+) -> List[Tuple[str, Optional[Tuple], Callable[[], str]]]:
+    """List generated files with the spec sections they depend on and a renderer."""
+    tasks = spec_data.get("tasks", {})
+    artifacts: List[Tuple[str, Optional[Tuple], Callable[[], str]]] = []
+
+    # Built on first use and shared by the renderers that need it
+    @functools.lru_cache(maxsize=None)
+    def spec_ir() -> SpecIR:
+        return SpecIR(spec_data)
+
+    if tasks:
+        artifacts.append(
+            (
+                "agent.py",
+                None,
+                lambda: render_agent_code(
+                    spec_data,
+                    agent_name,
+                    class_name,
+                    preparator=preparator,
+                    generator=generator,
+                    ir=spec_ir(),
+                ),
+            )
+        )
+    else:
+        log.warning("No tasks defined in spec file")
+
+    artifacts.extend(
+        [
+            (
+                "README.md",
+                ("agent", "memory", "tasks", "behavioural_contract"),
+                lambda: render_readme(spec_data, spec_ir()),
+            ),
+            (
+                "requirements.txt",
+                ("intelligence",),
+                lambda: render_requirements(spec_data),
+            ),
+            (".env.example", ("intelligence",), lambda: render_env_example(spec_data)),
+        ]
+    )
+
+    for task_name, task_def in tasks.items():
+        artifacts.append(
+            (
+                f"prompts/{prompt_file_name(task_name)}",
+                (f"tasks.{task_name}", "prompts"),
+                functools.partial(render_task_prompt, task_name, task_def, spec_data),
+            )
+        )
+    artifacts.append(
+        ("prompts/agent_prompt.jinja2", (), lambda: DEFAULT_PROMPT_TEMPLATE)
+    )
+    return artifacts
+
+
+def with_async_target(spec_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of ``spec_data`` with ``intelligence.async`` set."""
+    intelligence = dict(spec_data.get("intelligence") or {})
+    intelligence["async"] = True
+    return {**spec_data, "intelligence": intelligence}
+
+
+def sync_agent_files(
+    output: Path,
+    spec_data: Dict[str, Any],
+    agent_name: str,
+    class_name: str,
+    dry_run: bool = False,
+    preparator: Optional["AgentDataPreparator"] = None,
+    generator: Optional["CodeGenerator"] = None,
+    timer: PhaseTimer = NULL_TIMER,
+    compile_prompts: bool = False,
+    async_target: bool = False,
+) -> SyncResult:
+    """Bring the agent project in ``output`` in line with ``spec_data``.
+
+    A file is re-rendered only if a spec section it depends on changed since
+    the manifest was written, or if it is missing or was edited on disk. It is
+    rewritten only if the rendered bytes differ from what is on disk. With
+    ``dry_run`` nothing is written and the result lists the files that would
+    change.
+
+    A caller-supplied ``preparator`` keeps its own fragment cache (for
+    long-running processes such as ``oas watch``); when that cache is empty,
+    or no preparator is given, the task code stored in the manifest is reused.
+
+    ``timer`` records the time spent preparing, rendering, reading and writing.
+
+    Templates from ``generator``'s override directories count as an extra
+    section, so editing an override re-renders ``agent.py``.
+
+    With ``compile_prompts`` the prompt templates are precompiled into
+    ``prompts/_compiled`` and checked against the task inputs (see
+    ``prompt_compiler``); this is skipped in a dry run.
+
+    ``async_target`` generates an async agent, as if the spec set
+    ``intelligence.async``.
+    """
+    from .code_generation import CodeGenerator
+    from .data_preparation import AgentDataPreparator
+
+    if generator is None:
+        generator = CodeGenerator()
+    spec_data = normalize_spec(spec_data)
+    if async_target:
+        spec_data = with_async_target(spec_data)
+    manifest = load_manifest(output)
+    sections = hash_spec_sections(spec_data)
+    templates = generator.override_fingerprint()
+    if templates is not None:
+        sections[TEMPLATES_SECTION] = templates
+    changed = _changed_sections(manifest, sections)
+
+    fragments = manifest.get("fragments", {}) if changed is not None else {}
+    if preparator is None:
+        preparator = AgentDataPreparator(fragment_cache=dict(fragments), timer=timer)
+    else:
+        if not preparator.fragment_cache:
+            preparator.fragment_cache.update(fragments)
+        if timer is not NULL_TIMER:
+            preparator.timer = timer
+    preparator.recomputed_tasks = []
+
+    previous_artifacts = manifest.get("artifacts", {}) if changed is not None else {}
+    artifacts: Dict[str, str] = {}
+    result = SyncResult()
+
+    for rel_path, depends_on, render in _artifacts(
+        spec_data, agent_name, class_name, preparator, generator
+    ):
+        path = output / rel_path
+        with timer.phase("read"):
+            existing = path.read_bytes() if path.is_file() else None
+            existing_hash = _file_hash(existing) if existing is not None else None
+
+        if (
+            existing_hash is not None
+            and existing_hash == previous_artifacts.get(rel_path)
+            and not _is_affected(changed, depends_on)
+        ):
+            artifacts[rel_path] = existing_hash
+            result.unchanged.append(rel_path)
+            continue
+
+        with timer.phase("render"):
+            content = render().encode("utf-8")
+        artifacts[rel_path] = _file_hash(content)
+        if content == existing:
+            result.unchanged.append(rel_path)
+            continue
+
+        result.changed.append(rel_path)
+        if not dry_run:
+            with timer.phase("write"):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(content)
+            log.debug(f"{rel_path} written")
+
+    result.stale = [path for path in previous_artifacts if path not in artifacts]
+    for rel_path in result.stale:
+        log.warning(f"{rel_path} is no longer generated by the spec; left in place")
+    result.recomputed_tasks = list(preparator.recomputed_tasks)
+
+    if not dry_run:
+        new_manifest = json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "generator": _generator_id(),
+                "sections": sections,
+                "artifacts": artifacts,
+                "fragments": dict(preparator.fragment_cache),
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        manifest_path = output / MANIFEST_NAME
+        with timer.phase("write"):
+            if not manifest_path.is_file() or manifest_path.read_text() != new_manifest:
+                output.mkdir(parents=True, exist_ok=True)
+                manifest_path.write_text(new_manifest)
+
+        if compile_prompts:
+            with timer.phase("compile_prompts"):
+                _compile_prompts(output, spec_data, result)
+
+    return result
+
+
+def _compile_prompts(
+    output: Path, spec_data: Dict[str, Any], result: SyncResult
+) -> None:
+    from .prompt_compiler import check_prompt_variables, compile_prompt_templates
+
+    prompts_dir = output / "prompts"
+    result.prompt_problems = check_prompt_variables(spec_data, prompts_dir)
+    result.compiled_prompts = compile_prompt_templates(prompts_dir)
+    if result.compiled_prompts:
+        log.info(f"Prompt templates compiled into {prompts_dir / '_compiled'}")
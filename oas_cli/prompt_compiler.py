@@ -0,0 +1,102 @@
+"""Compile and check the prompt templates of a generated agent.
+
+With ``--compile-prompts``, ``oas init`` and ``oas update`` compile
+``prompts/*.jinja2`` into Python modules under ``prompts/_compiled`` (see
+``template_compiler.compile_templates``). Generated agents load them through
+a ``ModuleLoader``, so their first request pays no Jinja parsing. An agent
+only uses the compiled prompts while they match the installed Jinja version
+and the ``.jinja2`` files next to them; after a prompt is edited it renders
+the source again until the prompts are recompiled.
+
+The same step checks that each prompt only uses variables its task function
+passes when rendering it.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from .code_generation import TemplateVariableParser, _parse_env
+from .generators import prompt_file_name
+from .spec_ir import SpecIR
+from .template_compiler import (
+    COMPILED_DIR_NAME,
+    MANIFEST_NAME,
+    compile_templates,
+    compiled_manifest,
+)
+
+log = logging.getLogger(__name__)
+
+PROMPT_SUFFIX = ".jinja2"
+
+# Generated agents render prompts with Jinja's default options
+PROMPT_ENVIRONMENT_OPTIONS: Dict[str, Any] = {}
+
+# Variables every task function passes besides its inputs
+PROMPT_CONTEXT = ("input", "memory_summary", "output_format", "memory_config")
+
+
+def compile_prompt_templates(prompts_dir: Union[str, Path]) -> bool:
+    """Compile a generated agent's prompt templates unless they are up to date.
+
+    Returns whether the templates were compiled.
+
+    Raises:
+        jinja2.TemplateSyntaxError: If a prompt cannot be compiled
+    """
+    prompts_dir = Path(prompts_dir)
+    expected = compiled_manifest(prompts_dir, PROMPT_SUFFIX, PROMPT_ENVIRONMENT_OPTIONS)
+    try:
+        current = json.loads(
+            (prompts_dir / COMPILED_DIR_NAME / MANIFEST_NAME).read_text()
+        )
+    except (OSError, ValueError):
+        current = None
+    if current == expected:
+        return False
+
+    compile_templates(
+        prompts_dir,
+        suffix=PROMPT_SUFFIX,
+        options=PROMPT_ENVIRONMENT_OPTIONS,
+    )
+    log.debug(f"Compiled {len(expected['templates'])} prompt templates")
+    return True
+
+
+def check_prompt_variables(
+    spec_data: Dict[str, Any], prompts_dir: Union[str, Path]
+) -> List[str]:
+    """Return a message for each prompt variable its task does not provide.
+
+    Only the prompts of tasks whose functions render one (single-step LLM
+    tasks) are checked, against the task's inputs and ``PROMPT_CONTEXT``.
+    Both ``{{ name }}`` and ``{{ input.name }}`` must name an input.
+    """
+    prompts_dir = Path(prompts_dir)
+    parser = TemplateVariableParser()
+    problems = []
+    for task in SpecIR(spec_data).tasks.values():
+        if not task.renders_prompt:
+            continue
+        path = prompts_dir / prompt_file_name(task.name)
+        try:
+            source = path.read_text()
+        except OSError:
+            continue
+        inputs = set(task.param_names)
+        provided = inputs | set(PROMPT_CONTEXT) | set(_parse_env.globals)
+        missing = parser.extract_jinja_variables(source) - provided
+        missing |= {
+            f"input.{field}"
+            for field in parser.extract_attribute_references(source, "input")
+            if field not in inputs
+        }
+        for variable in sorted(missing):
+            problems.append(
+                f"prompts/{path.name} uses '{variable}', which is not an input "
+                f"of task {task.name}"
+            )
+    return problems
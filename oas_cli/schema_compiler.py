@@ -0,0 +1,327 @@
+"""Compile a JSON schema into a specialised Python validator.
+
+``jsonschema`` walks the schema tree for every instance it validates. For a
+fixed schema that work can be done once: ``compile_schema`` turns the schema
+into the source of a module whose ``is_valid(data)`` function checks an
+instance with straight-line ``isinstance`` tests, dict lookups and
+precompiled regular expressions, in the spirit of fastjsonschema.
+
+Only the draft-07 keywords the Open Agent Spec schema needs are supported;
+any other keyword raises ``SchemaCompileError`` so that callers fall back to
+``jsonschema``. The generated validator only answers whether an instance is
+valid; error messages still come from ``jsonschema``.
+
+``load_compiled_validator`` caches the generated module in the ``validators``
+subdirectory of the per-user spec cache (see ``spec_cache.default_cache_dir``),
+never inside the installed package, and regenerates it when the schema's content or this
+compiler changes.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .spec_cache import default_cache_dir
+
+log = logging.getLogger(__name__)
+
+# Bump when the generated code changes so that cached modules are rebuilt
+COMPILER_VERSION = 1
+
+# Keywords that never affect validity
+ANNOTATIONS = frozenset(
+    {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+)
+
+SUPPORTED_KEYWORDS = ANNOTATIONS | {
+    "type",
+    "enum",
+    "required",
+    "properties",
+    "patternProperties",
+    "additionalProperties",
+    "items",
+    "minimum",
+    "maximum",
+    "pattern",
+}
+
+# Python test for each JSON type; ``{v}`` is replaced by the instance variable.
+# Booleans are ints in Python but never numbers in JSON Schema, and draft-07
+# counts floats with no fractional part as integers.
+TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": (
+        "((isinstance({v}, int) and not isinstance({v}, bool))"
+        " or (isinstance({v}, float) and {v}.is_integer()))"
+    ),
+}
+
+# Keywords that only constrain instances of one type
+KEYWORD_TYPES = {
+    "required": "object",
+    "properties": "object",
+    "patternProperties": "object",
+    "additionalProperties": "object",
+    "items": "array",
+    "pattern": "string",
+    "minimum": "number",
+    "maximum": "number",
+}
+
+
+class SchemaCompileError(Exception):
+    """Raised when a schema uses something the compiler does not support."""
+
+
+class _Emitter:
+    """Accumulates the generated function body and its module-level constants."""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.constants: List[str] = []
+        self._counter = 0
+
+    def name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def constant(self, prefix: str, expression: str) -> str:
+        name = self.name(prefix)
+        self.constants.append(f"{name} = {expression}")
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def schema(self, schema: Any, var: str, indent: int) -> None:
+        """Emit checks that return False unless ``var`` matches ``schema``."""
+        if schema is True:
+            return
+        if schema is False:
+            self.emit(indent, "return False")
+            return
+        if not isinstance(schema, dict):
+            raise SchemaCompileError(f"Unsupported schema: {schema!r}")
+        unsupported = set(schema) - SUPPORTED_KEYWORDS
+        if unsupported:
+            raise SchemaCompileError(
+                f"Unsupported keywords: {', '.join(sorted(unsupported))}"
+            )
+
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+        if types is not None:
+            if not types or any(t not in TYPE_CHECKS for t in types):
+                raise SchemaCompileError(f"Unsupported type: {schema['type']!r}")
+            test = " or ".join(TYPE_CHECKS[t].format(v=var) for t in types)
+            self.emit(indent, f"if not ({test}):")
+            self.emit(indent + 1, "return False")
+
+        if "enum" in schema:
+            self.enum(schema["enum"], var, indent, types)
+
+        for instance_type in ("object", "array", "string", "number"):
+            keywords = {
+                k: v for k, v in schema.items() if KEYWORD_TYPES.get(k) == instance_type
+            }
+            if not keywords:
+                continue
+            if types is not None and all(
+                t == instance_type or (instance_type == "number" and t == "integer")
+                for t in types
+            ):
+                # The type check above already guarantees the instance type
+                body_indent = indent
+            elif types is not None and not any(
+                t == instance_type or (instance_type == "number" and t == "integer")
+                for t in types
+            ):
+                # These keywords can never apply
+                continue
+            else:
+                self.emit(indent, f"if {TYPE_CHECKS[instance_type].format(v=var)}:")
+                body_indent = indent + 1
+            getattr(self, f"{instance_type}_keywords")(keywords, var, body_indent)
+
+    def enum(self, values: Any, var: str, indent: int, types: Any) -> None:
+        # 1 == True in Python but not in JSON Schema; strings and None compare
+        # the same way in both, so only those are supported
+        if not isinstance(values, list) or not all(
+            v is None or isinstance(v, str) for v in values
+        ):
+            raise SchemaCompileError(f"Unsupported enum: {values!r}")
+        if types == ["string"]:
+            name = self.constant("_ENUM", f"frozenset({tuple(values)!r})")
+        else:
+            name = self.constant("_ENUM", repr(tuple(values)))
+        self.emit(indent, f"if {var} not in {name}:")
+        self.emit(indent + 1, "return False")
+
+    def object_keywords(self, keywords: Dict[str, Any], var: str, indent: int) -> None:
+        for key in keywords.get("required", []):
+            self.emit(indent, f"if {key!r} not in {var}:")
+            self.emit(indent + 1, "return False")
+
+        properties = keywords.get("properties", {})
+        for key, subschema in properties.items():
+            if subschema is True or subschema == {}:
+                continue
+            child = self.name("v")
+            self.emit(indent, f"if {key!r} in {var}:")
+            self.emit(indent + 1, f"{child} = {var}[{key!r}]")
+            self.schema(subschema, child, indent + 1)
+
+        patterns = keywords.get("patternProperties", {})
+        additional = keywords.get("additionalProperties", True)
+        if not patterns and additional is True:
+            return
+
+        key_var, child = self.name("k"), self.name("v")
+        self.emit(indent, f"for {key_var}, {child} in {var}.items():")
+        matched = self.name("matched")
+        if additional is not True:
+            names = self.constant("_PROPERTIES", f"frozenset({sorted(properties)!r})")
+            self.emit(indent + 1, f"{matched} = {key_var} in {names}")
+        for pattern, subschema in patterns.items():
+            regex = self.constant("_PATTERN", f"re.compile({pattern!r})")
+            self.emit(indent + 1, f"if {regex}.search({key_var}):")
+            if additional is not True:
+                self.emit(indent + 2, f"{matched} = True")
+            self.schema(subschema, child, indent + 2)
+            self.emit(indent + 2, "pass")
+        if additional is not True:
+            self.emit(indent + 1, f"if not {matched}:")
+            self.schema(additional, child, indent + 2)
+            self.emit(indent + 2, "pass")
+
+    def array_keywords(self, keywords: Dict[str, Any], var: str, indent: int) -> None:
+        items = keywords["items"]
+        if isinstance(items, list):
+            raise SchemaCompileError("Tuple-form 'items' is not supported")
+        child = self.name("v")
+        self.emit(indent, f"for {child} in {var}:")
+        self.schema(items, child, indent + 1)
+        self.emit(indent + 1, "pass")
+
+    def string_keywords(self, keywords: Dict[str, Any], var: str, indent: int) -> None:
+        regex = self.constant("_PATTERN", f"re.compile({keywords['pattern']!r})")
+        self.emit(indent, f"if not {regex}.search({var}):")
+        self.emit(indent + 1, "return False")
+
+    def number_keywords(self, keywords: Dict[str, Any], var: str, indent: int) -> None:
+        if "minimum" in keywords:
+            self.emit(indent, f"if {var} < {keywords['minimum']!r}:")
+            self.emit(indent + 1, "return False")
+        if "maximum" in keywords:
+            self.emit(indent, f"if {var} > {keywords['maximum']!r}:")
+            self.emit(indent + 1, "return False")
+
+
+def schema_hash(schema_source: bytes) -> str:
+    """Return the key identifying generated code for a schema's raw content."""
+    digest = hashlib.sha256(f"compiler-{COMPILER_VERSION}\0".encode())
+    digest.update(schema_source)
+    return digest.hexdigest()
+
+
+def compile_schema(schema: Any, source_hash: str = "") -> str:
+    """Return the source of a module whose ``is_valid(data)`` checks ``schema``.
+
+    Raises:
+        SchemaCompileError: If the schema uses an unsupported keyword or form
+    """
+    emitter = _Emitter()
+    emitter.schema(schema, "data", 1)
+    header = [
+        '"""Validator generated from a JSON schema by oas_cli.schema_compiler.',
+        "",
+        "Do not edit: this file is regenerated whenever the schema changes.",
+        '"""',
+        "",
+        f"SCHEMA_HASH = {source_hash!r}",
+        "",
+        "import re",
+        "",
+    ]
+    body = ["", "", "def is_valid(data):"] + emitter.lines + ["    return True", ""]
+    return "\n".join(header + emitter.constants + body)
+
+
+def _import_module(path: Path) -> Any:
+    spec = importlib.util.spec_from_file_location(f"_oas_validator_{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot import {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compiled_module_path(
+    schema_path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None
+) -> Path:
+    """Return where the generated validator for a schema file is cached.
+
+    Modules live in ``cache_dir`` (``validators`` under the spec cache
+    directory by default), apart from the spec cache's own entries, and
+    are named after the schema's stem and a hash of its absolute path, so
+    schemas with the same file name do not overwrite each other's module.
+    """
+    path = Path(schema_path).resolve()
+    path_hash = hashlib.sha256(str(path).encode()).hexdigest()[:16]
+    directory = Path(cache_dir) if cache_dir else default_cache_dir() / "validators"
+    return directory / f"{path.stem}-{path_hash}.validator.py"
+
+
+def load_compiled_validator(schema_path: Union[str, Path]) -> Callable[[Any], bool]:
+    """Return ``is_valid`` for a schema file, generating its module if needed.
+
+    The cached module (see ``compiled_module_path``) is reused while its
+    ``SCHEMA_HASH`` matches the schema's content. If it cannot be written
+    (e.g. a read-only home directory) the generated code is only kept in
+    memory.
+
+    Raises:
+        FileNotFoundError: If the schema file does not exist
+        json.JSONDecodeError: If the schema file is not valid JSON
+        SchemaCompileError: If the schema cannot be compiled
+    """
+    source = Path(schema_path).read_bytes()
+    expected = schema_hash(source)
+    module_path = compiled_module_path(schema_path)
+
+    try:
+        module = _import_module(module_path)
+        if getattr(module, "SCHEMA_HASH", None) == expected:
+            return module.is_valid
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        log.debug(f"Regenerating unusable compiled validator {module_path}: {err}")
+
+    code = compile_schema(json.loads(source), expected)
+    try:
+        module_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=module_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(code)
+        os.replace(tmp_name, module_path)
+        log.debug(f"Wrote compiled validator {module_path}")
+        return _import_module(module_path).is_valid
+    except OSError as err:
+        log.debug(f"Could not cache compiled validator at {module_path}: {err}")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile(code, str(module_path), "exec"), namespace)
+    return namespace["is_valid"]
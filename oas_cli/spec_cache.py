@@ -0,0 +1,320 @@
+"""Persistent cache of parsed and validated spec files.
+
+Entries live under ``$XDG_CACHE_HOME/oas/specs`` (``~/.cache/oas/specs`` by
+default, or ``$OAS_CACHE_DIR`` if set) and are keyed by a hash of the spec's
+bytes, the CLI version, the JSON schema and the active ``LoadLimits``. A hit returns the parsed spec and
+the names derived by ``validate_spec`` without parsing YAML or running either
+validation pass. Only specs that passed validation are cached.
+
+The cache is bounded in size: when a write takes it over the limit, the least
+recently used entries are removed. Each process keeps a running estimate of
+the cache's size, so a write only scans the directory the first time and when
+the estimate goes over the limit. Any problem with the cache itself is
+logged and otherwise ignored, so a broken cache only costs speed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .spec_loader import LoadLimits
+from .timing import NULL_TIMER, PhaseTimer
+from .validators import SCHEMA_PATH
+
+log = logging.getLogger(__name__)
+
+# Default upper bound on the total size of cached entries
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Spec files larger than this are parsed as a stream and never cached
+STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+CacheHit = Tuple[Dict[str, Any], str, str]
+
+# Estimated total size of the entries in each cache directory, kept per process
+# so that writes need not rescan the directory
+_size_estimates: Dict[Path, int] = {}
+
+
+def default_cache_dir() -> Path:
+    """Return the directory holding cached specs."""
+    override = os.environ.get("OAS_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg) / "oas" / "specs"
+
+
+@lru_cache(maxsize=None)
+def _schema_hash(schema_path: str, mtime_ns: int) -> str:
+    return hashlib.sha256(Path(schema_path).read_bytes()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _cli_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("open-agent-spec")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class SpecCache:
+    """A size-bounded LRU cache of validated specs on disk."""
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_bytes: Optional[int] = None,
+        schema_path: Union[str, Path] = SCHEMA_PATH,
+        limits: Optional[LoadLimits] = None,
+    ):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("OAS_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self.schema_path = Path(schema_path)
+        self.limits = limits or LoadLimits.from_env()
+
+    def key(self, content: bytes) -> str:
+        """Return the cache key for a spec file's raw bytes.
+
+        The load limits are part of the key, so tightening them makes
+        previously cached specs go through the bounded loader again.
+        """
+        schema = str(self.schema_path)
+        schema_hash = _schema_hash(schema, os.stat(schema).st_mtime_ns)
+        limits = json.dumps(vars(self.limits), sort_keys=True)
+        digest = hashlib.sha256()
+        parts = (
+            _cli_version().encode(),
+            schema_hash.encode(),
+            limits.encode(),
+            content,
+        )
+        for part in parts:
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, content: bytes) -> Optional[CacheHit]:
+        """Return ``(spec_data, agent_name, class_name)`` for cached content."""
+        try:
+            path = self._entry_path(self.key(content))
+            entry = json.loads(path.read_text())
+            # Reading an entry makes it the most recently used
+            os.utime(path)
+            return entry["spec"], entry["agent_name"], entry["class_name"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            log.debug(f"Ignoring unreadable spec cache entry: {err}")
+            return None
+
+    def put(
+        self,
+        content: bytes,
+        spec_data: Dict[str, Any],
+        agent_name: str,
+        class_name: str,
+    ) -> None:
+        """Store a validated spec and evict old entries if over the size limit."""
+        try:
+            payload = json.dumps(
+                {"spec": spec_data, "agent_name": agent_name, "class_name": class_name}
+            )
+            # Specs that JSON cannot represent exactly (dates, non-string
+            # keys) are not cached rather than returned altered
+            if json.loads(payload)["spec"] != spec_data:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            estimate = self._size_estimate()
+            path = self._entry_path(self.key(content))
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_name, path)
+            estimate += len(payload.encode()) - replaced
+            _size_estimates[self.directory] = estimate
+            if estimate > self.max_bytes:
+                self.evict()
+        except (OSError, TypeError, ValueError) as err:
+            log.debug(f"Could not write spec cache entry: {err}")
+
+    def _scan(self) -> Tuple[List[Tuple[int, int, Path]], int]:
+        """Return ``(mtime_ns, size, path)`` for every entry and their total size."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        return entries, total
+
+    def _size_estimate(self) -> int:
+        """Return the estimated cache size, scanning the directory on first use.
+
+        Writes from other processes are only seen at the next scan, which
+        happens whenever the estimate goes over ``max_bytes``.
+        """
+        if self.directory not in _size_estimates:
+            _size_estimates[self.directory] = self._scan()[1]
+        return _size_estimates[self.directory]
+
+    def evict(self) -> None:
+        """Delete least recently used entries until within ``max_bytes``."""
+        entries, total = self._scan()
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                continue
+        _size_estimates[self.directory] = total
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        _size_estimates.pop(self.directory, None)
+        for path in self.directory.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+
+
+def load_validated_spec(
+    spec_path: Union[str, Path],
+    use_cache: bool = True,
+    timer: PhaseTimer = NULL_TIMER,
+    validate: Optional[Callable[[Dict[str, Any]], CacheHit]] = None,
+) -> CacheHit:
+    """Parse and validate a single-document spec file, using the cache if enabled.
+
+    ``validate`` takes the parsed spec and returns it with the agent and class
+    names; by default ``validate_with_json_schema`` and ``validate_spec`` are
+    run. Reading and parsing are timed as the ``load`` phase and cache lookups
+    as the ``cache`` phase.
+
+    Raises the same errors as parsing the file followed by ``validate``.
+    """
+    from .spec_loader import is_json_spec, parse_spec
+    from .validators import validate_spec, validate_with_json_schema
+
+    with timer.phase("load"):
+        content = Path(spec_path).read_bytes()
+    cache = SpecCache() if use_cache else None
+    if cache is not None:
+        with timer.phase("cache"):
+            hit = cache.get(content)
+        if hit is not None:
+            log.debug(f"Using cached result for unchanged spec {spec_path}")
+            return hit
+
+    # Parse under the limits the cache key was built from
+    limits = cache.limits if cache is not None else LoadLimits.from_env()
+    with timer.phase("load"):
+        spec_data = parse_spec(content, is_json_spec(spec_path), limits)
+    if validate is None:
+        validate_with_json_schema(spec_data)
+        agent_name, class_name = validate_spec(spec_data)
+        result = (spec_data, agent_name, class_name)
+    else:
+        result = validate(spec_data)
+    if cache is not None:
+        with timer.phase("cache"):
+            cache.put(content, *result)
+    return result
+
+
+def iter_validated_specs(
+    spec_path: Union[str, Path], use_cache: bool = True, all_errors: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """Parse and validate every spec in a file, which may be a YAML bundle.
+
+    Yields one dict per document with its ``document`` index (None for a
+    single-document file) and either ``spec``, ``agent_name`` and
+    ``class_name`` or an ``error`` message, so one invalid agent in a bundle
+    does not hide the others. With ``all_errors`` both validation passes
+    report every problem, listed under ``errors``. Parse errors are raised.
+
+    Files up to ``STREAM_THRESHOLD_BYTES`` are read into memory, and
+    single-document ones go through the cache; larger files are parsed as a
+    stream, one document at a time.
+    """
+    from .spec_loader import is_json_spec, iter_spec_documents
+    from .validators import (
+        SpecValidationError,
+        validate_all,
+        validate_spec,
+        validate_with_json_schema,
+    )
+
+    json_format = is_json_spec(spec_path)
+    content: Optional[bytes] = None
+    cache = None
+    if os.path.getsize(spec_path) <= STREAM_THRESHOLD_BYTES:
+        # Parsing from memory lets the loader use libyaml's composer
+        content = Path(spec_path).read_bytes()
+        cache = SpecCache() if use_cache else None
+        hit = cache.get(content) if cache is not None else None
+        if hit is not None:
+            spec_data, agent_name, class_name = hit
+            yield {
+                "document": None,
+                "spec": spec_data,
+                "agent_name": agent_name,
+                "class_name": class_name,
+            }
+            return
+
+    documents = iter_spec_documents(
+        content if content is not None else spec_path, json_format
+    )
+    first = next(documents, None)
+    if first is None:
+        raise ValueError("Spec file contains no documents")
+    second = next(documents, None)
+    is_bundle = second is not None
+
+    def rest() -> Iterator[Any]:
+        yield first
+        if is_bundle:
+            yield second
+            yield from documents
+
+    for index, spec_data in enumerate(rest()):
+        entry: Dict[str, Any] = {"document": index if is_bundle else None}
+        try:
+            if all_errors:
+                agent_name, class_name = validate_all(spec_data)
+            else:
+                validate_with_json_schema(spec_data)
+                agent_name, class_name = validate_spec(spec_data)
+        except (KeyError, ValueError, AttributeError, TypeError) as err:
+            entry["error"] = str(err)
+            if all_errors and isinstance(err, SpecValidationError):
+                entry["errors"] = err.errors
+            yield entry
+            continue
+        entry.update(spec=spec_data, agent_name=agent_name, class_name=class_name)
+        if cache is not None and content is not None and not is_bundle:
+            cache.put(content, spec_data, agent_name, class_name)
+        yield entry
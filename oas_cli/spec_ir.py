@@ -0,0 +1,246 @@
+"""Normalized intermediate representation of a spec for code generation.
+
+``SpecIR`` derives, once per spec, everything the generators need besides
+the raw sections: agent and intelligence settings, the memory and client
+configuration, and for each task its Python names, parameters, output schema
+and, for multi-step tasks, the parsed step arguments and which earlier steps
+each step reads. The spec is normalized first (see ``spec_normalizer``), so
+``SpecIR.data`` is always in canonical form. Building the IR is linear in the
+size of the spec; generators then read attributes instead of re-deriving the
+same values per use.
+
+The classes use ``__slots__`` so that an IR for a spec with thousands of tasks
+stays compact.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .generators import get_memory_config, map_type_to_python
+from .spec_normalizer import CanonicalSpec, normalize_spec
+from .task_graph import step_reference, template_variable
+
+# Parameter appended to every task function's signature
+MEMORY_PARAM = "memory_summary: str = ''"
+
+# Kinds of step arguments, see ``StepIR.arguments``
+INPUT_ARG = "input"
+STEP_ARG = "step"
+LITERAL_ARG = "literal"
+MISSING_ARG = "missing"
+
+
+class ParamIR:
+    """A task function parameter and its Python type annotation."""
+
+    __slots__ = ("name", "type")
+
+    def __init__(self, name: str, type: str):
+        self.name = name
+        self.type = type
+
+    def signature(self) -> str:
+        return f"{self.name}: {self.type}"
+
+
+class StepIR:
+    """One step of a multi-step task.
+
+    ``arguments`` lists ``(param, kind, value)`` for each entry of the step's
+    ``input_map`` that produces an argument:
+
+    - ``INPUT_ARG``: ``value`` is the name of a task input (``{{name}}`` or
+      ``{{input.name}}``)
+    - ``STEP_ARG``: ``value`` is ``(step_index, field)`` of an earlier step's
+      result (``{{steps.N.field}}``)
+    - ``MISSING_ARG``: a reference to the current or a later step, to a step
+      that is not an index, or without a field; passed as an empty string
+    - ``LITERAL_ARG``: ``value`` is the literal from the spec
+
+    Other dotted references are skipped. ``reads`` holds the indexes of the
+    earlier steps whose results the step uses, parsed by
+    ``task_graph.step_reference`` as in ``TaskGraph.step_dependencies``.
+    """
+
+    __slots__ = ("index", "task", "func_name", "arguments", "reads")
+
+    def __init__(self, index: int, step: Dict[str, Any]):
+        self.index = index
+        self.task: str = step["task"]
+        self.func_name = self.task.replace("-", "_")
+        self.arguments: List[Tuple[str, str, Any]] = []
+        reads = set()
+        for param, value in step.get("input_map", {}).items():
+            variable = template_variable(value)
+            if variable is None:
+                self.arguments.append((param, LITERAL_ARG, value))
+                continue
+            if "." not in variable:
+                self.arguments.append((param, INPUT_ARG, variable))
+                continue
+            parts = variable.split(".")
+            if parts[0] == "input":
+                self.arguments.append((param, INPUT_ARG, parts[-1]))
+            elif parts[0] == "steps" and len(parts) >= 3:
+                reference = step_reference(index, variable)
+                if reference is not None:
+                    self.arguments.append((param, STEP_ARG, reference))
+                    reads.add(reference[0])
+                else:
+                    self.arguments.append((param, MISSING_ARG, None))
+        self.reads = sorted(reads)
+
+    def input_names(self) -> List[str]:
+        """Return the task inputs this step's arguments are taken from."""
+        return [value for _, kind, value in self.arguments if kind == INPUT_ARG]
+
+
+class TaskIR:
+    """A task's generated names, parameters, output schema and steps.
+
+    ``waves`` groups the steps of a multi-step task by data dependency: each
+    step is in the wave after the latest step whose result it reads, so the
+    steps of a wave do not depend on each other and may run concurrently.
+    Steps keep their spec order within a wave.
+    """
+
+    __slots__ = (
+        "name",
+        "definition",
+        "func_name",
+        "model_name",
+        "parser_name",
+        "params",
+        "input_params",
+        "output",
+        "multi_step",
+        "steps",
+        "waves",
+    )
+
+    def __init__(self, name: str, definition: Dict[str, Any]):
+        self.name = name
+        self.definition = definition
+        self.func_name = name.replace("-", "_")
+        self.model_name = f"{self.func_name.title()}Output"
+        self.parser_name = f"parse_{self.func_name}_output"
+        self.output: Dict[str, Any] = definition.get("output", {})
+        self.multi_step = bool(definition.get("multi_step", False))
+        self.steps: List[StepIR] = []
+        self.waves: List[List[StepIR]] = []
+
+        if self.multi_step:
+            # Parameters are the task inputs referenced by the steps
+            self.steps = [
+                StepIR(i, step) for i, step in enumerate(definition.get("steps", []))
+            ]
+            wave_of: Dict[int, int] = {}
+            for step in self.steps:
+                wave = 1 + max((wave_of[i] for i in step.reads), default=-1)
+                wave_of[step.index] = wave
+                if wave == len(self.waves):
+                    self.waves.append([])
+                self.waves[wave].append(step)
+            names = {arg for step in self.steps for arg in step.input_names()}
+            self.params = [ParamIR(arg, "str") for arg in sorted(names)]
+        else:
+            properties = definition.get("input", {}).get("properties", {})
+            self.params = [
+                ParamIR(name, map_type_to_python(param.get("type", "string")))
+                for name, param in properties.items()
+            ]
+        # Full signature entries, ending with the memory parameter
+        self.input_params = [param.signature() for param in self.params]
+        self.input_params.append(MEMORY_PARAM)
+
+    @property
+    def param_names(self) -> List[str]:
+        return [param.name for param in self.params]
+
+    @property
+    def renders_prompt(self) -> bool:
+        """Whether the task function renders a prompt template (LLM tasks)."""
+        return not self.multi_step and "tool" not in self.definition
+
+
+class AgentIR:
+    """The agent's name, description and role."""
+
+    __slots__ = ("name", "description", "role")
+
+    def __init__(self, spec_data: CanonicalSpec):
+        agent = spec_data["agent"]
+        self.name: str = agent.get("name", "")
+        self.description: str = agent.get("description", "")
+        self.role: Optional[str] = agent.get("role")
+
+
+class IntelligenceIR:
+    """The ``intelligence`` section with the generator's defaults applied."""
+
+    __slots__ = ("engine", "model", "endpoint", "module", "config", "is_async")
+
+    def __init__(self, spec_data: Dict[str, Any]):
+        intelligence = spec_data.get("intelligence", {})
+        self.engine: str = intelligence.get("engine", "openai")
+        self.model: Optional[str] = intelligence.get("model")
+        self.endpoint: Optional[str] = intelligence.get("endpoint")
+        self.module: Optional[str] = intelligence.get("module")
+        self.config: Dict[str, Any] = intelligence.get("config", {})
+        # Generate async task functions with synchronous wrappers
+        self.is_async = bool(intelligence.get("async", False))
+
+    @property
+    def custom_router(self) -> Optional[str]:
+        """The custom router module, if the ``custom`` engine uses one."""
+        if self.engine == "custom" and self.module:
+            return self.module
+        return None
+
+
+class SpecIR:
+    """Everything derived from a spec that code generation reuses."""
+
+    __slots__ = (
+        "data",
+        "agent",
+        "intelligence",
+        "memory",
+        "config",
+        "tasks",
+        "uses_tools",
+        "has_concurrent_steps",
+    )
+
+    def __init__(self, spec_data: Dict[str, Any]):
+        spec_data = normalize_spec(spec_data)
+        self.data: CanonicalSpec = spec_data
+        self.agent = AgentIR(spec_data)
+        self.intelligence = IntelligenceIR(spec_data)
+        self.memory = get_memory_config(spec_data)
+        # Client settings used by generated task functions
+        intelligence = spec_data.get("intelligence", {})
+        self.config: Dict[str, Any] = {
+            "endpoint": intelligence.get("endpoint", "https://api.openai.com/v1"),
+            "model": intelligence.get("model", "gpt-3.5-turbo"),
+            "temperature": intelligence.get("config", {}).get("temperature", 0.7),
+            "max_tokens": intelligence.get("config", {}).get("max_tokens", 1000),
+        }
+        self.tasks: Dict[str, TaskIR] = {
+            name: TaskIR(name, definition)
+            for name, definition in spec_data.get("tasks", {}).items()
+        }
+        self.uses_tools = any(
+            task.definition.get("tool") for task in self.tasks.values()
+        )
+        # Whether a multi-step task runs independent steps concurrently
+        self.has_concurrent_steps = any(
+            len(wave) > 1 for task in self.tasks.values() for wave in task.waves
+        )
+
+    def example_task(self) -> Optional[TaskIR]:
+        """Return the task shown in generated examples: the first multi-step
+        task, else the first task."""
+        for task in self.tasks.values():
+            if task.multi_step:
+                return task
+        return next(iter(self.tasks.values()), None)
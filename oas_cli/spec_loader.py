@@ -0,0 +1,421 @@
+"""Parsing of spec files: YAML (single documents and bundles) and JSON.
+
+YAML is loaded in two steps. The document is first composed into a node
+graph, which is checked against ``LoadLimits``: total node count with aliases
+expanded, number of alias expansions and nesting depth. Only then are Python
+objects constructed. A "billion laughs" document, whose aliases expand to an
+enormous tree, is therefore rejected before anything walks the expanded data.
+File size is checked before parsing starts.
+
+libyaml composes node graphs recursively in C, and tens of thousands of
+nested collections overflow the C stack and crash the interpreter. It is only
+used when the content cannot possibly nest that deep; otherwise documents are
+composed by ``_compose_document``, which stops as soon as ``max_depth`` is
+exceeded.
+
+JSON has no aliases; parsed JSON is checked against the same node count and
+depth limits, and input too deep for the JSON parser itself fails with
+``SpecLimitError`` like YAML does.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import yaml
+from yaml.composer import ComposerError
+from yaml.events import (
+    AliasEvent,
+    DocumentStartEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+# libyaml's C loader is several times faster than the pure-Python one; PyYAML
+# builds without libyaml only provide the latter
+try:
+    from yaml import CSafeLoader as SafeLoader
+
+    HAS_LIBYAML = True
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+    HAS_LIBYAML = False
+
+JSON_SUFFIXES = (".json",)
+
+# Nesting the C composer handles without coming close to the stack limit
+C_COMPOSER_MAX_NESTING = 5000
+
+# Every YAML collection is opened by one of these characters
+_COLLECTION_INDICATORS = ("[", "{", "-", ":", "?")
+
+
+class SpecLimitError(yaml.YAMLError):
+    """Raised when a spec file exceeds one of the configured load limits."""
+
+
+class LoadLimits:
+    """Upper bounds applied while loading a spec file.
+
+    Each limit can be overridden through an environment variable:
+    ``OAS_YAML_MAX_BYTES``, ``OAS_YAML_MAX_NODES``, ``OAS_YAML_MAX_ALIASES``
+    and ``OAS_YAML_MAX_DEPTH``. ``max_nodes`` counts every node of a document
+    as if all aliases were expanded in place; ``max_depth`` is the number of
+    collections that may be nested in one another.
+    """
+
+    ENV_VARS = {
+        "max_bytes": "OAS_YAML_MAX_BYTES",
+        "max_nodes": "OAS_YAML_MAX_NODES",
+        "max_aliases": "OAS_YAML_MAX_ALIASES",
+        "max_depth": "OAS_YAML_MAX_DEPTH",
+    }
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_nodes: int = 1_000_000,
+        max_aliases: int = 10_000,
+        max_depth: int = 100,
+    ):
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.max_aliases = max_aliases
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_env(cls) -> "LoadLimits":
+        """Return the default limits with any environment overrides applied."""
+        overrides: Dict[str, int] = {}
+        for name, env_var in cls.ENV_VARS.items():
+            value = os.environ.get(env_var)
+            if value:
+                overrides[name] = int(value)
+        return cls(**overrides)
+
+
+def _limit_error(limit: str, message: str) -> SpecLimitError:
+    return SpecLimitError(
+        f"{message} (set {LoadLimits.ENV_VARS[limit]} to raise the limit)"
+    )
+
+
+def is_json_spec(spec_path: Union[str, Path]) -> bool:
+    """Whether a spec file should be read with the JSON parser."""
+    return Path(spec_path).suffix.lower() in JSON_SUFFIXES
+
+
+def check_size(size: int, limits: LoadLimits) -> None:
+    """Fail if a spec of ``size`` bytes is over the file size limit."""
+    if size > limits.max_bytes:
+        raise _limit_error(
+            "max_bytes",
+            f"Spec file is {size} bytes, over the limit of {limits.max_bytes} bytes",
+        )
+
+
+def check_node_graph(node: yaml.Node, limits: LoadLimits) -> None:
+    """Check a composed YAML document against ``limits`` before construction.
+
+    Each distinct collection is visited once; the expanded size and height of
+    aliased collections are memoised, so the check stays linear in the size of
+    the file even when its aliases would expand exponentially. Aliases of
+    scalars are not counted, as expanding one costs no more than the alias.
+    """
+    sizes: Dict[int, int] = {}
+    heights: Dict[int, int] = {}
+    active = set()
+    aliases = 0
+    max_depth = limits.max_depth
+
+    def visit(node: yaml.Node, depth: int) -> int:
+        nonlocal aliases
+        key = id(node)
+        if key in sizes:
+            # The same collection reached again is an alias being expanded
+            aliases += 1
+            if aliases > limits.max_aliases:
+                raise _limit_error(
+                    "max_aliases",
+                    f"Spec expands more than {limits.max_aliases} aliases",
+                )
+            if depth + heights[key] >= max_depth:
+                raise _limit_error(
+                    "max_depth", f"Spec nests deeper than {max_depth} levels"
+                )
+            return sizes[key]
+        if key in active:
+            raise SpecLimitError("Spec contains a recursive alias")
+        if depth >= max_depth:
+            raise _limit_error(
+                "max_depth", f"Spec nests deeper than {max_depth} levels"
+            )
+
+        if node.__class__ is MappingNode:
+            children = [child for pair in node.value for child in pair]
+        else:
+            children = node.value
+
+        active.add(key)
+        size = 1
+        height = 0
+        for child in children:
+            # Most nodes are scalars; skip the call and the memo for them
+            if child.__class__ is ScalarNode:
+                size += 1
+                continue
+            size += visit(child, depth + 1)
+            height = max(height, heights[id(child)] + 1)
+        active.discard(key)
+
+        if size > limits.max_nodes:
+            raise _limit_error(
+                "max_nodes", f"Spec expands to more than {limits.max_nodes} nodes"
+            )
+        sizes[key] = size
+        heights[key] = height
+        return size
+
+    if node.__class__ is not ScalarNode:
+        visit(node, 0)
+
+
+def check_json_data(data: Any, limits: LoadLimits) -> None:
+    """Check parsed JSON against the node count and depth limits of ``limits``."""
+    max_depth = limits.max_depth
+    stack = [(data, 0)]
+    count = 0
+    while stack:
+        value, depth = stack.pop()
+        count += 1
+        if count > limits.max_nodes:
+            raise _limit_error(
+                "max_nodes", f"Spec expands to more than {limits.max_nodes} nodes"
+            )
+        if isinstance(value, dict):
+            children: Any = value.values()
+        elif isinstance(value, list):
+            children = value
+        else:
+            continue
+        if depth >= max_depth:
+            raise _limit_error(
+                "max_depth", f"Spec nests deeper than {max_depth} levels"
+            )
+        stack.extend((child, depth + 1) for child in children)
+
+
+def _load_json(source: Union[IO[bytes], bytes, str], limits: LoadLimits) -> Any:
+    try:
+        if isinstance(source, (bytes, str)):
+            data = json.loads(source)
+        else:
+            data = json.load(source)
+    except RecursionError as err:
+        raise SpecLimitError("Spec nests too deeply to parse") from err
+    check_json_data(data, limits)
+    return data
+
+
+def _nesting_bound(content: Union[bytes, str]) -> int:
+    """Return an upper bound on how deep ``content`` can nest collections."""
+    if isinstance(content, bytes):
+        return sum(content.count(c.encode()) for c in _COLLECTION_INDICATORS)
+    return sum(content.count(c) for c in _COLLECTION_INDICATORS)
+
+
+def _compose_document(loader: Any, limits: LoadLimits) -> yaml.Node:
+    """Compose the next document of ``loader`` without recursion.
+
+    Equivalent to ``loader.get_node()``, but builds the node graph from the
+    parser's events with an explicit stack and fails as soon as the document
+    nests deeper than ``limits.max_depth``.
+    """
+    get_event = loader.get_event
+    resolve = loader.resolve
+    anchors: Dict[str, yaml.Node] = {}
+    open_nodes = set()
+    # (collection, pending mapping key) of every enclosing collection
+    stack: List[Tuple[Any, Optional[yaml.Node]]] = []
+    parent: Any = None
+    key: Optional[yaml.Node] = None
+    node: Any = None
+    tag: str
+
+    while True:
+        event = get_event()
+        if isinstance(event, DocumentStartEvent):
+            continue
+        # libyaml's parser gives C marks, which the node stubs do not accept
+        start_mark: Any = event.start_mark
+        end_mark: Any = event.end_mark
+        if isinstance(event, AliasEvent):
+            if event.anchor not in anchors:
+                raise ComposerError(
+                    None,
+                    None,
+                    f"found undefined alias {event.anchor!r}",
+                    start_mark,
+                )
+            node = anchors[event.anchor]
+            if id(node) in open_nodes:
+                raise SpecLimitError("Spec contains a recursive alias")
+        elif isinstance(event, (ScalarEvent, SequenceStartEvent, MappingStartEvent)):
+            if event.anchor is not None and event.anchor in anchors:
+                raise ComposerError(
+                    f"found duplicate anchor {event.anchor!r}; first occurrence",
+                    anchors[event.anchor].start_mark,
+                    "second occurrence",
+                    start_mark,
+                )
+            if isinstance(event, ScalarEvent):
+                if event.tag is None or event.tag == "!":
+                    tag = resolve(ScalarNode, event.value, event.implicit)
+                else:
+                    tag = event.tag
+                node = ScalarNode(tag, event.value, start_mark, end_mark, event.style)
+            else:
+                node_class = (
+                    SequenceNode
+                    if isinstance(event, SequenceStartEvent)
+                    else MappingNode
+                )
+                if event.tag is None or event.tag == "!":
+                    tag = resolve(node_class, None, event.implicit)
+                else:
+                    tag = event.tag
+                node = node_class(tag, [], start_mark, None, event.flow_style)
+            if event.anchor is not None:
+                anchors[event.anchor] = node
+            if not isinstance(event, ScalarEvent):
+                if len(stack) >= limits.max_depth:
+                    raise _limit_error(
+                        "max_depth",
+                        f"Spec nests deeper than {limits.max_depth} levels",
+                    )
+                stack.append((parent, key))
+                open_nodes.add(id(node))
+                parent, key = node, None
+                continue
+        elif parent is not None:
+            # The end of the innermost open collection
+            parent.end_mark = end_mark
+            open_nodes.discard(id(parent))
+            node = parent
+            parent, key = stack.pop()
+        else:
+            # DOCUMENT-END: the root node is complete
+            return node
+
+        if parent is None:
+            continue
+        if isinstance(parent, SequenceNode):
+            parent.value.append(node)
+        elif key is None:
+            key = node
+        else:
+            parent.value.append((key, node))
+            key = None
+
+
+def _iter_nodes(
+    loader: Any, limits: LoadLimits, use_c_composer: bool
+) -> Iterator[yaml.Node]:
+    if use_c_composer:
+        while loader.check_node():
+            yield loader.get_node()
+        return
+    # Drop the STREAM-START event
+    loader.get_event()
+    while not loader.check_event(StreamEndEvent):
+        yield _compose_document(loader, limits)
+
+
+def _iter_yaml(
+    source: Union[IO[bytes], bytes, str], limits: LoadLimits, single: bool
+) -> Iterator[Any]:
+    # Streams cannot be inspected up front, so they never use the C composer
+    use_c_composer = (
+        HAS_LIBYAML
+        and isinstance(source, (bytes, str))
+        and _nesting_bound(source) <= C_COMPOSER_MAX_NESTING
+    )
+    loader = SafeLoader(source)
+    try:
+        first = None
+        for node in _iter_nodes(loader, limits, use_c_composer):
+            if single and first is not None:
+                raise ComposerError(
+                    "expected a single document in the stream",
+                    first.start_mark,
+                    "but found another document",
+                    node.start_mark,
+                )
+            first = node
+            check_node_graph(node, limits)
+            yield loader.construct_document(node)
+    except RecursionError as err:
+        raise SpecLimitError("Spec nests too deeply to parse") from err
+    finally:
+        loader.dispose()
+
+
+def parse_spec(
+    content: Union[bytes, str],
+    json_format: bool = False,
+    limits: Optional[LoadLimits] = None,
+) -> Any:
+    """Parse a single spec document from YAML or JSON text.
+
+    Raises ``SpecLimitError`` if the content exceeds ``limits`` (the
+    environment-configured defaults if not given), and ``yaml.YAMLError`` (or
+    ``ValueError`` for JSON) on malformed input, including YAML input holding
+    more than one document.
+    """
+    limits = limits or LoadLimits.from_env()
+    check_size(len(content), limits)
+    if json_format:
+        return _load_json(content, limits)
+    # Exhaust the stream so that a second document is reported as an error
+    documents = list(_iter_yaml(content, limits, single=True))
+    return documents[0] if documents else None
+
+
+def _iter_stream(
+    stream: Union[IO[bytes], bytes], json_format: bool, limits: LoadLimits
+) -> Iterator[Any]:
+    if json_format:
+        yield _load_json(stream, limits)
+        return
+    for document in _iter_yaml(stream, limits, single=False):
+        # Tolerate empty documents, e.g. a leading or trailing ``---``
+        if document is not None:
+            yield document
+
+
+def iter_spec_documents(
+    source: Union[str, Path, bytes],
+    json_format: bool = False,
+    limits: Optional[LoadLimits] = None,
+) -> Iterator[Any]:
+    """Yield every document of a spec file or of already-read file content.
+
+    YAML bundles hold one spec per document, separated by ``---``. Given a
+    path, the file is parsed as a stream, so only one document is held in
+    memory at a time. JSON files always hold a single spec. Every document is
+    checked against ``limits``.
+    """
+    limits = limits or LoadLimits.from_env()
+    if isinstance(source, bytes):
+        check_size(len(source), limits)
+        yield from _iter_stream(source, json_format, limits)
+        return
+    check_size(os.path.getsize(source), limits)
+    json_format = json_format or is_json_spec(source)
+    with open(source, "rb") as f:
+        yield from _iter_stream(f, json_format, limits)
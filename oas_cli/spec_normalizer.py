@@ -0,0 +1,123 @@
+"""Conversion of every supported spec format into one canonical form.
+
+Older specs describe the agent under ``info`` instead of ``agent`` and give a
+single ``prompt.template`` instead of ``prompts``. ``normalize_spec`` converts
+a spec once into the canonical form, which the generators read without any
+format checks:
+
+- ``agent`` is always present; its name and description are taken from
+  ``info`` when ``agent`` is missing or empty, and ``info`` is dropped
+- ``prompts`` is always a dictionary. A full prompt template that is used
+  verbatim for every task, either the legacy ``prompt.template`` or the
+  default template when a spec has no prompts, is stored as the string
+  ``prompts["template"]``; ``prompt`` is dropped
+
+Specs already in canonical form are only wrapped in a ``CanonicalSpec``.
+Converted specs are memoized by the hash of their content, so every caller
+normalizing the same legacy spec gets the same ``CanonicalSpec``. Its
+``spec_hash`` is a stable key for caches of anything derived from the spec.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .utils import stable_hash
+
+# Key of ``prompts`` holding a template used verbatim for every task
+PROMPT_TEMPLATE_KEY = "template"
+
+# Number of converted legacy specs kept in memory
+MAX_MEMOIZED_SPECS = 64
+
+_converted: "OrderedDict[str, CanonicalSpec]" = OrderedDict()
+_converted_lock = threading.Lock()
+
+
+class CanonicalSpec(dict):
+    """A spec in canonical form; see the module docstring.
+
+    Canonical specs are shared between callers and must not be modified.
+    """
+
+    __slots__ = ("_spec_hash",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._spec_hash: Optional[str] = None
+
+    @property
+    def spec_hash(self) -> str:
+        """Hash of the canonical content, computed on first use."""
+        if self._spec_hash is None:
+            self._spec_hash = stable_hash(self)
+        return self._spec_hash
+
+
+def is_canonical(spec_data: Dict[str, Any]) -> bool:
+    """Whether a spec needs no conversion."""
+    return (
+        bool(spec_data.get("agent"))
+        and isinstance(spec_data.get("prompts"), dict)
+        and "info" not in spec_data
+        and "prompt" not in spec_data
+    )
+
+
+def _convert(spec_data: Dict[str, Any]) -> CanonicalSpec:
+    from .generators import DEFAULT_PROMPT_TEMPLATE  # Avoid a circular import
+
+    # Memoized specs are shared, so they must not alias the caller's data
+    spec = CanonicalSpec(copy.deepcopy(spec_data))
+    info = spec.pop("info", None)
+    if not spec.get("agent"):
+        # Only the name and description were ever read from ``info``
+        info = info if isinstance(info, dict) else {}
+        spec["agent"] = {
+            key: info[key] for key in ("name", "description") if key in info
+        }
+
+    prompt = spec.pop("prompt", None)
+    prompts = spec.get("prompts")
+    if isinstance(prompt, dict) and PROMPT_TEMPLATE_KEY in prompt:
+        # The legacy template takes precedence over any prompts
+        prompts = {**(prompts or {}), PROMPT_TEMPLATE_KEY: prompt[PROMPT_TEMPLATE_KEY]}
+    elif prompts is None:
+        prompts = {PROMPT_TEMPLATE_KEY: DEFAULT_PROMPT_TEMPLATE}
+    spec["prompts"] = prompts
+    return spec
+
+
+def normalize_spec(spec_data: Dict[str, Any]) -> CanonicalSpec:
+    """Return the canonical form of a spec in any supported format.
+
+    Normalizing a ``CanonicalSpec`` returns it unchanged, so functions that
+    accept raw specs can normalize them without cost when given canonical
+    ones. A spec that is already canonical shares its sections with
+    ``spec_data``; converted specs are deep copies.
+    """
+    if isinstance(spec_data, CanonicalSpec):
+        return spec_data
+    if is_canonical(spec_data):
+        return CanonicalSpec(spec_data)
+
+    key = stable_hash(spec_data)
+    with _converted_lock:
+        spec = _converted.get(key)
+        if spec is not None:
+            _converted.move_to_end(key)
+            return spec
+
+    spec = _convert(spec_data)
+    with _converted_lock:
+        spec = _converted.setdefault(key, spec)
+        while len(_converted) > MAX_MEMOIZED_SPECS:
+            _converted.popitem(last=False)
+    return spec
+
+
+def clear_normalized_specs() -> None:
+    """Forget the memoized conversions of legacy specs."""
+    with _converted_lock:
+        _converted.clear()
@@ -0,0 +1,66 @@
+"""Registry of the spec templates bundled with the CLI."""
+
+import copy
+import threading
+from importlib.resources import files
+from typing import Any, Dict, List
+
+from .spec_loader import parse_spec
+
+# Short names kept for backwards compatibility with ``--template minimal``
+TEMPLATE_ALIASES = {"minimal": "minimal-agent"}
+
+
+class SpecTemplateRegistry:
+    """Read bundled spec templates straight from package resources.
+
+    Templates are the ``*.yaml`` files in ``oas_cli.templates`` and are named
+    after their file stem. Each one is parsed at most once per process; callers
+    receive a deep copy so that the cached spec is never modified.
+    """
+
+    def __init__(self, package: str = "oas_cli.templates"):
+        self.package = package
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        """Return the names of all bundled templates, sorted."""
+        return sorted(
+            entry.name[: -len(".yaml")]
+            for entry in files(self.package).iterdir()
+            if entry.name.endswith(".yaml")
+        )
+
+    def resolve(self, name: str) -> str:
+        """Return the canonical template name for ``name`` or an alias of it."""
+        resolved = TEMPLATE_ALIASES.get(name, name)
+        if resolved not in self.names():
+            raise KeyError(
+                f"Unknown template '{name}'. Available templates: "
+                + ", ".join(self.names())
+            )
+        return resolved
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """Return the parsed spec for a template, loading it on first use."""
+        name = self.resolve(name)
+        with self._lock:
+            spec = self._specs.get(name)
+            if spec is None:
+                content = files(self.package).joinpath(f"{name}.yaml").read_text()
+                spec = parse_spec(content)
+                self._specs[name] = spec
+        return copy.deepcopy(spec)
+
+    def aliases_for(self, name: str) -> List[str]:
+        """Return the aliases that resolve to a template."""
+        return [alias for alias, target in TEMPLATE_ALIASES.items() if target == name]
+
+    def clear(self) -> None:
+        """Forget all parsed templates."""
+        with self._lock:
+            self._specs.clear()
+
+
+spec_templates = SpecTemplateRegistry()
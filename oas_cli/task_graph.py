@@ -0,0 +1,250 @@
+"""Dependency graph of an agent's tasks.
+
+A multi-step task depends on the tasks its steps run, and each step may
+depend on earlier steps of the same task through ``{{steps.N.field}}``
+references in its ``input_map``. ``TaskGraph`` checks both levels (no task may
+reach itself through its steps, and step references must point at earlier
+steps) and estimates how many LLM calls each multi-step task makes.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Worst-case LLM calls of a single task: a tool task asks the model for a tool
+# request and then for a final answer using the tool's result
+TASK_LLM_CALLS = 1
+TOOL_TASK_LLM_CALLS = 2
+
+
+def template_variable(value: Any) -> Optional[str]:
+    """Return the variable of an ``input_map`` value such as ``{{input.name}}``.
+
+    Mirrors how the code generator reads these values; plain literals return
+    None.
+    """
+    if isinstance(value, str) and "{{" in value and "}}" in value:
+        return value.replace("{{", "").replace("}}", "").strip()
+    return None
+
+
+def step_reference(
+    step_index: int, variable: Optional[str]
+) -> Optional[Tuple[int, str]]:
+    """Return ``(N, field)`` if ``variable`` is a valid ``steps.N.field`` reference.
+
+    ``step_index`` is the index of the step making the reference, which may
+    only read earlier steps. Other variables and invalid step references give
+    None. The validator, the LLM cost estimate and the code generator all
+    read step dependencies through this function.
+    """
+    if variable is None or TaskGraph._check_reference(step_index, variable):
+        return None
+    parts = variable.split(".")
+    if parts[0] != "steps":
+        return None
+    return int(parts[1]), parts[2]
+
+
+class TaskGraph:
+    """The tasks of a spec and the steps of its multi-step tasks.
+
+    Only well-formed parts of the ``tasks`` section are considered: steps
+    that are not dictionaries or that name unknown tasks are reported by the
+    semantic validator and skipped here.
+    """
+
+    def __init__(self, tasks: Dict[str, Any]):
+        self.tasks = tasks
+        # Multi-step task -> (step index, step task) for every resolvable step
+        self.steps: Dict[str, List[Tuple[int, str]]] = {}
+        for name, task_def in tasks.items():
+            if not isinstance(task_def, dict) or not task_def.get("multi_step"):
+                continue
+            steps = task_def.get("steps")
+            self.steps[name] = [
+                (i, step["task"])
+                for i, step in enumerate(steps if isinstance(steps, list) else [])
+                if isinstance(step, dict)
+                and isinstance(step.get("task"), str)
+                and step["task"] in tasks
+            ]
+
+    def errors(self) -> List[Dict[str, str]]:
+        """Return every cycle and invalid step reference as path/message dicts."""
+        return self._cycle_errors() + self._reference_errors()
+
+    def _cycle_errors(self) -> List[Dict[str, str]]:
+        errors = []
+        seen_cycles: Set[frozenset] = set()
+        for name, steps in self.steps.items():
+            for i, step_task in steps:
+                if step_task == name:
+                    errors.append(
+                        {
+                            "path": f"tasks.{name}.steps[{i}].task",
+                            "message": f"multi-step task {name} references itself "
+                            f"in step {i}",
+                        }
+                    )
+        for cycle in self._find_cycles():
+            if len(cycle) == 1 or frozenset(cycle) in seen_cycles:
+                continue
+            seen_cycles.add(frozenset(cycle))
+            start, following = cycle[0], cycle[1 % len(cycle)]
+            index = next(i for i, task in self.steps[start] if task == following)
+            errors.append(
+                {
+                    "path": f"tasks.{start}.steps[{index}].task",
+                    "message": "multi-step tasks form a cycle: "
+                    + " -> ".join(cycle + [start]),
+                }
+            )
+        return errors
+
+    def _find_cycles(self) -> List[List[str]]:
+        """Return one cycle per back edge found by a depth-first search."""
+        cycles = []
+        # 0: unvisited, 1: on the current path, 2: finished
+        state: Dict[str, int] = {}
+        for root in self.steps:
+            if state.get(root):
+                continue
+            path = [root]
+            state[root] = 1
+            pending = [iter(self.steps[root])]
+            while pending:
+                step = next(pending[-1], None)
+                if step is None:
+                    state[path.pop()] = 2
+                    pending.pop()
+                    continue
+                child = step[1]
+                if child not in self.steps or state.get(child) == 2:
+                    continue
+                if state.get(child) == 1:
+                    cycles.append(path[path.index(child) :])
+                    continue
+                state[child] = 1
+                path.append(child)
+                pending.append(iter(self.steps[child]))
+        return cycles
+
+    def _reference_errors(self) -> List[Dict[str, str]]:
+        errors = []
+        for name in self.steps:
+            for i, step in enumerate(self.tasks[name].get("steps") or []):
+                if not isinstance(step, dict):
+                    continue
+                input_map = step.get("input_map")
+                if not isinstance(input_map, dict):
+                    continue
+                for param, value in input_map.items():
+                    problem = self._check_reference(i, template_variable(value))
+                    if problem:
+                        errors.append(
+                            {
+                                "path": f"tasks.{name}.steps[{i}].input_map.{param}",
+                                "message": f"step {i} in task {name}.input_map.{param} "
+                                f"{problem}",
+                            }
+                        )
+        return errors
+
+    @staticmethod
+    def _check_reference(step_index: int, variable: Optional[str]) -> Optional[str]:
+        """Return why a ``steps.*`` reference is invalid, or None if it is fine."""
+        if variable is None or variable.split(".")[0] != "steps":
+            return None
+        parts = variable.split(".")
+        if len(parts) < 3 or not parts[2]:
+            return f"references '{variable}'; expected steps.N.field"
+        if not parts[1].isdigit():
+            return f"references '{variable}'; N in steps.N.field must be a step index"
+        if int(parts[1]) >= step_index:
+            return (
+                f"references '{variable}', but only steps before step "
+                f"{step_index} have results"
+            )
+        return None
+
+    def step_dependencies(self, name: str) -> List[List[int]]:
+        """Return, for each step of a multi-step task, the steps it reads from."""
+        dependencies = []
+        for i, step in enumerate(self.tasks[name].get("steps") or []):
+            input_map = step.get("input_map") if isinstance(step, dict) else None
+            referenced = set()
+            for value in (input_map if isinstance(input_map, dict) else {}).values():
+                reference = step_reference(i, template_variable(value))
+                if reference is not None:
+                    referenced.add(reference[0])
+            dependencies.append(sorted(referenced))
+        return dependencies
+
+    def topological_order(self) -> List[str]:
+        """Return the multi-step tasks ordered so each follows its step tasks.
+
+        Raises:
+            ValueError: If the multi-step tasks form a cycle
+        """
+        order: List[str] = []
+        done: Set[str] = set()
+        for root in self.steps:
+            if root in done:
+                continue
+            stack = [(root, iter(self.steps[root]))]
+            active = {root}
+            while stack:
+                name, children = stack[-1]
+                step = next(children, None)
+                if step is None:
+                    stack.pop()
+                    active.discard(name)
+                    done.add(name)
+                    order.append(name)
+                    continue
+                child = step[1]
+                if child in active:
+                    raise ValueError(f"multi-step task {child} is part of a cycle")
+                if child in self.steps and child not in done:
+                    stack.append((child, iter(self.steps[child])))
+                    active.add(child)
+        return order
+
+    def llm_costs(self) -> Dict[str, Dict[str, int]]:
+        """Return the worst-case LLM calls of every multi-step task.
+
+        ``llm_calls`` counts every call made when the steps run one after the
+        other. ``critical_path`` counts the calls along the longest chain of
+        steps that read each other's results, which bounds latency from below
+        when independent steps run concurrently.
+
+        Raises:
+            ValueError: If the multi-step tasks form a cycle
+        """
+        costs: Dict[str, Dict[str, int]] = {}
+
+        def cost(task: str) -> Tuple[int, int]:
+            if task in costs:
+                return costs[task]["llm_calls"], costs[task]["critical_path"]
+            calls = (
+                TOOL_TASK_LLM_CALLS if self.tasks[task].get("tool") else TASK_LLM_CALLS
+            )
+            return calls, calls
+
+        for name in self.topological_order():
+            steps = dict(self.steps[name])
+            dependencies = self.step_dependencies(name)
+            total = 0
+            finish: Dict[int, int] = {}
+            for i, reads in enumerate(dependencies):
+                if i not in steps:
+                    continue
+                step_total, step_path = cost(steps[i])
+                total += step_total
+                finish[i] = step_path + max(
+                    (finish[j] for j in reads if j in finish), default=0
+                )
+            costs[name] = {
+                "llm_calls": total,
+                "critical_path": max(finish.values(), default=0),
+            }
+        return costs
@@ -0,0 +1,168 @@
+"""Precompile the built-in code generation templates to Python modules.
+
+Parsing and compiling ``agent.py.j2`` and ``task_function.py.j2`` is the
+slowest part of setting up code generation. The wheel build runs this module
+(see ``hatch_build.py``) to compile them with Jinja's ``compile_templates``
+into ``oas_cli/templates/_compiled``, which ``code_generation`` then loads
+through a ``ModuleLoader``. It can also be run by hand, e.g. for an editable
+install::
+
+    python -m oas_cli.template_compiler [--output DIR]
+
+``compile_templates`` also compiles the prompt templates of generated agents
+(see ``prompt_compiler``). Compiled templates are only used while they match
+the installed Jinja version and the template sources next to them; otherwise
+the sources are loaded as usual. This module only depends on Jinja and the
+standard library so that the build hook can load it without the CLI's other
+dependencies.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import jinja2
+from jinja2 import Environment, FileSystemLoader, ModuleLoader
+
+log = logging.getLogger(__name__)
+
+# Options of every code generation environment; they are baked into the
+# compiled modules, so changing them invalidates compiled templates
+ENVIRONMENT_OPTIONS: Dict[str, Any] = {"trim_blocks": True, "lstrip_blocks": True}
+
+TEMPLATE_SUFFIX = ".j2"
+
+# Directory, inside a template directory, holding its compiled templates
+COMPILED_DIR_NAME = "_compiled"
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _source_hashes(template_dir: Path, suffix: str) -> Dict[str, str]:
+    return {
+        path.name: hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in sorted(template_dir.glob(f"*{suffix}"))
+    }
+
+
+def compiled_manifest(
+    template_dir: Union[str, Path],
+    suffix: str = TEMPLATE_SUFFIX,
+    options: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Return the manifest that compiled templates of a directory must match."""
+    return {
+        "jinja2": jinja2.__version__,
+        "options": ENVIRONMENT_OPTIONS if options is None else options,
+        "templates": _source_hashes(Path(template_dir), suffix),
+    }
+
+
+def compile_templates(
+    template_dir: Union[str, Path],
+    target: Optional[Union[str, Path]] = None,
+    suffix: str = TEMPLATE_SUFFIX,
+    options: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Compile the templates of a directory to Python modules.
+
+    Templates ending in ``suffix`` are compiled with an environment using
+    ``options`` (by default ``ENVIRONMENT_OPTIONS``). The modules and a
+    manifest recording the Jinja version, environment options and template
+    source hashes are written to ``target`` (by default
+    ``template_dir/_compiled``), replacing its previous contents.
+
+    Raises:
+        jinja2.TemplateSyntaxError: If a template cannot be compiled
+    """
+    template_dir = Path(template_dir)
+    target = Path(target) if target else template_dir / COMPILED_DIR_NAME
+    options = ENVIRONMENT_OPTIONS if options is None else options
+    env = Environment(loader=FileSystemLoader(str(template_dir)), **options)
+
+    # Compile into a scratch directory so a failure leaves target untouched
+    target.parent.mkdir(parents=True, exist_ok=True)
+    scratch = Path(tempfile.mkdtemp(dir=target.parent, prefix=".compiled-"))
+    try:
+        env.compile_templates(
+            str(scratch),
+            filter_func=lambda name: name.endswith(suffix) and "/" not in name,
+            zip=None,
+            log_function=log.debug,
+            ignore_errors=False,
+        )
+        (scratch / MANIFEST_NAME).write_text(
+            json.dumps(
+                compiled_manifest(template_dir, suffix, options),
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n"
+        )
+        if target.exists():
+            shutil.rmtree(target)
+        scratch.rename(target)
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    return target
+
+
+def compile_builtin_templates(
+    template_dir: Union[str, Path], target: Optional[Union[str, Path]] = None
+) -> Path:
+    """Compile the ``*.j2`` code generation templates of a directory.
+
+    See ``compile_templates``.
+    """
+    return compile_templates(template_dir, target)
+
+
+def compiled_template_loader(
+    template_dir: Union[str, Path], compiled_dir: Optional[Union[str, Path]] = None
+) -> Optional[ModuleLoader]:
+    """Return a loader for a directory's compiled templates, if usable.
+
+    Returns None when there are no compiled templates or when they were built
+    by another Jinja version, with other environment options or from other
+    template sources.
+    """
+    template_dir = Path(template_dir)
+    compiled_dir = (
+        Path(compiled_dir) if compiled_dir else template_dir / COMPILED_DIR_NAME
+    )
+    try:
+        manifest = json.loads((compiled_dir / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        log.debug(f"Ignoring unreadable compiled templates in {compiled_dir}: {err}")
+        return None
+
+    if manifest != compiled_manifest(template_dir):
+        log.debug(f"Ignoring stale compiled templates in {compiled_dir}")
+        return None
+    return ModuleLoader(str(compiled_dir))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--templates",
+        default=str(Path(__file__).parent / "templates"),
+        help="Directory holding the *.j2 templates (default: the package's)",
+    )
+    parser.add_argument(
+        "--output", help="Output directory (default: <templates>/_compiled)"
+    )
+    args = parser.parse_args()
+    print(compile_builtin_templates(args.templates, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Wall-clock and CPU timing of CLI phases and individual tasks."""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+
+class PhaseTimer:
+    """Accumulate wall-clock and CPU time per phase and per task.
+
+    Phases may nest (rendering ``agent.py`` includes preparing its data); each
+    phase is charged only its own time, excluding nested phases, so the phase
+    totals add up to the instrumented run. Task timings are a breakdown of the
+    ``prepare`` phase and are reported separately.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.tasks: Dict[str, Dict[str, float]] = {}
+        # Time spent in nested phases, one [wall, cpu] entry per open phase
+        self._stack: List[List[float]] = []
+        self._start = (time.perf_counter(), time.process_time())
+
+    @staticmethod
+    def _add(target: Dict[str, Dict[str, float]], name: str, wall: float, cpu: float):
+        entry = target.setdefault(name, {"wall_ms": 0.0, "cpu_ms": 0.0, "calls": 0})
+        entry["wall_ms"] += wall * 1000
+        entry["cpu_ms"] += cpu * 1000
+        entry["calls"] += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the run, excluding any phases nested inside it."""
+        nested = [0.0, 0.0]
+        self._stack.append(nested)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += wall
+                self._stack[-1][1] += cpu
+            self._add(self.phases, name, wall - nested[0], cpu - nested[1])
+
+    @contextmanager
+    def task(self, name: str) -> Iterator[None]:
+        """Time the preparation of a single task."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self._add(
+                self.tasks,
+                name,
+                time.perf_counter() - wall,
+                time.process_time() - cpu,
+            )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the timings recorded so far as a JSON-serialisable dict."""
+
+        def rounded(entries: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+            return {
+                name: {key: round(value, 3) for key, value in entry.items()}
+                for name, entry in entries.items()
+            }
+
+        return {
+            "total": {
+                "wall_ms": round((time.perf_counter() - self._start[0]) * 1000, 3),
+                "cpu_ms": round((time.process_time() - self._start[1]) * 1000, 3),
+            },
+            "phases": rounded(self.phases),
+            "tasks": rounded(self.tasks),
+        }
+
+
+class NullTimer(PhaseTimer):
+    """A timer that records nothing, used when timings are not requested."""
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        yield
+
+    @contextmanager
+    def task(self, name: str) -> Iterator[None]:
+        yield
+
+
+NULL_TIMER = NullTimer()
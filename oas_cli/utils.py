@@ -1,5 +1,6 @@
 """Utility functions for Open Agent Spec."""
 
+import hashlib
 import json
 from typing import Dict, Any
 
@@ -37,3 +38,13 @@ def parse_response(result: str, output_schema: Dict[str, Any]) -> Dict[str, Any]
         raise ValueError(f"Invalid JSON in response: {e}")
     except Exception as e:
         raise ValueError(f"Error parsing response: {e}")
+
+
+def stable_hash(value: Any) -> str:
+    """Return a SHA-256 hex digest of a JSON-like value.
+
+    Dictionaries are hashed with sorted keys so that equal values always give
+    the same digest regardless of key order.
+    """
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
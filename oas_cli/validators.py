@@ -1,176 +1,383 @@
 """Validation functions for Open Agent Spec."""
 
-from typing import Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 import json
 import logging
+import os
+import threading
 
-from jsonschema import validate
-from jsonschema.exceptions import SchemaError, ValidationError
+from jsonschema.exceptions import SchemaError, best_match
+from jsonschema.validators import validator_for
+
+from .task_graph import TaskGraph
 
 log = logging.getLogger(__name__)
 
+# Bundled Open Agent Spec JSON schema
+SCHEMA_PATH = Path(__file__).parent / "schemas" / "oas-schema.json"
 
-def _validate_version(spec_data: dict) -> None:
-    """Validate the spec version."""
-    version = spec_data.get("open_agent_spec")
-    if not isinstance(version, str):
-        raise ValueError("open_agent_spec version must be specified as a string")
-    if not version:
-        raise ValueError("open_agent_spec version cannot be empty")
-
-
-def _validate_agent(spec_data: dict) -> None:
-    """Validate the agent section."""
-    agent = spec_data.get("agent", {})
-    if not isinstance(agent.get("name"), str):
-        raise ValueError("agent.name must be a string")
-    if not isinstance(agent.get("role"), str):
-        raise ValueError("agent.role must be a string")
-
-
-def _validate_behavioural_contract(spec_data: dict) -> None:
-    """Validate the behavioural contract section."""
-    contract = spec_data.get("behavioural_contract", {})
-    if not isinstance(contract.get("version"), str):
-        raise ValueError("behavioural_contract.version must be a string")
-    if not isinstance(contract.get("description"), str):
-        raise ValueError("behavioural_contract.description must be a string")
-
-    # Optional fields - only validate if present
-    if "behavioural_flags" in contract and not isinstance(
-        contract["behavioural_flags"], dict
-    ):
-        raise ValueError("behavioural_contract.behavioural_flags must be a dictionary")
-    if "response_contract" in contract and not isinstance(
-        contract["response_contract"], dict
-    ):
-        raise ValueError("behavioural_contract.response_contract must be a dictionary")
-    if "policy" in contract and not isinstance(contract["policy"], dict):
-        raise ValueError("behavioural_contract.policy must be a dictionary")
-    if "teardown_policy" in contract and not isinstance(
-        contract["teardown_policy"], dict
-    ):
-        raise ValueError("behavioural_contract.teardown_policy must be a dictionary")
-
-
-def _validate_tools(spec_data: dict) -> None:
-    """Validate the tools section."""
-    tools = spec_data.get("tools", [])
-    if not isinstance(tools, list):
-        raise ValueError("tools must be a list")
-
-    for i, tool in enumerate(tools):
-        if not isinstance(tool, dict):
-            raise ValueError(f"tool {i} must be a dictionary")
-
-        if not isinstance(tool.get("id"), str):
-            raise ValueError(f"tool {i}.id must be a string")
-
-        if not isinstance(tool.get("description"), str):
-            raise ValueError(f"tool {i}.description must be a string")
-
-        if not isinstance(tool.get("type"), str):
-            raise ValueError(f"tool {i}.type must be a string")
-
-        # Validate allowed_paths if present (for file operations)
-        if "allowed_paths" in tool:
-            if not isinstance(tool["allowed_paths"], list):
-                raise ValueError(f"tool {i}.allowed_paths must be a list")
-            for j, path in enumerate(tool["allowed_paths"]):
-                if not isinstance(path, str):
-                    raise ValueError(f"tool {i}.allowed_paths[{j}] must be a string")
-
-
-def _validate_tasks(spec_data: dict) -> None:
-    """Validate the tasks section."""
-    tasks = spec_data.get("tasks", {})
-    tools = spec_data.get("tools", [])
-    tool_ids = [tool["id"] for tool in tools]
-
-    if not isinstance(tasks, dict):
-        raise ValueError("tasks must be a dictionary")
-    for task_name, task_def in tasks.items():
-        # Check if this task uses a tool
-        if "tool" in task_def:
-            tool_id = task_def["tool"]
-            if not isinstance(tool_id, str):
-                raise ValueError(f"task {task_name}.tool must be a string")
-            if tool_id not in tool_ids:
-                raise ValueError(
-                    f"task {task_name} references non-existent tool '{tool_id}'"
-                )
 
-        # Check if this is a multi-step task
-        is_multi_step = task_def.get("multi_step", False)
+class SchemaValidatorRegistry:
+    """Process-wide cache of compiled JSON Schema validators.
+
+    Loading a schema, checking it against its meta-schema and building a
+    validator is a fixed cost that dominates when one process validates many
+    specs. The registry pays it once per schema file and reuses the validator
+    until the file's mtime changes.
+    """
+
+    def __init__(self) -> None:
+        self._validators: Dict[Tuple[str, int], Any] = {}
+        self._compiled: Dict[Tuple[str, int], Optional[Callable[[Any], bool]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, schema_path: Union[str, Path]) -> Any:
+        """Return a Draft validator for the schema at ``schema_path``.
+
+        Raises:
+            FileNotFoundError: If the schema file does not exist
+            json.JSONDecodeError: If the schema file is not valid JSON
+            SchemaError: If the schema is not valid against its meta-schema
+        """
+        path = os.path.abspath(schema_path)
+        key = (path, os.stat(path).st_mtime_ns)
+
+        validator = self._validators.get(key)
+        if validator is not None:
+            return validator
+
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is None:
+                with open(path) as f:
+                    schema = json.load(f)
+                validator_cls = validator_for(schema)
+                validator_cls.check_schema(schema)
+                validator = validator_cls(schema)
+
+                # Drop validators built from older versions of this file
+                for stale_key in [k for k in self._validators if k[0] == path]:
+                    del self._validators[stale_key]
+                self._validators[key] = validator
+                log.debug(f"Compiled JSON schema validator for {path}")
+        return validator
+
+    def get_compiled(
+        self, schema_path: Union[str, Path]
+    ) -> Optional[Callable[[Any], bool]]:
+        """Return the generated ``is_valid`` function for a schema file.
+
+        Returns None if the schema uses keywords the compiler does not
+        support, in which case callers should use ``get`` instead. The schema
+        is checked against its meta-schema first, as ``get`` does.
+
+        Raises:
+            FileNotFoundError: If the schema file does not exist
+            json.JSONDecodeError: If the schema file is not valid JSON
+            SchemaError: If the schema is not valid against its meta-schema
+        """
+        from .schema_compiler import SchemaCompileError, load_compiled_validator
+
+        path = os.path.abspath(schema_path)
+        key = (path, os.stat(path).st_mtime_ns)
+        if key in self._compiled:
+            return self._compiled[key]
+
+        self.get(path)
+        with self._lock:
+            if key not in self._compiled:
+                try:
+                    compiled = load_compiled_validator(path)
+                except SchemaCompileError as err:
+                    log.debug(f"Using jsonschema for {path}: {err}")
+                    compiled = None
+                for stale_key in [k for k in self._compiled if k[0] == path]:
+                    del self._compiled[stale_key]
+                self._compiled[key] = compiled
+        return self._compiled[key]
+
+    def clear(self) -> None:
+        """Forget all cached validators."""
+        with self._lock:
+            self._validators.clear()
+            self._compiled.clear()
+
+
+schema_registry = SchemaValidatorRegistry()
+
+
+def get_schema_validator(schema_path: Union[str, Path] = SCHEMA_PATH) -> Any:
+    """Return the cached validator for a schema file (the bundled schema by default)."""
+    return schema_registry.get(schema_path)
+
+
+class SpecValidationError(ValueError):
+    """A spec failed validation.
+
+    ``errors`` lists every problem found as ``{"path": ..., "message": ...}``
+    dicts, where ``path`` locates the offending value, e.g.
+    ``tasks.analyze.steps[0].task``.
+    """
 
-        # For multi-step tasks, input and output are optional since they orchestrate other tasks
-        if not is_multi_step:
-            if not isinstance(task_def.get("input"), dict):
-                raise ValueError(f"task {task_name}.input must be a dictionary")
-            if not isinstance(task_def.get("output"), dict):
-                raise ValueError(f"task {task_name}.output must be a dictionary")
+    def __init__(self, errors: List[Dict[str, str]]):
+        self.errors = errors
+        if len(errors) == 1:
+            message = f"Invalid spec format: {errors[0]['message']}"
         else:
-            # For multi-step tasks, validate that steps are defined
-            if not isinstance(task_def.get("steps"), list):
-                raise ValueError(f"multi-step task {task_name}.steps must be a list")
-            if not task_def.get("steps"):
-                raise ValueError(f"multi-step task {task_name}.steps cannot be empty")
-
-            # Validate output schema for multi-step tasks
-            if not isinstance(task_def.get("output"), dict):
-                raise ValueError(
-                    f"multi-step task {task_name}.output must be a dictionary"
-                )
-            if not task_def.get("output"):
-                raise ValueError(f"multi-step task {task_name}.output cannot be empty")
-
-            # Validate each step
-            for i, step in enumerate(task_def["steps"]):
-                if not isinstance(step, dict):
-                    raise ValueError(
-                        f"step {i} in task {task_name} must be a dictionary"
-                    )
-                if "task" not in step:
-                    raise ValueError(
-                        f"step {i} in task {task_name} must have a 'task' field"
-                    )
-                if not isinstance(step["task"], str):
-                    raise ValueError(
-                        f"step {i} in task {task_name}.task must be a string"
-                    )
+            message = f"Invalid spec format: {len(errors)} errors\n" + "\n".join(
+                f"  {error['path']}: {error['message']}" for error in errors
+            )
+        super().__init__(message)
+
+
+def _format_path(parts: Iterable[Union[str, int]]) -> str:
+    """Render a sequence of keys and indexes as ``a.b[0].c``."""
+    path = ""
+    for part in parts:
+        if isinstance(part, int):
+            path += f"[{part}]"
+        else:
+            path += f".{part}" if path else str(part)
+    return path or "<root>"
 
-                # Check that the referenced task exists
-                referenced_task = step["task"]
-                if referenced_task not in tasks:
-                    raise ValueError(
-                        f"step {i} in task {task_name} references non-existent task '{referenced_task}'"
+
+class _SemanticChecker:
+    """Collect the semantic errors of a spec in a single pass over its sections.
+
+    Tools are indexed by id as they are checked, so task references to tools
+    and to other tasks are dictionary lookups. The dependencies between tasks
+    are then checked as a graph (see ``TaskGraph``).
+    """
+
+    def __init__(self) -> None:
+        self.errors: List[Dict[str, str]] = []
+
+    def add(self, path: str, message: str) -> None:
+        self.errors.append({"path": path, "message": message})
+
+    def check(self, spec_data: dict) -> List[Dict[str, str]]:
+        if not isinstance(spec_data, dict):
+            self.add("<root>", "spec must be a dictionary")
+            return self.errors
+        self.check_version(spec_data.get("open_agent_spec"))
+        self.check_agent(spec_data.get("agent", {}))
+        self.check_behavioural_contract(spec_data.get("behavioural_contract", {}))
+        tool_index = self.check_tools(spec_data.get("tools", []))
+        self.check_tasks(spec_data.get("tasks", {}), tool_index)
+        self.check_integration(spec_data.get("integration", {}))
+        self.check_prompts(spec_data.get("prompts", {}))
+        return self.errors
+
+    def check_version(self, version: Any) -> None:
+        if not isinstance(version, str):
+            self.add(
+                "open_agent_spec",
+                "open_agent_spec version must be specified as a string",
+            )
+        elif not version:
+            self.add("open_agent_spec", "open_agent_spec version cannot be empty")
+
+    def check_agent(self, agent: Any) -> None:
+        if not isinstance(agent, dict):
+            self.add("agent", "agent must be a dictionary")
+            return
+        for field in ("name", "role"):
+            if not isinstance(agent.get(field), str):
+                self.add(f"agent.{field}", f"agent.{field} must be a string")
+
+    def check_behavioural_contract(self, contract: Any) -> None:
+        if not isinstance(contract, dict):
+            self.add(
+                "behavioural_contract", "behavioural_contract must be a dictionary"
+            )
+            return
+        for field in ("version", "description"):
+            if not isinstance(contract.get(field), str):
+                path = f"behavioural_contract.{field}"
+                self.add(path, f"{path} must be a string")
+
+        # Optional fields - only validate if present
+        for field in (
+            "behavioural_flags",
+            "response_contract",
+            "policy",
+            "teardown_policy",
+        ):
+            if field in contract and not isinstance(contract[field], dict):
+                path = f"behavioural_contract.{field}"
+                self.add(path, f"{path} must be a dictionary")
+
+    def check_tools(self, tools: Any) -> Dict[str, dict]:
+        """Check the tools section and return the valid tools indexed by id."""
+        index: Dict[str, dict] = {}
+        if not isinstance(tools, list):
+            self.add("tools", "tools must be a list")
+            return index
+
+        for i, tool in enumerate(tools):
+            path = f"tools[{i}]"
+            if not isinstance(tool, dict):
+                self.add(path, f"tool {i} must be a dictionary")
+                continue
+            for field in ("id", "description", "type"):
+                if not isinstance(tool.get(field), str):
+                    self.add(f"{path}.{field}", f"tool {i}.{field} must be a string")
+
+            # Validate allowed_paths if present (for file operations)
+            if "allowed_paths" in tool:
+                allowed = tool["allowed_paths"]
+                if not isinstance(allowed, list):
+                    self.add(
+                        f"{path}.allowed_paths",
+                        f"tool {i}.allowed_paths must be a list",
+                    )
+                else:
+                    for j, allowed_path in enumerate(allowed):
+                        if not isinstance(allowed_path, str):
+                            self.add(
+                                f"{path}.allowed_paths[{j}]",
+                                f"tool {i}.allowed_paths[{j}] must be a string",
+                            )
+
+            if isinstance(tool.get("id"), str):
+                index.setdefault(tool["id"], tool)
+        return index
+
+    def check_tasks(self, tasks: Any, tool_index: Dict[str, dict]) -> None:
+        if not isinstance(tasks, dict):
+            self.add("tasks", "tasks must be a dictionary")
+            return
+
+        for task_name, task_def in tasks.items():
+            path = f"tasks.{task_name}"
+            if not isinstance(task_def, dict):
+                self.add(path, f"task {task_name} must be a dictionary")
+                continue
+
+            # Check if this task uses a tool
+            if "tool" in task_def:
+                tool_id = task_def["tool"]
+                if not isinstance(tool_id, str):
+                    self.add(f"{path}.tool", f"task {task_name}.tool must be a string")
+                elif tool_id not in tool_index:
+                    self.add(
+                        f"{path}.tool",
+                        f"task {task_name} references non-existent tool '{tool_id}'",
                     )
 
-                # Validate input_map if present
-                if "input_map" in step:
-                    if not isinstance(step["input_map"], dict):
-                        raise ValueError(
-                            f"step {i} in task {task_name}.input_map must be a dictionary"
+            # For multi-step tasks, input and output are optional since they
+            # orchestrate other tasks
+            if not task_def.get("multi_step", False):
+                for field in ("input", "output"):
+                    if not isinstance(task_def.get(field), dict):
+                        self.add(
+                            f"{path}.{field}",
+                            f"task {task_name}.{field} must be a dictionary",
                         )
+                continue
 
+            output = task_def.get("output")
+            steps = task_def.get("steps")
+            if not isinstance(steps, list):
+                self.add(
+                    f"{path}.steps", f"multi-step task {task_name}.steps must be a list"
+                )
+                steps = []
+            elif not steps:
+                self.add(
+                    f"{path}.steps",
+                    f"multi-step task {task_name}.steps cannot be empty",
+                )
+            if not isinstance(output, dict):
+                self.add(
+                    f"{path}.output",
+                    f"multi-step task {task_name}.output must be a dictionary",
+                )
+            elif not output:
+                self.add(
+                    f"{path}.output",
+                    f"multi-step task {task_name}.output cannot be empty",
+                )
 
-def _validate_integration(spec_data: dict) -> None:
-    """Validate the integration section."""
-    integration = spec_data.get("integration", {})
-    if integration:
-        if not isinstance(integration.get("memory"), dict):
-            raise ValueError("integration.memory must be a dictionary")
-        if not isinstance(integration.get("task_queue"), dict):
-            raise ValueError("integration.task_queue must be a dictionary")
+            for i, step in enumerate(steps):
+                self.check_step(f"{path}.steps[{i}]", task_name, i, step, tasks)
+
+        # Self references, cycles and references to later steps' results
+        self.errors.extend(TaskGraph(tasks).errors())
+
+    def check_step(
+        self, path: str, task_name: str, i: int, step: Any, tasks: dict
+    ) -> None:
+        if not isinstance(step, dict):
+            self.add(path, f"step {i} in task {task_name} must be a dictionary")
+            return
+        if "task" not in step:
+            self.add(path, f"step {i} in task {task_name} must have a 'task' field")
+        elif not isinstance(step["task"], str):
+            self.add(
+                f"{path}.task", f"step {i} in task {task_name}.task must be a string"
+            )
+        elif step["task"] not in tasks:
+            self.add(
+                f"{path}.task",
+                f"step {i} in task {task_name} references non-existent task "
+                f"'{step['task']}'",
+            )
+
+        if "input_map" in step and not isinstance(step["input_map"], dict):
+            self.add(
+                f"{path}.input_map",
+                f"step {i} in task {task_name}.input_map must be a dictionary",
+            )
+
+    def check_integration(self, integration: Any) -> None:
+        if not integration:
+            return
+        if not isinstance(integration, dict):
+            self.add("integration", "integration must be a dictionary")
+            return
+        for field in ("memory", "task_queue"):
+            if not isinstance(integration.get(field), dict):
+                self.add(
+                    f"integration.{field}", f"integration.{field} must be a dictionary"
+                )
 
+    def check_prompts(self, prompts: Any) -> None:
+        if not isinstance(prompts, dict):
+            self.add("prompts", "prompts must be a dictionary")
+            return
+        for field in ("system", "user"):
+            if not isinstance(prompts.get(field), str):
+                self.add(f"prompts.{field}", f"prompts.{field} must be a string")
 
-def _validate_prompts(spec_data: dict) -> None:
-    """Validate the prompts section."""
-    prompts = spec_data.get("prompts", {})
-    if not isinstance(prompts.get("system"), str):
-        raise ValueError("prompts.system must be a string")
-    if not isinstance(prompts.get("user"), str):
-        raise ValueError("prompts.user must be a string")
+
+def collect_spec_errors(spec_data: dict) -> List[Dict[str, str]]:
+    """Return every semantic problem in a spec, in document order."""
+    return _SemanticChecker().check(spec_data)
+
+
+def collect_schema_errors(
+    spec_data: dict, schema_path: Union[str, Path] = SCHEMA_PATH
+) -> List[Dict[str, str]]:
+    """Return every JSON schema violation in a spec.
+
+    A missing or unreadable schema yields no errors, matching
+    ``validate_with_json_schema``.
+    """
+    try:
+        validator = get_schema_validator(schema_path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+    except SchemaError as e:
+        return [{"path": "<schema>", "message": f"Spec validation failed: {e.message}"}]
+    return [
+        {
+            "path": _format_path(error.absolute_path),
+            "message": f"Spec validation failed: {error.message}",
+        }
+        for error in validator.iter_errors(spec_data)
+    ]
 
 
 def _generate_names(agent: dict) -> Tuple[str, str]:
@@ -185,11 +392,35 @@ def _generate_names(agent: dict) -> Tuple[str, str]:
     return agent_name, class_name
 
 
-def validate_with_json_schema(spec_data: dict, schema_path: str) -> None:
-    """Validate spec data against a JSON schema."""
+def use_compiled_validator() -> bool:
+    """Whether ``OAS_SCHEMA_VALIDATOR=compiled`` selects the generated validator."""
+    return os.environ.get("OAS_SCHEMA_VALIDATOR", "").lower() == "compiled"
+
+
+def validate_with_json_schema(
+    spec_data: dict,
+    schema_path: Union[str, Path] = SCHEMA_PATH,
+    compiled: Optional[bool] = None,
+) -> None:
+    """Validate spec data against a JSON schema.
+
+    The schema is loaded and checked once per process through
+    ``schema_registry``; subsequent calls reuse the compiled validator.
+
+    With ``compiled`` (by default, when ``OAS_SCHEMA_VALIDATOR=compiled``)
+    specs are checked by Python code generated from the schema (see
+    ``oas_cli.schema_compiler``), which is several times faster. Invalid specs
+    are then re-checked with ``jsonschema`` so that error messages are the
+    same in both modes.
+    """
+    if compiled is None:
+        compiled = use_compiled_validator()
     try:
-        with open(schema_path) as f:
-            schema = json.load(f)
+        if compiled:
+            is_valid = schema_registry.get_compiled(schema_path)
+            if is_valid is not None and is_valid(spec_data):
+                return
+        validator = get_schema_validator(schema_path)
     except FileNotFoundError:
         log.warning(
             f"Schema file not found at {schema_path}, skipping schema validation."
@@ -200,38 +431,45 @@ def validate_with_json_schema(spec_data: dict, schema_path: str) -> None:
             f"Invalid JSON in schema file at {schema_path}, skipping schema validation."
         )
         return
-
-    try:
-        validate(instance=spec_data, schema=schema)
-    except (ValidationError, SchemaError) as e:
+    except SchemaError as e:
         raise ValueError(f"Spec validation failed: {e.message}")
 
+    error = best_match(validator.iter_errors(spec_data))
+    if error is not None:
+        raise ValueError(f"Spec validation failed: {error.message}")
 
-def validate_spec(spec_data: dict) -> Tuple[str, str]:
+
+def validate_spec(spec_data: dict, all_errors: bool = False) -> Tuple[str, str]:
     """Validate the Open Agent Spec structure and return agent name and class name.
 
     Args:
         spec_data: The parsed YAML spec data
+        all_errors: Report every problem rather than only the first one
 
     Returns:
         Tuple of (agent_name, class_name)
 
     Raises:
-        KeyError: If required fields are missing
-        ValueError: If field types are invalid
+        SpecValidationError: If the spec is invalid; its ``errors`` hold the
+            first problem, or all of them with ``all_errors``
     """
-    try:
-        _validate_version(spec_data)
-        _validate_agent(spec_data)
-        _validate_behavioural_contract(spec_data)
-        _validate_tools(spec_data)
-        _validate_tasks(spec_data)
-        _validate_integration(spec_data)
-        _validate_prompts(spec_data)
-
-        return _generate_names(spec_data["agent"])
-
-    except KeyError as e:
-        raise KeyError(f"Missing required field in spec: {e}") from e
-    except Exception as e:
-        raise ValueError(f"Invalid spec format: {e}") from e
+    errors = collect_spec_errors(spec_data)
+    if errors:
+        raise SpecValidationError(errors if all_errors else errors[:1])
+    return _generate_names(spec_data["agent"])
+
+
+def validate_all(
+    spec_data: dict, schema_path: Union[str, Path] = SCHEMA_PATH
+) -> Tuple[str, str]:
+    """Run both validation passes and report every problem they find at once.
+
+    Raises:
+        SpecValidationError: Listing all schema violations followed by all
+            semantic errors
+    """
+    errors = collect_schema_errors(spec_data, schema_path)
+    errors += collect_spec_errors(spec_data)
+    if errors:
+        raise SpecValidationError(errors)
+    return _generate_names(spec_data["agent"])
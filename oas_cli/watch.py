@@ -0,0 +1,143 @@
+"""Watch a spec file and regenerate its agent project on every save."""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import yaml
+
+from .code_generation import CodeGenerator
+from .data_preparation import AgentDataPreparator
+from .manifest import sync_agent_files
+from .spec_loader import is_json_spec, parse_spec
+from .validators import get_schema_validator, validate_spec, validate_with_json_schema
+
+log = logging.getLogger("oas")
+
+
+class WatchCycle:
+    """Outcome of one regeneration triggered by a spec change."""
+
+    def __init__(self) -> None:
+        self.success = False
+        self.error: Optional[str] = None
+        self.changed: List[str] = []
+        self.recomputed_tasks: List[str] = []
+        self.duration_ms = 0.0
+
+
+class SpecWatcher:
+    """Poll a spec file and keep its agent project in sync.
+
+    The watcher keeps a single data preparator (and with it the generated code
+    for every task), code generator and compiled schema validator for its whole
+    lifetime, so a save that touches one task only regenerates that task.
+    Bursts of saves are collapsed: a change is acted on once the file has been
+    stable for ``debounce`` seconds.
+    """
+
+    def __init__(
+        self,
+        spec_path: Path,
+        output: Path,
+        interval: float = 0.5,
+        debounce: float = 0.2,
+    ):
+        self.spec_path = spec_path
+        self.output = output
+        self.interval = interval
+        self.debounce = debounce
+        self.preparator = AgentDataPreparator()
+        self.generator = CodeGenerator()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._content_hash: Optional[str] = None
+        # Compile the schema up front so the first cycle is not slower
+        get_schema_validator()
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.spec_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Block until the spec changes and then settles.
+
+        Returns False if ``timeout`` seconds pass without a change.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._stat_signature()
+            if current != self._signature:
+                # Wait for the burst of writes to finish
+                while True:
+                    time.sleep(self.debounce)
+                    settled = self._stat_signature()
+                    if settled == current:
+                        break
+                    current = settled
+                self._signature = current
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.interval)
+
+    def run_cycle(self) -> Optional[WatchCycle]:
+        """Regenerate the project if the spec content changed since last cycle.
+
+        Returns None when the spec content is unchanged (e.g. a save with no
+        edits). Errors are reported in the result rather than raised, so an
+        invalid intermediate save never stops the watcher.
+        """
+        start = time.perf_counter()
+        self._signature = self._stat_signature()
+        cycle = WatchCycle()
+        try:
+            content = self.spec_path.read_bytes()
+            content_hash = hashlib.sha256(content).hexdigest()
+            if content_hash == self._content_hash:
+                return None
+
+            spec_data = parse_spec(content, json_format=is_json_spec(self.spec_path))
+            validate_with_json_schema(spec_data)
+            agent_name, class_name = validate_spec(spec_data)
+            result = sync_agent_files(
+                self.output,
+                spec_data,
+                agent_name,
+                class_name,
+                preparator=self.preparator,
+                generator=self.generator,
+            )
+            self._content_hash = content_hash
+            cycle.success = True
+            cycle.changed = result.changed
+            cycle.recomputed_tasks = result.recomputed_tasks
+        except (OSError, yaml.YAMLError, json.JSONDecodeError) as err:
+            cycle.error = f"Error reading spec file: {err}"
+        except Exception as err:
+            cycle.error = str(err)
+        cycle.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        return cycle
+
+    def watch(
+        self,
+        on_cycle: Callable[[WatchCycle], None],
+        max_cycles: Optional[int] = None,
+    ) -> None:
+        """Regenerate once, then on every change until interrupted.
+
+        ``max_cycles`` bounds the number of regenerations, mainly for tests.
+        """
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            if cycles:
+                self.wait_for_change()
+            cycle = self.run_cycle()
+            cycles += 1
+            if cycle is not None:
+                on_cycle(cycle)
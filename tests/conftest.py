@@ -8,6 +8,17 @@ import shutil
 from pathlib import Path
 
 
+@pytest.fixture(autouse=True)
+def isolated_spec_cache(tmp_path_factory, monkeypatch):
+    """Keep the on-disk spec and template caches out of the user's home directory."""
+    cache_dir = tmp_path_factory.mktemp("oas-cache")
+    monkeypatch.setenv("OAS_CACHE_DIR", str(cache_dir))
+    monkeypatch.setenv("OAS_TEMPLATE_CACHE_DIR", str(cache_dir / "templates"))
+    # Template overrides in the user's config directory must not leak in
+    monkeypatch.setenv("OAS_USER_TEMPLATE_DIR", str(cache_dir / "user-templates"))
+    return cache_dir
+
+
 @pytest.fixture
 def mock_openai_response():
     """Mock OpenAI API response with valid security analysis."""
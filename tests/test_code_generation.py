@@ -0,0 +1,166 @@
+"""Tests for the shared Jinja environments and precompiled templates."""
+
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+from jinja2 import Environment
+
+from oas_cli.code_generation import (
+    CodeGenerator,
+    clear_template_environments,
+    get_template_environment,
+    template_override_dirs,
+)
+from oas_cli.data_preparation import AgentDataPreparator
+from oas_cli.template_compiler import (
+    compile_builtin_templates,
+    compiled_template_loader,
+)
+
+BUILTIN_TEMPLATES = Path(__file__).parent.parent / "oas_cli" / "templates"
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "hello.j2").write_text("Hello {{ name }}!\n")
+    yield templates
+    clear_template_environments()
+
+
+def test_generators_share_environment(template_dir):
+    """Every generator for a directory reuses one environment and its templates."""
+    first, second = CodeGenerator(template_dir), CodeGenerator(template_dir)
+    assert first.env is second.env
+    assert first.generate_from_template("hello.j2", name="a") == "Hello a!"
+    assert first.env.get_template("hello.j2") is second.env.get_template("hello.j2")
+
+
+def test_bytecode_cached_across_processes(template_dir, tmp_path, monkeypatch):
+    """A fresh environment loads compiled templates instead of compiling them."""
+    cache_dir = tmp_path / "bytecode"
+    monkeypatch.setenv("OAS_TEMPLATE_CACHE_DIR", str(cache_dir))
+    clear_template_environments()
+
+    compiled = []
+    original = Environment.compile
+
+    def counting_compile(self, *args, **kwargs):
+        compiled.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Environment, "compile", counting_compile)
+
+    CodeGenerator(template_dir).generate_from_template("hello.j2", name="a")
+    assert len(compiled) == 1
+    assert list(cache_dir.iterdir())
+
+    # Simulate a new CLI run: no environments in memory, bytecode on disk
+    clear_template_environments()
+    generator = CodeGenerator(template_dir)
+    assert generator.generate_from_template("hello.j2", name="b") == "Hello b!"
+    assert len(compiled) == 1
+
+
+def test_environment_created_once_across_threads(template_dir):
+    """Concurrent callers all receive the same environment."""
+    clear_template_environments()
+    barrier = threading.Barrier(8)
+    environments = []
+
+    def worker():
+        barrier.wait()
+        environments.append(get_template_environment(template_dir))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(environments) == 8
+    assert all(env is environments[0] for env in environments)
+
+
+@pytest.fixture
+def compiled_template_dir(tmp_path):
+    """A copy of the built-in templates with precompiled modules."""
+    templates = tmp_path / "builtin"
+    templates.mkdir()
+    for name in ("agent.py.j2", "task_function.py.j2"):
+        shutil.copy(BUILTIN_TEMPLATES / name, templates / name)
+    compile_builtin_templates(templates)
+    yield templates
+    clear_template_environments()
+
+
+def test_precompiled_templates_render_without_compiling(
+    compiled_template_dir, monkeypatch
+):
+    """Compiled modules render the same code as the template sources."""
+    spec = yaml.safe_load((BUILTIN_TEMPLATES / "minimal-agent.yaml").read_text())
+    data = AgentDataPreparator().prepare_all_data(spec, "agent", "Agent")
+    expected = CodeGenerator(BUILTIN_TEMPLATES).generate_from_template(
+        "agent.py.j2", **data
+    )
+
+    def fail_compile(self, *args, **kwargs):
+        raise AssertionError("template compiled at runtime")
+
+    monkeypatch.setattr(Environment, "compile", fail_compile)
+    generator = CodeGenerator(compiled_template_dir)
+    assert generator.generate_from_template("agent.py.j2", **data) == expected
+
+
+def test_stale_precompiled_templates_are_ignored(compiled_template_dir):
+    """Editing a template source falls back to loading the source."""
+    assert compiled_template_loader(compiled_template_dir) is not None
+    (compiled_template_dir / "agent.py.j2").write_text("edited {{ class_name }}")
+    assert compiled_template_loader(compiled_template_dir) is None
+    generator = CodeGenerator(compiled_template_dir)
+    assert generator.generate_from_template("agent.py.j2", class_name="A") == (
+        "edited A"
+    )
+
+
+def test_default_templates_are_not_written(template_dir):
+    """Missing templates use the registered default without touching disk."""
+    generator = CodeGenerator(template_dir)
+    generator.ensure_template_exists("missing.j2", "default {{ name }}")
+    generator.ensure_template_exists("hello.j2", "ignored")
+
+    assert generator.generate_from_template("missing.j2", name="a") == "default a"
+    assert generator.generate_from_template("hello.j2", name="a") == "Hello a!"
+    assert not (template_dir / "missing.j2").exists()
+
+
+def test_override_directories_take_precedence(template_dir, tmp_path, monkeypatch):
+    """Project overrides beat user overrides, which beat the template directory."""
+    user_dir = tmp_path / "user"
+    project_dir = tmp_path / "project"
+    for directory, content in ((user_dir, "user"), (project_dir, "project")):
+        directory.mkdir()
+        (directory / "hello.j2").write_text(content)
+    (user_dir / "only-user.j2").write_text("from user")
+    monkeypatch.setenv("OAS_USER_TEMPLATE_DIR", str(user_dir))
+
+    assert template_override_dirs(project_dir) == [project_dir, user_dir]
+    generator = CodeGenerator(
+        template_dir, override_dirs=template_override_dirs(project_dir)
+    )
+    assert generator.generate_from_template("hello.j2") == "project"
+    assert generator.generate_from_template("only-user.j2") == "from user"
+    assert generator.get_override("hello.j2") is not None
+
+    fingerprint = generator.override_fingerprint()
+    (user_dir / "only-user.j2").write_text("edited")
+    assert generator.override_fingerprint() != fingerprint
+
+    plain = CodeGenerator(template_dir, override_dirs=[])
+    assert plain.generate_from_template("hello.j2", name="a") == "Hello a!"
+    assert plain.get_override("hello.j2") is None
+    assert plain.override_fingerprint() is None
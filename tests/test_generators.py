@@ -1,10 +1,14 @@
 """Tests for the Open Agent Spec generators."""
 
+import importlib.util
+import os
 import shutil
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
+import yaml
 
 from oas_cli.generators import (
     generate_agent_code,
@@ -15,6 +19,8 @@ from oas_cli.generators import (
     to_pascal_case,
 )
 
+TEMPLATES = Path(__file__).parent.parent / "oas_cli" / "templates"
+
 
 @pytest.fixture
 def temp_dir():
@@ -384,11 +390,202 @@ def test_generate_multi_step_task(temp_dir):
     # Check that multi-step task is generated
     assert "def greet_and_compliment(" in agent_code
 
-    # Check that multi-step task calls other tasks
-    assert "step_0_result = greet(name=name)" in agent_code
-    assert "step_1_result = compliment(name=name)" in agent_code
+    # Check that multi-step task calls other tasks, concurrently since the
+    # steps do not read each other's results
+    assert "executor.submit(greet, name=name)" in agent_code
+    assert "executor.submit(compliment, name=name)" in agent_code
+    assert "step_0_result = step_0_future.result()" in agent_code
 
     # Check that output is constructed from step results
     assert "return Greet_And_ComplimentOutput(" in agent_code
     assert "response=step_0_result.response" in agent_code
     assert "compliment=step_1_result.compliment" in agent_code
+
+
+def _import_agent(path: Path):
+    spec = importlib.util.spec_from_file_location(f"agent_{id(path)}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("reload", [False, True])
+def test_prompt_templates_compiled_once(temp_dir, monkeypatch, reload):
+    """Generated agents cache prompt templates, reloading edits only on request."""
+    if reload:
+        monkeypatch.setenv("OAS_PROMPT_RELOAD", "1")
+    else:
+        monkeypatch.delenv("OAS_PROMPT_RELOAD", raising=False)
+    spec_data = yaml.safe_load((TEMPLATES / "minimal-agent.yaml").read_text())
+    generate_agent_code(temp_dir, spec_data, "hello_world_agent", "HelloWorldAgent")
+    prompts = temp_dir / "prompts"
+    prompts.mkdir()
+    (prompts / "greet.jinja2").write_text("first {{ name }}")
+    (prompts / "agent_prompt.jinja2").write_text("default")
+
+    agent = _import_agent(temp_dir / "agent.py")
+    template = agent.load_prompt_template("greet")
+    assert template.render(name="x") == "first x"
+    assert agent.load_prompt_template("greet") is template
+    assert agent.load_prompt_template("missing").render() == "default"
+
+    edited = prompts / "greet.jinja2"
+    edited.write_text("second {{ name }}")
+    stat = edited.stat()
+    os.utime(edited, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    expected = "second x" if reload else "first x"
+    assert agent.load_prompt_template("greet").render(name="x") == expected
+
+
+def test_task_constants_built_once(temp_dir, monkeypatch):
+    """Task functions reuse module-level constants instead of rebuilding them."""
+    monkeypatch.chdir(temp_dir)
+    spec_data = yaml.safe_load((TEMPLATES / "minimal-agent.yaml").read_text())
+    generate_agent_code(temp_dir, spec_data, "hello_world_agent", "HelloWorldAgent")
+    generate_prompt_template(temp_dir, spec_data)
+    agent = _import_agent(temp_dir / "agent.py")
+
+    configs = []
+
+    def invoke_intelligence(prompt, config):
+        configs.append(config)
+        return '{"response": "Hello!"}'
+
+    monkeypatch.setattr(agent, "invoke_intelligence", invoke_intelligence)
+    agent.greet(name="Ada")
+    agent.greet(name="Ada")
+
+    assert configs[0] is configs[1] is agent.GREET_INTELLIGENCE_CONFIG
+    assert isinstance(configs[0], dict)  # DACP only accepts a dict
+    with pytest.raises(TypeError):
+        agent.GREET_MEMORY_CONFIG["enabled"] = True
+    assert isinstance(agent.GREET_OUTPUT_DEFAULTS, MappingProxyType)
+
+
+@pytest.fixture
+def async_agent(temp_dir, monkeypatch):
+    """A generated multi-task agent with ``intelligence.async`` set."""
+    monkeypatch.chdir(temp_dir)
+    spec_data = yaml.safe_load(
+        (TEMPLATES / "minimal-multi-task-agent.yaml").read_text()
+    )
+    spec_data["intelligence"]["async"] = True
+    generate_agent_code(temp_dir, spec_data, "agent", "Agent")
+    generate_prompt_template(temp_dir, spec_data)
+    return _import_agent(temp_dir / "agent.py")
+
+
+def test_async_agent_runs_tasks_concurrently(async_agent, monkeypatch):
+    """Async task functions keep many LLM calls in flight at once."""
+    import asyncio
+    import time
+
+    from dacp.orchestrator import Orchestrator
+
+    in_flight = []
+
+    async def ainvoke_intelligence(prompt, config):
+        in_flight.append(prompt)
+        await asyncio.sleep(0.2)
+        return '{"response": "Hello!", "compliment": "Nice"}'
+
+    monkeypatch.setattr(async_agent, "ainvoke_intelligence", ainvoke_intelligence)
+    agent = async_agent.Agent("agent-id", Orchestrator())
+
+    async def greet_all():
+        return await asyncio.gather(
+            *(agent.greet_async(name=str(i)) for i in range(10))
+        )
+
+    start = time.perf_counter()
+    results = asyncio.run(greet_all())
+    assert time.perf_counter() - start < 1.0
+    assert len(in_flight) == 10
+    assert [result["response"] for result in results] == ["Hello!"] * 10
+
+    # The synchronous API is kept as wrappers around the async one
+    assert async_agent.greet(name="Ada") == {"response": "Hello!"}
+    assert agent.handle_message({"task": "greet", "name": "Ada"}) == {
+        "response": "Hello!"
+    }
+    assert "error" in agent.handle_message({"task": "unknown"})
+
+
+def test_async_clients_are_pooled(async_agent, monkeypatch):
+    """One async provider client is shared by the calls of an event loop."""
+    import asyncio
+    from types import SimpleNamespace
+
+    import openai
+
+    clients = []
+
+    class AsyncOpenAI:
+        def __init__(self, **kwargs):
+            clients.append(self)
+            self.chat = SimpleNamespace(completions=self)
+
+        async def create(self, **kwargs):
+            message = SimpleNamespace(content='{"response": "Hello!"}')
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", AsyncOpenAI)
+    config = {"engine": "openai", "model": "gpt-4", "api_key": "key"}
+
+    async def invoke_twice():
+        return await asyncio.gather(
+            async_agent.ainvoke_intelligence("a", config),
+            async_agent.ainvoke_intelligence("b", config),
+        )
+
+    assert asyncio.run(invoke_twice()) == ['{"response": "Hello!"}'] * 2
+    assert len(clients) == 1
+
+
+def test_independent_steps_run_concurrently(temp_dir, monkeypatch):
+    """Steps that do not read each other's results run at the same time."""
+    import threading
+
+    monkeypatch.chdir(temp_dir)
+    spec_data = yaml.safe_load(
+        (TEMPLATES / "minimal-multi-task-agent.yaml").read_text()
+    )
+    generate_agent_code(temp_dir, spec_data, "agent", "Agent")
+    generate_prompt_template(temp_dir, spec_data)
+    agent = _import_agent(temp_dir / "agent.py")
+
+    # Each call waits for the other step's call, so sequential steps time out
+    both_called = threading.Barrier(2, timeout=5)
+
+    def invoke_intelligence(prompt, config):
+        both_called.wait()
+        return '{"response": "Hello!", "compliment": "Nice"}'
+
+    monkeypatch.setattr(agent, "invoke_intelligence", invoke_intelligence)
+    assert agent.greet_and_compliment(name="Ada") == {
+        "response": "Hello!",
+        "compliment": "Nice",
+    }
+
+
+def test_async_independent_steps_are_gathered(async_agent, monkeypatch):
+    """Async steps are gathered, and the first failing step's error is raised."""
+    import asyncio
+
+    calls = []
+
+    async def greet_async(name, memory_summary=""):
+        calls.append("greet")
+        await asyncio.sleep(0.05)
+        raise ValueError("greet failed")
+
+    async def compliment_async(name, memory_summary=""):
+        calls.append("compliment")
+        raise KeyError("compliment failed")
+
+    monkeypatch.setattr(async_agent, "greet_async", greet_async)
+    monkeypatch.setattr(async_agent, "compliment_async", compliment_async)
+    function = async_agent.greet_and_compliment_async.__wrapped__
+    with pytest.raises(ValueError, match="greet failed"):
+        asyncio.run(function(name="Ada"))
+    assert calls == ["greet", "compliment"]
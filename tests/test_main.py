@@ -1,6 +1,9 @@
 """Tests for the Open Agent Spec CLI commands."""
 
+import json
 import os
+import shutil
+from pathlib import Path
 
 import sys
 
@@ -13,7 +16,9 @@ else:
         import toml as tomllib  # type: ignore
 from typer.testing import CliRunner
 
+from oas_cli.code_generation import clear_template_environments
 from oas_cli.main import app
+from oas_cli.template_compiler import compiled_manifest
 
 runner = CliRunner()
 
@@ -65,3 +70,227 @@ def test_init_with_minimal_template(tmp_path):
     prompt_content = prompt_file.read_text()
     assert "{{ input.name }}" in prompt_content
     assert "Hello {{ input.name }}!" in prompt_content
+
+
+def test_validate_command(tmp_path):
+    """Test that oas validate streams one JSON line per spec and sets the exit code."""
+    templates_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "oas_cli", "templates"
+    )
+    shutil.copy(os.path.join(templates_dir, "minimal-agent.yaml"), tmp_path)
+    shutil.copy(os.path.join(templates_dir, "minimal-multi-task-agent.yaml"), tmp_path)
+
+    result = runner.invoke(app, ["validate", str(tmp_path), "--jobs", "2"])
+    assert result.exit_code == 0
+    records = [
+        json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")
+    ]
+    assert len(records) == 2
+    assert all(record["valid"] for record in records)
+    assert records[0]["class_name"] == "HelloWorldAgent"
+
+    (tmp_path / "broken.yaml").write_text("open_agent_spec: 1.0.8\n")
+    result = runner.invoke(app, ["validate", str(tmp_path / "*.yaml")])
+    assert result.exit_code == 1
+    records = [
+        json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")
+    ]
+    assert [record["valid"] for record in records] == [False, True, True]
+    assert "error" in records[0]
+
+
+def test_validate_command_all_errors(tmp_path):
+    """Test that oas validate --all-errors lists every problem with its path."""
+    (tmp_path / "broken.yaml").write_text(
+        "open_agent_spec: 1.0.8\nagent: {name: 1, role: 2}\n"
+    )
+
+    result = runner.invoke(
+        app, ["validate", str(tmp_path), "--all-errors", "--no-cache"]
+    )
+    assert result.exit_code == 1
+    [record] = [
+        json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")
+    ]
+    paths = [error["path"] for error in record["errors"]]
+    assert "agent.name" in paths
+    assert "agent.role" in paths
+    assert "prompts.system" in paths
+
+
+def test_validate_command_without_specs(tmp_path):
+    """Test that oas validate exits with 2 when nothing matches."""
+    result = runner.invoke(app, ["validate", str(tmp_path)])
+    assert result.exit_code == 2
+
+
+def test_init_batch_from_spec_dir(tmp_path):
+    """Test that oas init --spec-dir scaffolds every spec and survives bad ones."""
+    templates_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "oas_cli", "templates"
+    )
+    spec_dir = tmp_path / "specs"
+    (spec_dir / "team").mkdir(parents=True)
+    shutil.copy(os.path.join(templates_dir, "minimal-agent.yaml"), spec_dir)
+    shutil.copy(
+        os.path.join(templates_dir, "minimal-multi-task-agent.yaml"), spec_dir / "team"
+    )
+    (spec_dir / "broken.yaml").write_text("open_agent_spec: [\n")
+    output_root = tmp_path / "build"
+
+    result = runner.invoke(
+        app,
+        [
+            "init",
+            "--spec-dir",
+            str(spec_dir),
+            "--output-root",
+            str(output_root),
+            "--jobs",
+            "1",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "2/3" in result.output
+    assert (output_root / "minimal-agent" / "agent.py").exists()
+    assert (output_root / "team" / "minimal-multi-task-agent" / "agent.py").exists()
+    assert not (output_root / "broken").exists()
+
+
+def test_init_with_timings_and_profile(tmp_path):
+    """Test that --timings-json and --profile record the run."""
+    timings_file = tmp_path / "timings.json"
+    profile_file = tmp_path / "init.prof"
+    result = runner.invoke(
+        app,
+        [
+            "init",
+            "--template",
+            "minimal",
+            "--output",
+            str(tmp_path / "agent"),
+            "--timings",
+            "--timings-json",
+            str(timings_file),
+            "--profile",
+            str(profile_file),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "Timings" in result.output
+    timings = json.loads(timings_file.read_text())
+    for phase in ("load", "schema_validation", "prepare", "render", "write"):
+        assert timings["phases"][phase]["calls"] >= 1
+        assert timings["phases"][phase]["wall_ms"] >= 0
+    assert "greet" in timings["tasks"]
+    assert profile_file.stat().st_size > 0
+
+
+def test_templates_list():
+    """Test that oas templates list shows every bundled template."""
+    result = runner.invoke(app, ["templates", "list"])
+
+    assert result.exit_code == 0
+    assert "minimal-multi-task-agent" in result.output
+    assert "security-risk-assessor" in result.output
+
+
+def test_init_with_named_template(tmp_path):
+    """Test that any bundled template can be used with --template."""
+    output_dir = tmp_path / "multi"
+    result = runner.invoke(
+        app,
+        ["init", "--template", "minimal-multi-task-agent", "--output", str(output_dir)],
+    )
+
+    assert result.exit_code == 0
+    assert (output_dir / "prompts" / "greet_and_compliment.jinja2").exists()
+
+
+def test_init_with_unknown_template(tmp_path):
+    """Test that an unknown template name fails cleanly."""
+    result = runner.invoke(
+        app, ["init", "--template", "nope", "--output", str(tmp_path / "x")]
+    )
+
+    assert result.exit_code == 1
+    assert not (tmp_path / "x").exists()
+
+
+def test_init_and_update_with_templates_dir(tmp_path):
+    """Templates in --templates-dir override the built-in ones."""
+    builtin = Path(__file__).parent.parent / "oas_cli" / "templates"
+    spec = tmp_path / "spec.yaml"
+    shutil.copy(builtin / "minimal-agent.yaml", spec)
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "task_function.py.j2").write_text(
+        "\n# custom task function\n" + (builtin / "task_function.py.j2").read_text()
+    )
+    output_dir = tmp_path / "agent"
+
+    result = runner.invoke(
+        app,
+        ["init", "--spec", str(spec), "--output", str(output_dir)]
+        + ["--templates-dir", str(templates)],
+    )
+    assert result.exit_code == 0, result.output
+    agent_code = (output_dir / "agent.py").read_text()
+    assert "# custom task function" in agent_code
+    compile(agent_code, "agent.py", "exec")
+
+    # A new override regenerates the agent even though the spec is unchanged
+    (templates / "agent.py.j2").write_text(
+        "# custom agent\n" + (builtin / "agent.py.j2").read_text()
+    )
+    clear_template_environments()  # as in a new CLI process
+    result = runner.invoke(
+        app,
+        ["update", "--spec", str(spec), "--output", str(output_dir)]
+        + ["--templates-dir", str(templates)],
+    )
+    assert result.exit_code == 0, result.output
+    agent_code = (output_dir / "agent.py").read_text()
+    assert agent_code.startswith("# custom agent")
+    assert "# custom task function" in agent_code
+
+
+def test_init_and_update_compile_prompts(tmp_path):
+    """--compile-prompts compiles the prompts and keeps them up to date."""
+    builtin = Path(__file__).parent.parent / "oas_cli" / "templates"
+    spec = tmp_path / "spec.yaml"
+    shutil.copy(builtin / "minimal-agent.yaml", spec)
+    output_dir = tmp_path / "agent"
+
+    result = runner.invoke(
+        app,
+        ["init", "--spec", str(spec), "--output", str(output_dir), "--compile-prompts"],
+    )
+    assert result.exit_code == 0, result.output
+    manifest = output_dir / "prompts" / "_compiled" / "manifest.json"
+    assert "greet.jinja2" in json.loads(manifest.read_text())["templates"]
+
+    (output_dir / "prompts" / "greet.jinja2").write_text("Hi {{ name }}")
+    result = runner.invoke(
+        app,
+        ["update", "--spec", str(spec), "--output", str(output_dir)]
+        + ["--compile-prompts"],
+    )
+    assert result.exit_code == 0, result.output
+    expected = compiled_manifest(output_dir / "prompts", ".jinja2", {})
+    assert json.loads(manifest.read_text()) == expected
+
+
+def test_init_async(tmp_path):
+    """--async generates async task functions with synchronous wrappers."""
+    output_dir = tmp_path / "agent"
+    result = runner.invoke(
+        app, ["init", "--template", "minimal", "--output", str(output_dir), "--async"]
+    )
+    assert result.exit_code == 0, result.output
+    agent_code = (output_dir / "agent.py").read_text()
+    assert "async def greet_async(" in agent_code
+    assert "def greet(" in agent_code
+    assert "async def handle_message_async(self" in agent_code
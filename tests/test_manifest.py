@@ -0,0 +1,87 @@
+"""Tests for manifest-driven incremental generation."""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from oas_cli.manifest import MANIFEST_NAME, sync_agent_files
+
+TEMPLATE = Path(__file__).parent.parent / "oas_cli" / "templates"
+
+
+@pytest.fixture
+def multi_task_spec():
+    """Return the bundled multi-task agent spec."""
+    return yaml.safe_load((TEMPLATE / "minimal-multi-task-agent.yaml").read_text())
+
+
+def _generate(output, spec, **kwargs):
+    return sync_agent_files(
+        output, spec, "hello_world_agent", "HelloWorldAgent", **kwargs
+    )
+
+
+def test_first_sync_writes_everything_and_manifest(tmp_path, multi_task_spec):
+    """A fresh project gets every file plus a manifest."""
+    result = _generate(tmp_path, multi_task_spec)
+
+    assert "agent.py" in result.changed
+    assert "prompts/greet.jinja2" in result.changed
+    assert sorted(result.recomputed_tasks) == [
+        "compliment",
+        "greet",
+        "greet_and_compliment",
+    ]
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert "tasks.greet" in manifest["sections"]
+    assert "agent.py" in manifest["artifacts"]
+
+
+def test_unchanged_spec_rewrites_nothing(tmp_path, multi_task_spec):
+    """Re-syncing an unchanged spec neither renders nor writes any file."""
+    _generate(tmp_path, multi_task_spec)
+    mtimes = {p: p.stat().st_mtime_ns for p in tmp_path.rglob("*") if p.is_file()}
+
+    result = _generate(tmp_path, multi_task_spec)
+
+    assert result.changed == []
+    assert result.recomputed_tasks == []
+    assert mtimes == {
+        p: p.stat().st_mtime_ns for p in tmp_path.rglob("*") if p.is_file()
+    }
+
+
+def test_task_change_only_touches_affected_files(tmp_path, multi_task_spec):
+    """Changing one task regenerates only that task and the files that use it."""
+    _generate(tmp_path, multi_task_spec)
+    greet_prompt = tmp_path / "prompts" / "greet.jinja2"
+    greet_mtime = greet_prompt.stat().st_mtime_ns
+
+    updated = copy.deepcopy(multi_task_spec)
+    updated["tasks"]["compliment"]["output"]["properties"]["compliment"][
+        "description"
+    ] = "A warm compliment"
+    result = _generate(tmp_path, updated)
+
+    assert result.recomputed_tasks == ["compliment"]
+    assert "agent.py" in result.changed
+    assert "prompts/greet.jinja2" not in result.changed
+    assert "requirements.txt" not in result.changed
+    assert greet_prompt.stat().st_mtime_ns == greet_mtime
+    assert "A warm compliment" in (tmp_path / "agent.py").read_text()
+
+
+def test_dry_run_reports_without_writing(tmp_path, multi_task_spec):
+    """A dry run lists exactly the files that would change and writes nothing."""
+    _generate(tmp_path, multi_task_spec)
+    before = (tmp_path / "requirements.txt").read_text()
+
+    updated = copy.deepcopy(multi_task_spec)
+    updated["intelligence"]["engine"] = "anthropic"
+    result = _generate(tmp_path, updated, dry_run=True)
+
+    assert sorted(result.changed) == [".env.example", "agent.py", "requirements.txt"]
+    assert (tmp_path / "requirements.txt").read_text() == before
@@ -0,0 +1,97 @@
+"""Tests for precompiling and checking the prompts of generated agents."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+import yaml
+from jinja2 import Environment
+
+from oas_cli.code_generation import TemplateVariableParser
+from oas_cli.manifest import sync_agent_files
+from oas_cli.prompt_compiler import check_prompt_variables, compile_prompt_templates
+
+TEMPLATES = Path(__file__).parent.parent / "oas_cli" / "templates"
+
+
+@pytest.fixture
+def spec_data():
+    return yaml.safe_load((TEMPLATES / "minimal-agent.yaml").read_text())
+
+
+@pytest.fixture
+def agent_dir(tmp_path, spec_data, monkeypatch):
+    """A generated minimal agent with precompiled prompts."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OAS_PROMPT_RELOAD", raising=False)
+    output = tmp_path / "agent"
+    result = sync_agent_files(output, spec_data, "agent", "Agent", compile_prompts=True)
+    assert result.compiled_prompts
+    assert result.prompt_problems == []
+    return output
+
+
+def _import_agent(path: Path):
+    spec = importlib.util.spec_from_file_location(f"agent_{id(path)}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_agent_loads_compiled_prompts(agent_dir, monkeypatch):
+    """Generated agents render compiled prompts without compiling them."""
+    source = (agent_dir / "prompts" / "greet.jinja2").read_text()
+    expected = Environment().from_string(source).render(name="x", input={})
+
+    def fail_compile(self, *args, **kwargs):
+        raise AssertionError("prompt compiled at runtime")
+
+    monkeypatch.setattr(Environment, "compile", fail_compile)
+    agent = _import_agent(agent_dir / "agent.py")
+    assert agent.load_prompt_template("greet").render(name="x", input={}) == expected
+
+
+def test_stale_compiled_prompts_are_ignored(agent_dir):
+    """Editing a prompt falls back to its source until it is recompiled."""
+    (agent_dir / "prompts" / "greet.jinja2").write_text("edited {{ name }}")
+    agent = _import_agent(agent_dir / "agent.py")
+    assert agent.load_prompt_template("greet").render(name="x") == "edited x"
+    assert compile_prompt_templates(agent_dir / "prompts")
+    assert not compile_prompt_templates(agent_dir / "prompts")
+
+
+def test_prompt_variables_checked_against_task_inputs(agent_dir, spec_data):
+    """Prompt variables that are not task inputs are reported."""
+    prompt = agent_dir / "prompts" / "greet.jinja2"
+    prompt.write_text(
+        "{{ name }} {{ input.name }} {{ memory_summary }} {{ input.items() }}"
+        " {{ title }} {{ input['nickname'] }}"
+    )
+    assert check_prompt_variables(spec_data, agent_dir / "prompts") == [
+        "prompts/greet.jinja2 uses 'input.nickname', which is not an input of "
+        "task greet",
+        "prompts/greet.jinja2 uses 'title', which is not an input of task greet",
+    ]
+
+
+def test_hyphenated_task_prompt_is_checked_and_used(tmp_path, spec_data):
+    """Prompts of tasks whose names are not identifiers are found by name."""
+    spec_data["tasks"] = {"say-hello": spec_data["tasks"]["greet"]}
+    output = tmp_path / "agent"
+    sync_agent_files(output, spec_data, "agent", "Agent")
+    prompt = output / "prompts" / "say-hello.jinja2"
+    assert prompt.exists()
+
+    prompt.write_text("Hi {{ title }}")
+    assert check_prompt_variables(spec_data, output / "prompts") == [
+        "prompts/say-hello.jinja2 uses 'title', which is not an input of "
+        "task say-hello",
+    ]
+    assert 'load_prompt_template("say-hello")' in (output / "agent.py").read_text()
+
+
+def test_extract_attribute_references():
+    """Attribute and constant key reads of a variable are extracted."""
+    template = "{{ input.a }} {{ input['b'] }} {{ input[key] }} {{ input.get('c') }}"
+    references = TemplateVariableParser.extract_attribute_references(template, "input")
+    assert references == {"a", "b"}
@@ -0,0 +1,189 @@
+"""Conformance tests for the validator generated from the JSON schema."""
+
+import copy
+import json
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+from jsonschema import Draft7Validator
+
+from benchmarks.synthetic import make_spec
+from oas_cli.schema_compiler import (
+    SchemaCompileError,
+    compile_schema,
+    compiled_module_path,
+    load_compiled_validator,
+)
+from oas_cli.validators import SCHEMA_PATH, schema_registry, validate_with_json_schema
+
+TEMPLATES = Path(__file__).parent.parent / "oas_cli" / "templates"
+
+# Values swapped in at every position of a spec to probe each keyword
+REPLACEMENTS = [
+    None,
+    True,
+    0,
+    1,
+    -3,
+    1.0,
+    1.5,
+    3,
+    "",
+    "x",
+    "bad key!",
+    "http://example.com",
+    "1.0.3",
+    "2.0.0",
+    "object",
+    "llm",
+    "openai",
+    [],
+    ["x"],
+    [{}],
+    {},
+    {"x": 1},
+]
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return json.loads(SCHEMA_PATH.read_text())
+
+
+@pytest.fixture(scope="module")
+def is_valid(schema, tmp_path_factory):
+    schema_path = tmp_path_factory.mktemp("schema") / "oas-schema.json"
+    schema_path.write_text(json.dumps(schema))
+    return load_compiled_validator(schema_path)
+
+
+def _paths(node, path=()):
+    """Yield the path of every value in a nested structure."""
+    yield path
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _paths(value, path + (key,))
+    elif isinstance(node, list):
+        for i, value in enumerate(node):
+            yield from _paths(value, path + (i,))
+
+
+def _mutations(spec):
+    """Yield variants of a spec with one value replaced, removed or added."""
+    for path in _paths(spec):
+        for replacement in REPLACEMENTS:
+            variant = copy.deepcopy(spec)
+            if not path:
+                yield replacement
+                continue
+            parent = variant
+            for part in path[:-1]:
+                parent = parent[part]
+            parent[path[-1]] = replacement
+            yield variant
+
+        variant = copy.deepcopy(spec)
+        target = variant
+        for part in path:
+            target = target[part]
+        if isinstance(target, dict):
+            target["bad key!"] = {}
+            yield copy.deepcopy(variant)
+            del target["bad key!"]
+            for key in list(target):
+                removed = copy.deepcopy(variant)
+                node = removed
+                for part in path:
+                    node = node[part]
+                del node[key]
+                yield removed
+
+
+@pytest.mark.parametrize(
+    "template",
+    ["minimal-agent-tool-usage.yaml", "security-incident-responder.yaml"],
+)
+def test_matches_jsonschema_on_mutated_specs(template, schema, is_valid):
+    """Every single-edit variant of a template gets the same verdict."""
+    reference = Draft7Validator(schema)
+    spec = yaml.safe_load((TEMPLATES / template).read_text())
+
+    checked = rejected = 0
+    for variant in _mutations(spec):
+        expected = reference.is_valid(variant)
+        assert is_valid(variant) == expected, variant
+        checked += 1
+        rejected += not expected
+
+    # The mutations exercise both outcomes
+    assert checked > 1000
+    assert 0 < rejected < checked
+
+
+def test_accepts_valid_specs(is_valid):
+    """Bundled templates and large synthetic specs are valid."""
+    for template in TEMPLATES.glob("*.yaml"):
+        assert is_valid(yaml.safe_load(template.read_text())), template
+    assert is_valid(make_spec(200, multi_step_ratio=0.2))
+
+
+def test_module_cached_in_cache_dir_and_rebuilt_on_change(
+    tmp_path, isolated_spec_cache
+):
+    """The generated module is reused until the schema's content changes."""
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"type": "object", "required": ["a"]}))
+
+    check = load_compiled_validator(schema_path)
+    module_path = compiled_module_path(schema_path)
+    assert module_path.parent == isolated_spec_cache / "validators"
+    assert module_path.exists()
+    assert not list(tmp_path.glob("*.py"))
+    assert not check({}) and check({"a": 1})
+
+    schema_path.write_text(json.dumps({"type": "object"}))
+    assert load_compiled_validator(schema_path)({})
+
+
+def test_unsupported_keywords_fall_back_to_jsonschema(tmp_path):
+    """Schemas the compiler cannot handle are validated by jsonschema."""
+    with pytest.raises(SchemaCompileError, match="minLength"):
+        compile_schema({"type": "string", "minLength": 2})
+
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"type": "object", "minProperties": 1}))
+    assert schema_registry.get_compiled(schema_path) is None
+    with pytest.raises(ValueError, match="Spec validation failed"):
+        validate_with_json_schema({}, schema_path, compiled=True)
+
+
+def test_compiled_mode_reports_jsonschema_errors(monkeypatch):
+    """Error messages are the same whichever validator is used."""
+    spec = yaml.safe_load((TEMPLATES / "minimal-agent.yaml").read_text())
+    spec["intelligence"]["engine"] = "unknown"
+
+    messages = []
+    for mode in ("jsonschema", "compiled"):
+        monkeypatch.setenv("OAS_SCHEMA_VALIDATOR", mode)
+        with pytest.raises(ValueError) as excinfo:
+            validate_with_json_schema(spec)
+        messages.append(str(excinfo.value))
+    assert messages[0] == messages[1]
+
+
+def test_read_only_cache_directory(tmp_path, isolated_spec_cache):
+    """Without a writable cache location the code is compiled in memory."""
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"type": "array", "items": {"type": "string"}}))
+    os.chmod(isolated_spec_cache, 0o555)
+    try:
+        if os.access(isolated_spec_cache, os.W_OK):
+            pytest.skip("directory permissions are not enforced (running as root)")
+        check = load_compiled_validator(schema_path)
+    finally:
+        os.chmod(isolated_spec_cache, 0o755)
+
+    assert check(["a"]) and not check([1])
+    assert not compiled_module_path(schema_path).exists()
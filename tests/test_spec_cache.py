@@ -0,0 +1,143 @@
+"""Tests for the on-disk spec cache."""
+
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from oas_cli import spec_cache
+from oas_cli.main import load_and_validate_spec
+from oas_cli.spec_cache import SpecCache, load_validated_spec
+from oas_cli.spec_loader import SpecLimitError
+from oas_cli.timing import PhaseTimer
+
+TEMPLATE = Path(__file__).parent.parent / "oas_cli" / "templates" / "minimal-agent.yaml"
+
+
+@pytest.fixture
+def spec_path(tmp_path):
+    path = tmp_path / "agent.yaml"
+    shutil.copy(TEMPLATE, path)
+    return path
+
+
+def test_second_load_skips_parsing_and_validation(spec_path, monkeypatch):
+    """An unchanged spec is served from the cache without revalidation."""
+    first = load_validated_spec(spec_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("spec was revalidated")
+
+    monkeypatch.setattr("oas_cli.validators.validate_spec", fail)
+    monkeypatch.setattr("yaml.safe_load", fail)
+    assert load_validated_spec(spec_path) == first
+
+
+def test_changed_content_misses(spec_path):
+    """Editing the spec produces a different cache key."""
+    cache = SpecCache()
+    before = cache.key(spec_path.read_bytes())
+    spec_path.write_text(spec_path.read_text().replace("greeting", "salutation"))
+    assert cache.key(spec_path.read_bytes()) != before
+
+
+def test_key_depends_on_cli_version(spec_path, monkeypatch):
+    """Upgrading the CLI invalidates cached entries."""
+    cache = SpecCache()
+    before = cache.key(spec_path.read_bytes())
+    monkeypatch.setattr(spec_cache, "_cli_version", lambda: "999.0.0")
+    assert cache.key(spec_path.read_bytes()) != before
+
+
+def test_key_depends_on_load_limits(spec_path, monkeypatch):
+    """Tightening the load limits makes cached specs be loaded again."""
+    before = SpecCache().key(spec_path.read_bytes())
+    monkeypatch.setenv("OAS_YAML_MAX_DEPTH", "2")
+    assert SpecCache().key(spec_path.read_bytes()) != before
+
+    monkeypatch.delenv("OAS_YAML_MAX_DEPTH")
+    load_validated_spec(spec_path)
+    monkeypatch.setenv("OAS_YAML_MAX_DEPTH", "2")
+    with pytest.raises(SpecLimitError):
+        load_validated_spec(spec_path)
+
+
+def test_cli_loader_uses_cache(spec_path, monkeypatch):
+    """The CLI's spec loading goes through the cache and records its phases."""
+    log = logging.getLogger("test")
+    first = load_and_validate_spec(spec_path, log)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("spec was revalidated")
+
+    monkeypatch.setattr("oas_cli.validators.validate_spec", fail)
+    timer = PhaseTimer()
+    assert load_and_validate_spec(spec_path, log, timer) == first
+    assert "cache" in timer.phases
+
+
+def test_invalid_specs_are_not_cached(tmp_path, isolated_spec_cache):
+    """Only specs that pass validation are stored."""
+    path = tmp_path / "bad.yaml"
+    path.write_text("open_agent_spec: 1.0.8\nagent: {}\n")
+    with pytest.raises(ValueError):
+        load_validated_spec(path)
+    assert list(Path(isolated_spec_cache).glob("*.json")) == []
+
+
+def test_no_cache_bypasses_cache(spec_path, isolated_spec_cache):
+    """use_cache=False neither reads nor writes the cache."""
+    load_validated_spec(spec_path, use_cache=False)
+    assert list(Path(isolated_spec_cache).glob("*.json")) == []
+
+
+def test_corrupt_entry_is_ignored(spec_path):
+    """A damaged cache entry is treated as a miss."""
+    cache = SpecCache()
+    content = spec_path.read_bytes()
+    load_validated_spec(spec_path)
+    (cache.directory / f"{cache.key(content)}.json").write_text("{not json")
+
+    assert cache.get(content) is None
+    assert load_validated_spec(spec_path)[1] == "hello_world_agent"
+
+
+def test_lru_eviction(tmp_path):
+    """Least recently used entries are evicted once over the size limit."""
+    cache = SpecCache(directory=tmp_path / "cache", max_bytes=10_000)
+    spec = {"payload": "x" * 3000}
+    for i in range(3):
+        cache.put(f"spec {i}".encode(), spec, "a", "A")
+        path = cache.directory / f"{cache.key(f'spec {i}'.encode())}.json"
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get(b"spec 0") is not None
+    cache.put(b"spec 3", spec, "a", "A")
+
+    assert cache.get(b"spec 1") is None
+    assert cache.get(b"spec 0") is not None
+    assert cache.get(b"spec 3") is not None
+
+
+def test_put_scans_directory_only_when_over_limit(tmp_path, monkeypatch):
+    """Writes keep a running size estimate instead of rescanning the cache."""
+    cache = SpecCache(directory=tmp_path / "cache", max_bytes=10_000)
+    scans = []
+    original_scan = SpecCache._scan
+
+    def counting_scan(self):
+        scans.append(self.directory)
+        return original_scan(self)
+
+    monkeypatch.setattr(SpecCache, "_scan", counting_scan)
+    spec = {"payload": "x" * 3000}
+    for i in range(3):
+        cache.put(f"spec {i}".encode(), spec, "a", "A")
+    assert len(scans) == 1
+
+    cache.put(b"spec 3", spec, "a", "A")
+    assert len(scans) == 2
+    assert sum(p.stat().st_size for p in cache.directory.glob("*.json")) <= 10_000
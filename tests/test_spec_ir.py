@@ -0,0 +1,168 @@
+"""Tests for the spec IR the code generators consume."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from benchmarks.synthetic import make_spec
+from oas_cli.data_preparation import AgentDataPreparator
+from oas_cli.task_graph import TaskGraph
+from oas_cli.spec_ir import (
+    INPUT_ARG,
+    LITERAL_ARG,
+    MEMORY_PARAM,
+    MISSING_ARG,
+    STEP_ARG,
+    SpecIR,
+    TaskIR,
+)
+
+TEMPLATES = Path(__file__).parent.parent / "oas_cli" / "templates"
+
+
+def test_task_names_and_params():
+    """A task's Python names and typed parameters are derived once."""
+    task = TaskIR(
+        "analyze-logs",
+        {
+            "input": {
+                "properties": {
+                    "logs": {"type": "array"},
+                    "limit": {"type": "integer"},
+                }
+            },
+            "output": {"type": "object", "properties": {"summary": {}}},
+        },
+    )
+
+    assert task.func_name == "analyze_logs"
+    assert task.model_name == "Analyze_LogsOutput"
+    assert task.parser_name == "parse_analyze_logs_output"
+    assert task.param_names == ["logs", "limit"]
+    assert task.input_params == ["logs: List[Any]", "limit: int", MEMORY_PARAM]
+    assert task.output["properties"] == {"summary": {}}
+    assert not task.multi_step and task.steps == []
+
+
+def test_step_arguments_and_reads():
+    """Step input maps are parsed into typed arguments and step dependencies."""
+    task = TaskIR(
+        "pipeline",
+        {
+            "multi_step": True,
+            "steps": [
+                {"task": "greet", "input_map": {"name": "{{input.name}}"}},
+                {
+                    "task": "write-file",
+                    "input_map": {
+                        "content": "{{ steps.0.greeting }}",
+                        "path": "{{path}}",
+                        "mode": "w",
+                        "later": "{{steps.1.result}}",
+                        "named": "{{steps.first.result}}",
+                        "skipped": "{{other.value}}",
+                    },
+                },
+            ],
+        },
+    )
+
+    first, second = task.steps
+    assert first.arguments == [("name", INPUT_ARG, "name")]
+    assert first.reads == []
+    assert second.func_name == "write_file"
+    assert second.arguments == [
+        ("content", STEP_ARG, (0, "greeting")),
+        ("path", INPUT_ARG, "path"),
+        ("mode", LITERAL_ARG, "w"),
+        ("later", MISSING_ARG, None),
+        ("named", MISSING_ARG, None),
+    ]
+    assert second.reads == [0]
+    # Multi-step tasks take the referenced inputs, sorted, as strings
+    assert task.input_params == ["name: str", "path: str", MEMORY_PARAM]
+
+
+def test_step_waves():
+    """Steps are grouped into waves of steps that do not read each other."""
+    task = TaskIR(
+        "pipeline",
+        {
+            "multi_step": True,
+            "steps": [
+                {"task": "greet", "input_map": {"name": "{{name}}"}},
+                {"task": "compliment", "input_map": {"name": "{{input.name}}"}},
+                {"task": "summarize", "input_map": {"text": "{{steps.1.text}}"}},
+                {"task": "translate", "input_map": {"text": "{{steps.5.text}}"}},
+                {"task": "review", "input_map": {"a": "{{steps.0.a}}"}},
+                {"task": "publish", "input_map": {"b": "{{steps.4.b}}"}},
+            ],
+        },
+    )
+    assert [[step.index for step in wave] for wave in task.waves] == [
+        [0, 1, 3],
+        [2, 4],
+        [5],
+    ]
+    assert TaskIR("greet", {"output": {}}).waves == []
+
+
+def test_step_reads_match_task_graph():
+    """Step reads, and so waves, agree with the validator's step dependencies."""
+    spec = make_spec(200, multi_step_ratio=0.3)
+    spec["tasks"]["odd"] = {
+        "multi_step": True,
+        "steps": [
+            {"task": "odd", "input_map": {"a": "{{steps.0.a}}"}},
+            {"task": "odd", "input_map": {"a": "{{steps.0.}}", "b": "{{steps.x.b}}"}},
+            {"task": "odd", "input_map": {"a": "{{ steps.1.a }}"}},
+        ],
+    }
+    graph = TaskGraph(spec["tasks"])
+    for name, task in SpecIR(spec).tasks.items():
+        if task.multi_step:
+            assert [step.reads for step in task.steps] == graph.step_dependencies(name)
+
+
+def test_spec_sections():
+    """Agent, intelligence, memory and client settings apply the defaults."""
+    ir = SpecIR(
+        {
+            "info": {"name": "legacy", "description": "Old format"},
+            "intelligence": {"engine": "custom", "module": "routers.Router"},
+            "tasks": {
+                "a": {"output": {}},
+                "b": {"multi_step": True, "steps": []},
+                "c": {"tool": "file_writer"},
+            },
+        }
+    )
+
+    assert (ir.agent.name, ir.agent.description) == ("legacy", "Old format")
+    assert ir.intelligence.custom_router == "routers.Router"
+    assert ir.memory["enabled"] is False
+    assert ir.config["model"] == "gpt-3.5-turbo"
+    assert ir.uses_tools
+    assert ir.example_task().name == "b"
+    assert SpecIR({}).example_task() is None
+
+
+def test_ir_is_slotted():
+    """IR objects have no per-instance dictionary."""
+    ir = SpecIR(make_spec(5, multi_step_ratio=0.5))
+    task = next(iter(ir.tasks.values()))
+    for obj in (ir, ir.agent, ir.intelligence, task, task.params[0]):
+        with pytest.raises(AttributeError):
+            obj.__dict__
+
+
+def test_prepared_data_reuses_given_ir():
+    """Passing a prebuilt IR gives the same data as building it internally."""
+    spec = yaml.safe_load((TEMPLATES / "minimal-multi-task-agent.yaml").read_text())
+    ir = SpecIR(spec)
+
+    with_ir = AgentDataPreparator().prepare_all_data(spec, "agent", "Agent", ir=ir)
+    without_ir = AgentDataPreparator().prepare_all_data(spec, "agent", "Agent")
+
+    assert with_ir == without_ir
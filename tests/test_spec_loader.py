@@ -0,0 +1,188 @@
+"""Tests for spec parsing: YAML documents, bundles and JSON."""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+from oas_cli.batch import iter_generation_results, validate_spec_file
+from oas_cli.main import app
+from oas_cli.spec_loader import (
+    LoadLimits,
+    SafeLoader,
+    SpecLimitError,
+    iter_spec_documents,
+    parse_spec,
+)
+
+TEMPLATES = Path(__file__).parent.parent / "oas_cli" / "templates"
+
+
+def _template(name):
+    return yaml.safe_load((TEMPLATES / name).read_text())
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    """A YAML bundle with two valid agents and one invalid one."""
+    second = _template("minimal-agent.yaml")
+    second["agent"]["name"] = "second-agent"
+    invalid = {"open_agent_spec": "1.0.8", "agent": {"name": "broken"}}
+    path = tmp_path / "bundle.yaml"
+    path.write_text(
+        yaml.safe_dump_all(
+            [_template("minimal-agent.yaml"), second, invalid], sort_keys=False
+        )
+    )
+    return path
+
+
+def test_uses_libyaml_when_available():
+    """The C loader is used when PyYAML was built with libyaml."""
+    if yaml.__with_libyaml__:
+        assert SafeLoader is yaml.CSafeLoader
+    else:
+        assert SafeLoader is yaml.SafeLoader
+
+
+def test_parse_spec_matches_safe_load():
+    """The fast loader produces the same data as yaml.safe_load."""
+    content = (TEMPLATES / "security-incident-responder.yaml").read_bytes()
+    assert parse_spec(content) == yaml.safe_load(content)
+
+
+def test_parse_spec_rejects_bundles(bundle):
+    """Parsing a bundle as a single spec fails rather than picking one."""
+    with pytest.raises(yaml.YAMLError, match="single document"):
+        parse_spec(bundle.read_bytes())
+
+
+def test_iter_spec_documents_streams_bundle(bundle):
+    """Every non-empty document of a bundle is yielded in order."""
+    names = [doc["agent"]["name"] for doc in iter_spec_documents(bundle)]
+    assert names == ["hello-world-agent", "second-agent", "broken"]
+
+
+def test_parse_spec_rejects_alias_bomb():
+    """Aliases that expand exponentially are rejected before construction."""
+    lines = ['a: &a ["lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol"]']
+    for prev, name in zip("abcdefgh", "bcdefghi"):
+        lines.append(f"{name}: &{name} [" + ", ".join([f"*{prev}"] * 8) + "]")
+
+    with pytest.raises(SpecLimitError, match="OAS_YAML_MAX_NODES"):
+        parse_spec("\n".join(lines))
+
+
+def test_parse_spec_alias_limit():
+    """The number of alias expansions is bounded."""
+    content = "base: &b {x: 1}\nitems: [" + ", ".join(["*b"] * 20) + "]"
+
+    assert len(parse_spec(content)["items"]) == 20
+    with pytest.raises(SpecLimitError, match="OAS_YAML_MAX_ALIASES"):
+        parse_spec(content, limits=LoadLimits(max_aliases=10))
+
+
+def test_parse_spec_rejects_recursive_alias():
+    """An alias to one of its own ancestors is rejected."""
+    with pytest.raises(SpecLimitError, match="recursive alias"):
+        parse_spec("a: &a [*a]")
+
+
+@pytest.mark.parametrize("levels", [200, 100_000])
+def test_parse_spec_rejects_deep_nesting(levels):
+    """Deeply nested documents fail cleanly, however deep they go."""
+    with pytest.raises(SpecLimitError, match="OAS_YAML_MAX_DEPTH"):
+        parse_spec("[" * levels + "]" * levels)
+
+
+@pytest.mark.parametrize("levels", [200, 100_000])
+def test_parse_json_spec_rejects_deep_nesting(levels):
+    """The depth limit also applies to JSON, including input too deep to parse."""
+    content = ("[" * levels + "]" * levels).encode()
+    with pytest.raises(SpecLimitError):
+        parse_spec(content, json_format=True)
+    with pytest.raises(SpecLimitError):
+        list(iter_spec_documents(content, json_format=True))
+
+
+def test_validate_reports_deep_json_spec(tmp_path):
+    """A JSON spec too deep to parse gives an invalid result, not a crash."""
+    path = tmp_path / "deep.json"
+    path.write_text('{"a": ' * 100_000 + "1" + "}" * 100_000)
+
+    [result] = validate_spec_file(str(path))
+    assert not result["valid"]
+    assert "nests too deeply" in result["error"]
+
+
+def test_size_limit(tmp_path, monkeypatch):
+    """The file size limit applies to content and files, and reads the env."""
+    path = tmp_path / "agent.yaml"
+    path.write_text("a: " + "x" * 100)
+    monkeypatch.setenv("OAS_YAML_MAX_BYTES", "50")
+
+    with pytest.raises(SpecLimitError, match="over the limit of 50 bytes"):
+        parse_spec(path.read_bytes())
+    with pytest.raises(SpecLimitError, match="OAS_YAML_MAX_BYTES"):
+        list(iter_spec_documents(path))
+
+
+def test_streamed_documents_match_safe_load(tmp_path):
+    """Streamed files are composed without libyaml and parse identically."""
+    spec = _template("security-incident-responder.yaml")
+    spec["shared"] = {"base": {"x": 1}, "other": {"y": [1, 2.5, None, True]}}
+    path = tmp_path / "bundle.yaml"
+    path.write_text(
+        "defaults: &d {retries: 3}\nuse:\n  <<: *d\n---\n" + yaml.safe_dump(spec)
+    )
+
+    assert list(iter_spec_documents(path)) == list(yaml.safe_load_all(path.read_text()))
+
+
+def test_json_spec(tmp_path):
+    """JSON specs are read with the JSON parser."""
+    path = tmp_path / "agent.json"
+    path.write_text(json.dumps(_template("minimal-agent.yaml")))
+
+    [result] = validate_spec_file(str(path))
+    assert result["valid"]
+    assert result["agent_name"] == "hello_world_agent"
+
+
+def test_validate_bundle_reports_each_document(bundle):
+    """A bundle yields one validation result per agent."""
+    results = validate_spec_file(str(bundle))
+
+    assert [r["path"] for r in results] == [f"{bundle}#0", f"{bundle}#1", f"{bundle}#2"]
+    assert [r["valid"] for r in results] == [True, True, False]
+    assert results[1]["agent_name"] == "second_agent"
+
+
+def test_validate_command_counts_bundle_documents(bundle):
+    """The validate summary counts every document of a bundle as a spec."""
+    result = CliRunner().invoke(app, ["validate", str(bundle), "--no-cache"])
+
+    assert result.exit_code == 1
+    assert "2/3 specs valid" in result.stderr
+
+
+def test_validate_command_reports_deep_json_spec(tmp_path, bundle):
+    """A JSON spec too deep to parse does not stop the rest of the batch."""
+    (tmp_path / "deep.json").write_text("[" * 100_000 + "]" * 100_000)
+
+    for jobs in ("1", "2"):
+        result = CliRunner().invoke(app, ["validate", str(tmp_path), "-j", jobs])
+        assert result.exit_code == 1
+        assert "2/4 specs valid" in result.stderr
+
+
+def test_generate_bundle_into_agent_directories(bundle, tmp_path):
+    """Each agent of a bundle is generated into its own directory."""
+    output = tmp_path / "out"
+    results = list(iter_generation_results([(bundle, output)]))
+
+    assert [r["success"] for r in results] == [True, True, False]
+    assert (output / "hello_world_agent" / "agent.py").exists()
+    assert (output / "second_agent" / "agent.py").exists()
@@ -0,0 +1,102 @@
+"""Tests for converting legacy specs to the canonical form."""
+
+import copy
+
+import pytest
+
+from benchmarks.synthetic import make_spec
+from oas_cli import spec_normalizer
+from oas_cli.generators import DEFAULT_PROMPT_TEMPLATE, render_task_prompt
+from oas_cli.manifest import sync_agent_files
+from oas_cli.spec_normalizer import (
+    CanonicalSpec,
+    clear_normalized_specs,
+    normalize_spec,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_memo():
+    clear_normalized_specs()
+    yield
+    clear_normalized_specs()
+
+
+@pytest.fixture
+def current_spec():
+    spec = make_spec(4, multi_step_ratio=0.5)
+    # Legacy ``info`` sections have no role
+    del spec["agent"]["role"]
+    return spec
+
+
+@pytest.fixture
+def legacy_spec(current_spec):
+    spec = copy.deepcopy(current_spec)
+    agent = spec.pop("agent")
+    spec["info"] = {"name": agent["name"], "description": agent["description"]}
+    spec["agent"] = {}
+    return spec
+
+
+def test_info_becomes_agent(legacy_spec):
+    canonical = normalize_spec(legacy_spec)
+
+    assert "info" not in canonical
+    assert canonical["agent"] == legacy_spec["info"]
+    # The caller's spec is left as it was
+    assert legacy_spec["agent"] == {}
+
+
+def test_prompt_formats():
+    """Legacy and missing prompts become a template used for every task."""
+    legacy = normalize_spec(
+        {"agent": {"name": "a"}, "prompt": {"template": "Hi {{ name }}"}}
+    )
+    assert legacy["prompts"] == {"template": "Hi {{ name }}"}
+    assert "prompt" not in legacy
+
+    missing = normalize_spec({"agent": {"name": "a"}})
+    assert missing["prompts"] == {"template": DEFAULT_PROMPT_TEMPLATE}
+
+
+def test_canonical_specs_are_not_hashed(current_spec, monkeypatch):
+    """Current-format specs are wrapped without hashing or copying."""
+    monkeypatch.setattr(spec_normalizer, "stable_hash", pytest.fail)
+
+    canonical = normalize_spec(current_spec)
+    assert isinstance(canonical, CanonicalSpec)
+    assert canonical == current_spec
+    assert canonical["tasks"] is current_spec["tasks"]
+    assert normalize_spec(canonical) is canonical
+
+
+def test_conversions_memoized_by_content(legacy_spec):
+    """Equal legacy specs share one canonical spec and its hash."""
+    first = normalize_spec(legacy_spec)
+    second = normalize_spec(copy.deepcopy(legacy_spec))
+
+    assert second is first
+    assert first.spec_hash == normalize_spec(dict(first)).spec_hash
+
+
+def test_legacy_and_current_specs_generate_the_same_files(
+    legacy_spec, current_spec, tmp_path
+):
+    for name, spec in (("legacy", legacy_spec), ("current", current_spec)):
+        sync_agent_files(tmp_path / name, spec, "agent", "Agent")
+
+    for path in (tmp_path / "current").rglob("*"):
+        if path.is_file() and path.name != ".oas-manifest.json":
+            relative = path.relative_to(tmp_path / "current")
+            assert (tmp_path / "legacy" / relative).read_bytes() == path.read_bytes()
+
+
+def test_task_specific_prompts_win_over_template_task_name():
+    """A task named like the template key keeps its own prompts."""
+    spec = {
+        "agent": {"name": "a"},
+        "prompts": {"template": {"system": "Task system", "user": "Task user"}},
+    }
+    prompt = render_task_prompt("template", {"output": {}}, spec)
+    assert "Task system\n\nTask user" in prompt
@@ -0,0 +1,54 @@
+"""Tests for the built-in spec template registry."""
+
+import pytest
+
+from oas_cli import spec_templates as spec_templates_module
+from oas_cli.spec_templates import SpecTemplateRegistry, spec_templates
+from oas_cli.validators import validate_spec, validate_with_json_schema
+
+
+def test_names_cover_bundled_templates():
+    """Every bundled YAML template is registered under its file stem."""
+    names = spec_templates.names()
+    assert "minimal-agent" in names
+    assert "minimal-multi-task-agent" in names
+    assert "security-threat-analyzer" in names
+
+
+@pytest.mark.parametrize("name", spec_templates.names())
+def test_every_template_is_a_valid_spec(name):
+    """Every bundled template passes schema and semantic validation."""
+    spec_data = spec_templates.get(name)
+    validate_with_json_schema(spec_data)
+    validate_spec(spec_data)
+
+
+def test_minimal_alias():
+    """The historical 'minimal' name resolves to minimal-agent."""
+    assert spec_templates.resolve("minimal") == "minimal-agent"
+    assert spec_templates.aliases_for("minimal-agent") == ["minimal"]
+
+
+def test_unknown_template_lists_available():
+    """Unknown names raise a KeyError naming the available templates."""
+    with pytest.raises(KeyError, match="minimal-agent"):
+        spec_templates.get("does-not-exist")
+
+
+def test_templates_parsed_once_and_copied(monkeypatch):
+    """Templates are parsed once per registry and callers get private copies."""
+    registry = SpecTemplateRegistry()
+    calls = []
+    original = spec_templates_module.parse_spec
+    monkeypatch.setattr(
+        spec_templates_module,
+        "parse_spec",
+        lambda content: calls.append(1) or original(content),
+    )
+
+    first = registry.get("minimal")
+    first["agent"]["name"] = "changed"
+    second = registry.get("minimal-agent")
+
+    assert len(calls) == 1
+    assert second["agent"]["name"] != "changed"
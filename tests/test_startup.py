@@ -0,0 +1,54 @@
+"""Startup cost of the CLI, measured with ``python -X importtime``."""
+
+import os
+import re
+import subprocess
+import sys
+
+# Total import time allowed for ``oas --version``, in milliseconds. Override
+# with OAS_IMPORT_BUDGET_MS on unusually slow machines.
+IMPORT_BUDGET_MS = float(os.environ.get("OAS_IMPORT_BUDGET_MS", "250"))
+
+# Modules that only specific commands need and must not load at startup
+HEAVY_MODULES = (
+    "pkg_resources",
+    "rich",
+    "yaml",
+    "jsonschema",
+    "jinja2",
+    "oas_cli.generators",
+    "oas_cli.validators",
+)
+
+IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+def _version_importtime():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "oas_cli.main", "--version"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "Open Agent Spec CLI" in result.stdout
+    imports = [IMPORT_LINE.match(line) for line in result.stderr.splitlines()]
+    return [(m.group(3), int(m.group(1)), len(m.group(2))) for m in imports if m]
+
+
+def test_version_does_not_import_heavy_modules():
+    """oas --version must not pull in Rich, YAML, jsonschema or the generators."""
+    modules = {name for name, _, _ in _version_importtime()}
+    loaded = [
+        name
+        for name in modules
+        if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+    ]
+    assert loaded == []
+
+
+def test_version_import_time_within_budget():
+    """Top-level imports for oas --version stay within the startup budget."""
+    total_us = sum(
+        cumulative for _, cumulative, depth in _version_importtime() if depth == 1
+    )
+    assert total_us / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,107 @@
+"""Tests for the task dependency graph of multi-step tasks."""
+
+import pytest
+
+from benchmarks.synthetic import make_spec
+from oas_cli.task_graph import TaskGraph
+from oas_cli.validators import collect_spec_errors
+
+
+def _task(**extra):
+    return {"input": {"type": "object"}, "output": {"type": "object"}, **extra}
+
+
+def _multi_step(*steps):
+    return {"multi_step": True, "output": {"type": "object"}, "steps": list(steps)}
+
+
+def test_self_reference_and_cycles_are_reported():
+    """A task reaching itself through its steps is rejected with the cycle."""
+    tasks = {
+        "a": _task(),
+        "loop": _multi_step({"task": "a"}, {"task": "loop"}),
+        "first": _multi_step({"task": "second"}),
+        "second": _multi_step({"task": "a"}, {"task": "first"}),
+    }
+
+    errors = TaskGraph(tasks).errors()
+
+    assert errors == [
+        {
+            "path": "tasks.loop.steps[1].task",
+            "message": "multi-step task loop references itself in step 1",
+        },
+        {
+            "path": "tasks.first.steps[0].task",
+            "message": "multi-step tasks form a cycle: first -> second -> first",
+        },
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        TaskGraph(tasks).topological_order()
+
+
+@pytest.mark.parametrize(
+    "reference, problem",
+    [
+        ("{{steps.1.greeting}}", "only steps before step 1 have results"),
+        ("{{ steps.3.greeting }}", "only steps before step 1 have results"),
+        ("{{steps.0}}", "expected steps.N.field"),
+        ("{{steps.first.greeting}}", "must be a step index"),
+    ],
+)
+def test_invalid_step_references(reference, problem):
+    """References to the current or later steps, or malformed ones, fail."""
+    tasks = {
+        "a": _task(),
+        "chain": _multi_step(
+            {"task": "a"}, {"task": "a", "input_map": {"text": reference}}
+        ),
+    }
+
+    [error] = TaskGraph(tasks).errors()
+    assert error["path"] == "tasks.chain.steps[1].input_map.text"
+    assert problem in error["message"]
+
+
+def test_validator_reports_graph_errors():
+    """Graph errors are part of the semantic validation errors."""
+    tasks = {"a": _task(), "loop": _multi_step({"task": "loop"})}
+
+    paths = [error["path"] for error in collect_spec_errors({"tasks": tasks})]
+
+    assert "tasks.loop.steps[0].task" in paths
+
+
+def test_llm_costs_follow_step_dependencies():
+    """Totals add up every step; the critical path follows step references."""
+    tasks = {
+        "a": _task(),
+        "with_tool": _task(tool="files"),
+        "inner": _multi_step(
+            {"task": "a"},
+            {"task": "with_tool", "input_map": {"x": "{{steps.0.out}}"}},
+            {"task": "a"},
+        ),
+        "outer": _multi_step(
+            {"task": "a", "input_map": {"x": "{{input.text}}"}},
+            {"task": "inner", "input_map": {"x": "{{steps.0.out}}"}},
+        ),
+    }
+
+    graph = TaskGraph(tasks)
+
+    assert graph.topological_order() == ["inner", "outer"]
+    assert graph.llm_costs() == {
+        "inner": {"llm_calls": 4, "critical_path": 3},
+        "outer": {"llm_calls": 5, "critical_path": 4},
+    }
+
+
+def test_synthetic_specs_are_acyclic():
+    """Large generated specs have a graph without errors."""
+    spec = make_spec(500, multi_step_ratio=0.2)
+
+    graph = TaskGraph(spec["tasks"])
+
+    assert graph.errors() == []
+    assert len(graph.llm_costs()) == len(graph.steps)
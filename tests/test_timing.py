@@ -0,0 +1,40 @@
+"""Tests for phase timing."""
+
+import time
+
+from oas_cli.timing import NULL_TIMER, PhaseTimer
+
+
+def test_nested_phases_are_charged_their_own_time():
+    """A phase's time excludes the phases nested inside it."""
+    timer = PhaseTimer()
+    with timer.phase("render"):
+        with timer.phase("prepare"):
+            time.sleep(0.05)
+
+    timings = timer.as_dict()
+    assert timings["phases"]["prepare"]["wall_ms"] >= 50
+    assert timings["phases"]["render"]["wall_ms"] < 25
+    assert timings["total"]["wall_ms"] >= 50
+
+
+def test_repeated_phases_and_tasks_accumulate():
+    """Repeated phases and tasks add up and count their calls."""
+    timer = PhaseTimer()
+    for _ in range(3):
+        with timer.phase("write"):
+            pass
+    with timer.task("greet"):
+        pass
+
+    timings = timer.as_dict()
+    assert timings["phases"]["write"]["calls"] == 3
+    assert timings["tasks"]["greet"]["calls"] == 1
+
+
+def test_null_timer_records_nothing():
+    """The default timer is a no-op."""
+    with NULL_TIMER.phase("load"), NULL_TIMER.task("greet"):
+        pass
+    assert NULL_TIMER.as_dict()["phases"] == {}
+    assert NULL_TIMER.as_dict()["tasks"] == {}
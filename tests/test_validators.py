@@ -0,0 +1,124 @@
+"""Tests for the Open Agent Spec validators."""
+
+import json
+import os
+
+import pytest
+import yaml
+
+from oas_cli.validators import (
+    SCHEMA_PATH,
+    SpecValidationError,
+    collect_spec_errors,
+    get_schema_validator,
+    schema_registry,
+    validate_all,
+    validate_spec,
+    validate_with_json_schema,
+)
+
+MINIMAL_TEMPLATE = SCHEMA_PATH.parent.parent / "templates" / "minimal-agent.yaml"
+
+
+@pytest.fixture
+def minimal_spec():
+    """Return the bundled minimal agent spec."""
+    return yaml.safe_load(MINIMAL_TEMPLATE.read_text())
+
+
+def test_schema_validator_is_cached():
+    """The bundled schema is compiled once and reused."""
+    schema_registry.clear()
+    assert get_schema_validator() is get_schema_validator(str(SCHEMA_PATH))
+
+
+def test_schema_validator_rebuilt_when_schema_changes(tmp_path):
+    """Editing the schema file invalidates the cached validator."""
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps({"type": "object"}))
+    first = get_schema_validator(schema_file)
+
+    schema_file.write_text(json.dumps({"type": "object", "required": ["name"]}))
+    stat = schema_file.stat()
+    os.utime(schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = get_schema_validator(schema_file)
+    assert second is not first
+    with pytest.raises(ValueError, match="Spec validation failed"):
+        validate_with_json_schema({}, schema_file)
+
+
+def test_validate_with_json_schema(minimal_spec):
+    """Valid specs pass and invalid specs raise ValueError."""
+    validate_with_json_schema(minimal_spec)
+
+    minimal_spec["agent"]["role"] = "not-a-role"
+    with pytest.raises(ValueError, match="Spec validation failed"):
+        validate_with_json_schema(minimal_spec)
+
+
+def test_missing_schema_skips_validation(tmp_path):
+    """A missing schema file is logged and skipped, as before."""
+    validate_with_json_schema({}, tmp_path / "missing.json")
+
+
+@pytest.fixture
+def broken_spec(minimal_spec):
+    """The minimal spec with several independent semantic errors."""
+    minimal_spec["agent"]["role"] = 3
+    minimal_spec["tools"] = [{"id": "search", "description": "x", "type": "custom"}]
+    minimal_spec["tasks"]["greet"]["tool"] = "missing"
+    minimal_spec["tasks"]["chain"] = {
+        "multi_step": True,
+        "output": {"type": "object"},
+        "steps": [{"task": "greet"}, {"task": "nowhere"}, "oops"],
+    }
+    return minimal_spec
+
+
+def test_validate_spec_reports_first_error(broken_spec):
+    """By default only the first problem is reported, in the legacy format."""
+    with pytest.raises(SpecValidationError) as excinfo:
+        validate_spec(broken_spec)
+
+    assert str(excinfo.value) == "Invalid spec format: agent.role must be a string"
+    assert len(excinfo.value.errors) == 1
+
+
+def test_collect_spec_errors_reports_every_error_with_paths(broken_spec):
+    """A single pass collects every semantic error in document order."""
+    errors = collect_spec_errors(broken_spec)
+
+    assert [error["path"] for error in errors] == [
+        "agent.role",
+        "tasks.greet.tool",
+        "tasks.chain.steps[1].task",
+        "tasks.chain.steps[2]",
+    ]
+    assert "non-existent task 'nowhere'" in errors[2]["message"]
+    with pytest.raises(SpecValidationError, match="4 errors"):
+        validate_spec(broken_spec, all_errors=True)
+
+
+def test_validate_all_includes_schema_errors(broken_spec):
+    """validate_all lists schema violations before semantic errors."""
+    with pytest.raises(SpecValidationError) as excinfo:
+        validate_all(broken_spec)
+
+    errors = excinfo.value.errors
+    assert errors[0]["path"] == "agent.role"
+    assert errors[0]["message"].startswith("Spec validation failed")
+    assert errors[-1]["path"] == "tasks.chain.steps[2]"
+
+
+def test_validate_spec_with_many_tools_and_tasks(minimal_spec):
+    """Tool and task references are resolved through indexes."""
+    greet = minimal_spec["tasks"]["greet"]
+    minimal_spec["tools"] = [
+        {"id": f"tool_{i}", "description": "x", "type": "custom"} for i in range(2000)
+    ]
+    minimal_spec["tasks"] = {
+        f"task_{i}": {**greet, "tool": f"tool_{i}"} for i in range(2000)
+    }
+
+    assert collect_spec_errors(minimal_spec) == []
@@ -0,0 +1,92 @@
+"""Tests for the spec watcher."""
+
+import os
+import shutil
+from pathlib import Path
+
+import yaml
+
+from oas_cli.watch import SpecWatcher
+
+TEMPLATE = (
+    Path(__file__).parent.parent
+    / "oas_cli"
+    / "templates"
+    / "minimal-multi-task-agent.yaml"
+)
+
+
+def _watcher(tmp_path):
+    spec_path = tmp_path / "agent.yaml"
+    shutil.copy(TEMPLATE, spec_path)
+    return SpecWatcher(spec_path, tmp_path / "out", interval=0.01, debounce=0.01)
+
+
+def _edit(spec_path, update):
+    spec = yaml.safe_load(spec_path.read_text())
+    update(spec)
+    spec_path.write_text(yaml.safe_dump(spec, sort_keys=False))
+
+
+def test_first_cycle_generates_project(tmp_path):
+    """The first cycle generates every task."""
+    watcher = _watcher(tmp_path)
+    cycle = watcher.run_cycle()
+
+    assert cycle.success
+    assert "agent.py" in cycle.changed
+    assert len(cycle.recomputed_tasks) == 3
+    assert cycle.duration_ms > 0
+    assert (tmp_path / "out" / "agent.py").exists()
+
+
+def test_cycle_regenerates_only_changed_task(tmp_path):
+    """A save that touches one task regenerates only that task."""
+    watcher = _watcher(tmp_path)
+    watcher.run_cycle()
+
+    def update(spec):
+        spec["tasks"]["greet"]["description"] = "Say hello warmly"
+
+    _edit(watcher.spec_path, update)
+    cycle = watcher.run_cycle()
+
+    assert cycle.success
+    assert cycle.recomputed_tasks == ["greet"]
+    assert "requirements.txt" not in cycle.changed
+
+
+def test_unchanged_content_skips_cycle(tmp_path):
+    """Saving without edits does not trigger a regeneration."""
+    watcher = _watcher(tmp_path)
+    watcher.run_cycle()
+    os.utime(watcher.spec_path)
+
+    assert watcher.run_cycle() is None
+
+
+def test_invalid_save_is_reported_and_recovers(tmp_path):
+    """An invalid intermediate save reports an error without stopping the watcher."""
+    watcher = _watcher(tmp_path)
+    watcher.run_cycle()
+    original = watcher.spec_path.read_text()
+
+    watcher.spec_path.write_text("tasks: [unclosed")
+    cycle = watcher.run_cycle()
+    assert not cycle.success
+    assert "Error reading spec file" in cycle.error
+
+    # Reverting to the last generated content leaves nothing to do
+    watcher.spec_path.write_text(original)
+    assert watcher.run_cycle() is None
+
+
+def test_wait_for_change(tmp_path):
+    """Polling notices a modified spec and times out when nothing changes."""
+    watcher = _watcher(tmp_path)
+    watcher.run_cycle()
+    assert not watcher.wait_for_change(timeout=0.05)
+
+    stat = watcher.spec_path.stat()
+    os.utime(watcher.spec_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert watcher.wait_for_change(timeout=1)